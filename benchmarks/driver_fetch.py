@@ -0,0 +1,59 @@
+"""
+各驱动后端的结果集读取吞吐基准
+
+用递归 CTE 在服务端生成宽结果集（整数 / 小数 / 字符串 / 时间列），分别使用各可用驱动（c / pure 及已注册的适配器）
+执行 executor.query 读取全部行，输出每秒读取行数。连接参数从环境变量 LAZY_MYSQL_* 读取。
+
+用法：
+    python benchmarks/driver_fetch.py [--rows 200000] [--runs 3] [--drivers c pure]
+"""
+
+import argparse
+import statistics
+import time
+
+from lazy_mysql import FetchConfig, MySQLConfig, SQLExecutor
+from lazy_mysql.utils import driver as driver_module
+
+_SQL = """
+WITH RECURSIVE seq (n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < %s)
+SELECT n, n * 2, n * 3, CAST(n AS DECIMAL(12, 2)) / 7, CONCAT('name-', n), REPEAT('x', 32),
+       n % 100 = 0, NOW() - INTERVAL n SECOND, CAST(n AS CHAR), NULL
+FROM seq
+"""
+
+
+def measure(driver, rows, runs):
+    config = MySQLConfig.resolve(driver=driver)
+    executor = SQLExecutor(config)
+    try:
+        executor.execute("SET SESSION cte_max_recursion_depth = %s", (rows + 1,))
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            result = executor.query(_SQL, (rows,), fetch_config=FetchConfig())
+            timings.append(time.perf_counter() - started)
+            assert len(result) == rows
+        return statistics.median(timings)
+    finally:
+        executor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--drivers", nargs="*", default=None, help="默认测试所有可用驱动")
+    args = parser.parse_args()
+
+    drivers = args.drivers or [name for name, backend in driver_module._BACKENDS.items() if backend.available()]
+    baseline = None
+    for name in drivers:
+        elapsed = measure(name, args.rows, args.runs)
+        baseline = baseline or elapsed
+        print(f"{name:>8}: {elapsed * 1000:8.1f} ms, {args.rows / elapsed:12,.0f} rows/s, "
+              f"{baseline / elapsed:5.2f}x vs {drivers[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+import lazy_mysql 耗时基准
+
+在全新的解释器中多次执行 `import lazy_mysql`，输出耗时中位数，并检查 pandas / sqlparse 没有在 import 阶段被加载。
+
+用法：
+    python benchmarks/import_time.py [--runs 10] [--max-ms 600]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+_PROBE = (
+    "import sys, time; t = time.perf_counter(); import lazy_mysql; "
+    "print((time.perf_counter() - t) * 1000); "
+    "print(','.join(m for m in ('pandas', 'sqlparse') if m in sys.modules))"
+)
+
+
+def measure(runs):
+    timings = []
+    eager = set()
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", _PROBE], check=True, capture_output=True, text=True).stdout
+        elapsed, modules = (out.splitlines() + [""])[:2]
+        timings.append(float(elapsed))
+        eager.update(filter(None, modules.split(",")))
+    return timings, eager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=None, help="中位数超过该值时以非零状态退出")
+    args = parser.parse_args()
+
+    timings, eager = measure(args.runs)
+    median = statistics.median(timings)
+    print(f"import lazy_mysql: median {median:.1f} ms, min {min(timings):.1f} ms, max {max(timings):.1f} ms ({args.runs} runs)")
+    if eager:
+        print(f"import 阶段加载了可选依赖：{', '.join(sorted(eager))}")
+        sys.exit(1)
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"超过阈值 {args.max_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+LOAD DATA 数据文件序列化吞吐基准（不连接数据库）
+
+生成已转换的参数元组（整数 / 字符串 / None / 浮点 / datetime / Decimal / 含转义字符的文本列），对比
+逐行 csv.writer（修改前的实现）与按列序列化的 write_rows 写入内存文本流的每秒行数，
+并按服务端的转义规则读回新格式，校验与原始参数一致。
+
+用法：
+    python benchmarks/load_data_serialize.py [--rows 1000000] [--runs 3] [--special-ratio 0.01]
+"""
+
+import argparse
+import csv
+import io
+import re
+import statistics
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from lazy_mysql.utils.load_data_format import write_rows
+
+_UNESCAPES = {'t': '\t', 'n': '\n', 'r': '\r', '0': '\0', '\\': '\\'}
+
+
+def make_rows(rows, special_ratio):
+    started = datetime(2024, 1, 1)
+    special_every = int(1 / special_ratio) if special_ratio else 0
+    result = []
+    for n in range(rows):
+        note = None if n % 3 else 'x' * 16
+        if special_every and n % special_every == 0:
+            note = f'C:\\logs\\{n}\tline\nnext'
+        result.append((
+            n, n % 1000, f'name-{n}', f'user{n}@example.com', note, n * 0.5, Decimal(n) / 100,
+            started + timedelta(seconds=n), n % 5, n % 2 == 0,
+        ))
+    return result
+
+
+def per_row_csv(rows):
+    """修改前的实现：逐行 csv.writer，None 写为 \\N、bool 写为整数，不转义反斜杠"""
+    stream = io.StringIO(newline='')
+    writer = csv.writer(stream, quoting=csv.QUOTE_MINIMAL)
+    for values in rows:
+        writer.writerow([r'\N' if value is None else int(value) if isinstance(value, bool) else value
+                         for value in values])
+    return stream.getvalue()
+
+
+def columnar(rows):
+    stream = io.StringIO(newline='')
+    write_rows(stream, rows)
+    return stream.getvalue()
+
+
+def parse_field(field):
+    if field == r'\N':
+        return None
+    return re.sub(r'\\(.)', lambda m: _UNESCAPES.get(m.group(1), m.group(1)), field)
+
+
+def measure(func, rows, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = func(rows)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--special-ratio", type=float, default=0.01,
+                        help="文本列中含反斜杠、制表符、换行的记录比例")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows, args.special_ratio)
+    before, _ = measure(per_row_csv, rows, args.runs)
+    after, text = measure(columnar, rows, args.runs)
+
+    lines = text[:-1].split('\n')
+    assert len(lines) == len(rows), "记录数与参数元组数不一致"
+    for line, values in zip(lines[:10000], rows):
+        expected = tuple(None if v is None else str(int(v) if isinstance(v, bool) else v) for v in values)
+        assert tuple(map(parse_field, line.split('\t'))) == expected, f"读回不一致：{line!r}"
+
+    size = len(text.encode('utf-8'))
+    print(f"{len(rows[0])} columns, {args.rows} rows, {size / 1024 / 1024:.1f} MB, "
+          f"special text ratio {args.special_ratio}")
+    print(f" before: {before * 1000:8.1f} ms, {args.rows / before:12,.0f} rows/s  (csv.writer per row)")
+    print(f"  after: {after * 1000:8.1f} ms, {args.rows / after:12,.0f} rows/s  (columnar write_rows), "
+          f"{before / after:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
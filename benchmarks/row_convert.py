@@ -0,0 +1,79 @@
+"""
+批量写入参数转换吞吐基准（不连接数据库）
+
+生成字典记录（整数 / 字符串 / None / 浮点 / datetime / Decimal / JSON 列），对比
+逐行 prepare_db_row（转换前的实现）与按批生成的 row_converter 的每秒转换行数，并校验两者结果一致。
+
+用法：
+    python benchmarks/row_convert.py [--rows 200000] [--runs 3] [--json-columns 1]
+"""
+
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from lazy_mysql.utils.value_converter import prepare_db_row, prepare_db_value, row_converter
+
+
+def make_rows(rows, json_columns):
+    started = datetime(2024, 1, 1)
+    records = []
+    for n in range(rows):
+        record = {
+            'id': n, 'user_id': n % 1000, 'name': f'name-{n}', 'email': f'user{n}@example.com',
+            'note': None if n % 3 else 'x' * 16, 'score': n * 0.5, 'amount': Decimal(n) / 100,
+            'created_at': started + timedelta(seconds=n), 'status': n % 5, 'flag': n % 2 == 0,
+        }
+        for column in range(json_columns):
+            record[f'meta_{column}'] = {'n': n, 'tags': ['a', 'b']}
+        records.append(record)
+    return records
+
+
+def per_cell(records, fields):
+    """转换前的实现：每行先对所有值调用 prepare_db_value，再按字段顺序取出"""
+    result = []
+    for record in records:
+        processed = {field: prepare_db_value(value) for field, value in record.items()}
+        result.append(tuple(processed[field] for field in fields))
+    return result
+
+
+def compiled(records, fields):
+    convert_row = row_converter(fields, records)
+    return [convert_row(record) for record in records]
+
+
+def measure(func, records, fields, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = func(records, fields)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--json-columns", type=int, default=1)
+    args = parser.parse_args()
+
+    records = make_rows(args.rows, args.json_columns)
+    fields = list(records[0].keys())
+    before, expected = measure(per_cell, records, fields, args.runs)
+    after, result = measure(compiled, records, fields, args.runs)
+    assert result == expected, "row_converter 的结果与 prepare_db_value 不一致"
+    assert [tuple(prepare_db_row(r)[f] for f in fields) for r in records[:100]] == result[:100]
+
+    print(f"{len(fields)} columns ({args.json_columns} JSON), {args.rows} rows")
+    print(f" before: {before * 1000:8.1f} ms, {args.rows / before:12,.0f} rows/s  (prepare_db_value per cell)")
+    print(f"  after: {after * 1000:8.1f} ms, {args.rows / after:12,.0f} rows/s  (row_converter per batch), "
+          f"{before / after:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,16 @@
 from pathlib import Path
 from .executor import SQLExecutor
-from .models import MySQLConfig, FetchConfig, DEFAULT_MYSQL_CONFIG
-from .crud import insert, upsert, select, exists, update, batch_update, delete, merge_update_lists
+from .pool import ConnectionPool
+from .async_pool import AsyncConnectionPool
+from .async_executor import AsyncSQLExecutor
+from .routing import RoutingExecutor
+from .threadsafe import ThreadSafeExecutor
+from .exceptions import (PoolTimeoutError, PoolClosedError, CircuitOpenError, PipelineError, QueryTimeoutError,
+                         ParallelLoadError)
+from .retry import RetryPolicy
+from .utils.driver import DriverBackend, register_driver
+from .models import MySQLConfig, FetchConfig, PoolConfig, RoutingConfig, ConnectionProfile
+from .crud import insert, upsert, insert_df, upsert_df, select, exists, update, batch_update, delete, merge_update_lists
 from .tools import NDayInterval, add_limit, load_sql, resolve_sql, build_where, build_sql_with_where
 
 __version__ = (Path(__file__).parent / ".version").read_text().strip()
@@ -11,8 +20,22 @@ __email__ = "sky_ruocen@qq.com"
 
 
 # 提供便捷的导入
-__all__ = ['__version__','MySQLConfig', 'DEFAULT_MYSQL_CONFIG',
+__all__ = ['__version__','MySQLConfig', 'DEFAULT_MYSQL_CONFIG', 'ConnectionProfile',
            'SQLExecutor', 'FetchConfig', 'NDayInterval',
-           'insert', 'upsert', 'select', 'exists',
+           'ConnectionPool', 'PoolConfig', 'PoolTimeoutError', 'PoolClosedError',
+           'AsyncSQLExecutor', 'AsyncConnectionPool',
+           'RetryPolicy', 'CircuitOpenError', 'PipelineError', 'QueryTimeoutError',
+           'ParallelLoadError',
+           'DriverBackend', 'register_driver',
+           'RoutingExecutor', 'RoutingConfig', 'ThreadSafeExecutor',
+           'insert', 'upsert', 'insert_df', 'upsert_df', 'select', 'exists',
            'update', 'batch_update', 'delete', 'merge_update_lists',
            'add_limit', 'load_sql', 'resolve_sql', 'build_where', 'build_sql_with_where']
+
+
+def __getattr__(name):
+    # DEFAULT_MYSQL_CONFIG 在首次访问时才读取环境变量，避免 import 阶段的额外开销
+    if name == "DEFAULT_MYSQL_CONFIG":
+        from .models import mysql_config
+        return mysql_config.DEFAULT_MYSQL_CONFIG
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
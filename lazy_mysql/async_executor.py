@@ -0,0 +1,379 @@
+import json
+import logging
+from contextlib import asynccontextmanager
+
+from .async_pool import AsyncConnectionPool
+from .exceptions import QueryTimeoutError
+from .executor import prepare_params
+from .models import FetchConfig, PoolConfig
+from .utils import should_retry_connection_error
+from .utils.batching import PACKET_HEADROOM, byte_batches, insert_row_size
+from .utils.server_vars import DEFAULT_MAX_ALLOWED_PACKET
+from .utils.timeout import AsyncKillQueryWatchdog, is_timeout_error, with_max_execution_time
+from .tools.log_utils import format_sql_for_log, truncate_long_in_lists, truncate_params_for_log
+from .tools.sql_utils import resolve_sql
+from .tools.result_formatter import _validate_fetch_args, _format_rows, _format_one_tuple, _format_one
+from .crud.insert import _build_insert_sql, _build_upsert_sql, _build_row_values
+from .utils.value_converter import row_converter
+from .crud.update import _build_update_sql
+from .crud.delete import _build_delete_sql
+from .crud.batch_update import _build_batch_update_sql, _update_item_size, _validate_update_list
+from .crud.select import _build_select_sql, _build_exists_sql, _resolve_fetch_config
+
+# 异步批量插入每批最多的记录数
+_ASYNC_INSERT_BATCH_SIZE = 1000
+# 异步批量写入单条语句的字节上限：异步连接上不额外查询 max_allowed_packet，按保守的默认值切分
+_ASYNC_STATEMENT_BUDGET = DEFAULT_MAX_ALLOWED_PACKET - PACKET_HEADROOM
+
+
+class AsyncSQLExecutor :
+    """
+    异步SQL执行器类，提供与 SQLExecutor 一致的数据库操作接口（基于 mysql.connector.aio）
+
+    - 每次调用从异步连接池借出一个连接，执行完毕后提交并归还，
+      因此同一事件循环中可以同时进行大量查询（并发上限为 pool_config.max_size）
+    - 需要多条语句共享同一事务时，使用 `async with executor.transaction() as tx:`
+    - SQL 构建逻辑与 SQLExecutor 共用 crud/ 与 tools/where_clause.py
+    - 语句超时与 SQLExecutor 一致：query_timeout 为默认值，各方法的 timeout 参数覆盖本次调用
+
+    :example:
+        >>> async with AsyncSQLExecutor(config, pool_config={'max_size': 50}) as executor:
+        ...     users = await executor.select('users', ['id', 'name'])
+        ...     await executor.insert('users', {'name': '张三'})
+    """
+
+    def __init__( self , sql_config=None , database=None , dict_cursor=False ,
+                  pool_config: PoolConfig | dict | None = None , pool: AsyncConnectionPool | None = None ,
+                  profile = None , query_timeout: float | None = None ) :
+        """
+        :param query_timeout: 语句默认超时秒数（None / 0 表示不限制），各方法的 timeout 参数优先；
+            未指定时使用连接配置档的 query_timeout
+        """
+        self._pool = pool or AsyncConnectionPool(sql_config, database, pool_config, profile=profile)
+        self.sql_config = self._pool.sql_config
+        self.database = self._pool.database
+        self.dict_cursor = dict_cursor
+        pool_profile = getattr(self._pool, "profile", None)
+        if query_timeout is None and pool_profile is not None:
+            query_timeout = pool_profile.query_timeout
+        self.query_timeout = query_timeout
+        # 超时后语句未能被中断、连接状态不确定时置为 True，transaction() 结束时丢弃该连接
+        self._discard_connection = False
+        # transaction() 内绑定的连接；为 None 时每次调用单独借出连接
+        self._connection = None
+        self.logger = logging.getLogger(__name__)
+
+    async def __aenter__( self ) :
+        return self
+
+    async def __aexit__( self , exc_type , exc_val , exc_tb ) :
+        await self.close()
+
+    async def close( self ) :
+        """关闭异步连接池（transaction() 内的执行器不会关闭连接池）"""
+        if self._connection is None:
+            await self._pool.close()
+
+    @asynccontextmanager
+    async def transaction( self ) :
+        """
+        借出一个连接并开启事务，返回绑定该连接的执行器；正常退出时提交，异常时回滚
+
+        :example:
+            >>> async with executor.transaction() as tx:
+            ...     await tx.update('accounts', {'balance': 90}, {'id': 1})
+            ...     await tx.update('accounts', {'balance': 110}, {'id': 2})
+        """
+        if self._connection is not None:
+            raise RuntimeError("当前执行器已处于事务中，不支持嵌套 transaction()")
+        connection = await self._pool.acquire()
+        bound = object.__new__(type(self))
+        bound.__dict__.update(self.__dict__)
+        bound._connection = connection
+        bound._discard_connection = False
+        try:
+            yield bound
+            await connection.commit()
+        except BaseException:
+            if not bound._discard_connection:
+                try:
+                    await connection.rollback()
+                except Exception:
+                    pass
+            raise
+        finally:
+            bound._connection = None
+            await self._pool.release(connection, discard=bound._discard_connection)
+
+    def _effective_timeout( self , timeout = None ) :
+        """本条语句的超时秒数：方法的 timeout 参数 > query_timeout；0 表示不限制"""
+        for value in (timeout, self.query_timeout):
+            if value is not None:
+                if value < 0:
+                    raise ValueError(f"timeout 不能为负数，收到：{value}")
+                return value or None
+        return None
+
+    async def _run( self , sql , params=None , fetch=None , operation_name="execute" , retry_count=0 ,
+                    timeout=None ) :
+        """
+        在借出的连接上执行 SQL，非事务模式下执行成功后提交
+
+        :param fetch: None 不读取结果；"all" / "one" 读取全部或单行
+        :param timeout: 语句超时秒数，默认使用 query_timeout；SELECT 加 MAX_EXECUTION_TIME 提示由服务端中断，
+            其他语句由 asyncio.wait_for 计时，超时后通过旁路连接发送 KILL QUERY；超时抛出 QueryTimeoutError
+        :return: (rowcount, rows)
+        """
+        timeout = self._effective_timeout(timeout)
+        bound = self._connection is not None
+        connection = self._connection if bound else await self._pool.acquire()
+        discard = False
+        watchdog = None
+        try :
+            params, many = prepare_params(sql, params)
+            statement_sql = sql
+            if timeout:
+                hinted = with_max_execution_time(sql, timeout)
+                if hinted is None:
+                    watchdog = AsyncKillQueryWatchdog(connection, self.sql_config, self.database, timeout)
+                else:
+                    statement_sql = hinted
+            cursor = await connection.cursor(buffered=True, dictionary=self.dict_cursor)
+            try :
+                statement = self._execute_on(cursor, statement_sql, params, many, fetch)
+                if watchdog is None :
+                    rowcount, rows = await statement
+                else :
+                    rowcount, rows = await watchdog.run(statement)
+            finally :
+                if not (watchdog is not None and watchdog.abandoned) :
+                    try :
+                        await cursor.close()
+                    except Exception :
+                        pass
+            if not bound :
+                await connection.commit()
+            return rowcount, rows
+
+        except Exception as e :
+            error = e
+            if is_timeout_error(e, watchdog) or (watchdog is not None and watchdog.abandoned) :
+                # 超时不重试；KILL 后仍未返回的连接状态不确定，丢弃（事务内由 transaction() 丢弃）
+                self._log_failed_statement(sql, params)
+                if watchdog is not None and watchdog.abandoned :
+                    discard = True
+                    if bound :
+                        self._discard_connection = True
+                elif not bound :
+                    await self._rollback_quietly(connection)
+                timed_out = True
+            else :
+                timed_out = False
+            retryable = not timed_out and should_retry_connection_error(e, retry_count)
+            discard = discard or retryable
+            if retryable and not bound :
+                self.logger.warning(
+                    "Connection lost or timeout during %s. Retrying on a new connection...",
+                    operation_name,
+                )
+            elif not timed_out :
+                self._log_failed_statement(sql, params)
+        finally :
+            if not bound :
+                await self._pool.release(connection, discard=discard)
+
+        if timed_out :
+            raise QueryTimeoutError(f"SQL {operation_name} timed out: {str(error) or 'no response after KILL QUERY'}") \
+                from error
+        if retryable and not bound :
+            return await self._run(sql, params, fetch, operation_name, retry_count=1, timeout=timeout or 0)
+        raise Exception(f"SQL {operation_name} failed: {str(error)}")
+
+    @staticmethod
+    async def _execute_on( cursor , sql , params , many , fetch ) :
+        """在游标上执行语句并读取结果，返回 (rowcount, rows)"""
+        if many :
+            await cursor.executemany(sql, params)
+        elif params :
+            await cursor.execute(sql, params)
+        else :
+            await cursor.execute(sql)
+
+        rows = None
+        if fetch == "all" :
+            rows = await cursor.fetchall()
+        elif fetch == "one" :
+            rows = await cursor.fetchone()
+        return cursor.rowcount, rows
+
+    @staticmethod
+    async def _rollback_quietly( connection ) :
+        try :
+            await connection.rollback()
+        except Exception :
+            pass
+
+    def _log_failed_statement( self , sql , params ) :
+        """记录失败 SQL 与参数（与 SQLExecutor 的日志格式一致）"""
+        if not sql:
+            return
+        sql_for_log = truncate_long_in_lists(sql)
+        if sql_for_log['truncated']:
+            self.logger.warning(
+                "SQL 中以下 IN/NOT IN 列表已截断（仅用于日志展示）：\n%s",
+                json.dumps(sql_for_log['details'], ensure_ascii=False, indent=2),
+            )
+        self.logger.error("%s:\n%s", "SQL", format_sql_for_log(sql_for_log['sql']))
+        if params is not None:
+            self.logger.error("Params: %s", truncate_params_for_log(params)['params'])
+
+    # sql 语句执行器
+    async def execute( self , sql , params = None , timeout: float | None = None ) :
+        """
+        异步执行 SQL 语句，params 格式与 SQLExecutor.execute 相同（支持 executemany 批量执行）
+
+        :param sql: SQL语句（支持直接传入SQL文本或 .sql 文件路径）
+        :param params: 参数
+        :param timeout: 语句超时秒数，默认使用 query_timeout，超时抛出 QueryTimeoutError
+        :return: 受影响的行数（int）
+        """
+        sql = resolve_sql(sql)
+        rowcount, _ = await self._run(sql, params, timeout=timeout)
+        return rowcount
+
+    async def fetch_format( self , sql , fetch_mode , output_format = "" , show_count = False ,
+                            data_label = None , params = None , timeout: float | None = None ) :
+        """异步版 fetch_format，参数与返回值格式同 SQLExecutor.fetch_format（timeout 同 execute）"""
+        sql = resolve_sql(sql)
+        data_label = _validate_fetch_args(fetch_mode, output_format, data_label)
+        if fetch_mode not in ("all", "oneTuple", "one"):
+            raise ValueError( f"fetch_mode error :{fetch_mode} , only supported [ all , oneTuple , one ]" )
+
+        _, rows = await self._run(sql, params, fetch="all" if fetch_mode == "all" else "one",
+                                  operation_name="query", timeout=timeout)
+        if fetch_mode == "all" :
+            result = _format_rows(rows or [], output_format, data_label)
+            if show_count :
+                return result, len(result)
+            return result
+        if fetch_mode == "oneTuple" :
+            return _format_one_tuple(rows, output_format, data_label)
+        return _format_one(rows)
+
+    async def query( self , sql , params = None , fetch_config: FetchConfig | dict | None = None ,
+                     timeout: float | None = None ) :
+        """异步执行自定义SQL查询，fetch_config 规则同 SQLExecutor.query（默认 output_format="df_dict"）"""
+        if fetch_config is None:
+            fetch_config = FetchConfig(output_format="df_dict")
+        elif isinstance(fetch_config, dict):
+            config_dict = {"output_format": "df_dict"}
+            config_dict.update(fetch_config)
+            fetch_config = FetchConfig(**config_dict)  # pyright: ignore[reportArgumentType]
+        return await self.fetch_format(sql, fetch_config.fetch_mode, fetch_config.output_format,
+                                       fetch_config.show_count, fetch_config.data_label or [], params, timeout)
+
+    async def select( self , table_names , fields = None , conditions = None , order_by = None ,
+                      limit:int|None=None , distinct:bool=False , join_conditions = None ,
+                      fetch_config: FetchConfig | dict | None = None , timeout: float | None = None ) :
+        """异步版 select，参数与返回值格式同 SQLExecutor.select"""
+        sql, params = _build_select_sql(table_names, fields, conditions, order_by, limit, distinct, join_conditions)
+        fetch_mode, output_format, show_count, data_label = _resolve_fetch_config(fields, fetch_config)
+        return await self.fetch_format(sql, fetch_mode, output_format, show_count, data_label, params, timeout)
+
+    async def exists( self , table_names , conditions = None , join_conditions = None ,
+                      timeout: float | None = None ) -> bool :
+        """异步版 exists，使用 SELECT 1 ... LIMIT 1 判断数据是否存在"""
+        sql, params = _build_exists_sql(table_names, conditions, join_conditions)
+        return await self.fetch_format(sql, "one", "", False, None, params, timeout) is not None
+
+    async def insert( self , table_name , fields , skip_duplicate = False , timeout: float | None = None ) :
+        """
+        异步插入数据：单条 dict 直接插入；list[dict] 按字节（及每批最多 1000 条）切分 executemany，
+        所有批次在同一连接上执行，全部成功后统一提交
+
+        :param timeout: 每条语句的超时秒数，默认使用 query_timeout，超时抛出 QueryTimeoutError
+        :return: 插入的记录数（int）
+        """
+        if isinstance(fields, dict):
+            field_names = list(fields.keys())
+            sql = _build_insert_sql(table_name, field_names, skip_duplicate)
+            await self._run(sql, _build_row_values(fields, field_names), operation_name="insert", timeout=timeout)
+            return 1
+        if not isinstance(fields, list):
+            raise ValueError("fields must be a dict or a list of dicts")
+        if not fields:
+            return 0
+
+        field_names = list(fields[0].keys())
+        sql = _build_insert_sql(table_name, field_names, skip_duplicate)
+        convert_row = row_converter(field_names, fields)
+        await self._run_batches(sql, [convert_row(item) for item in fields], "insert", timeout)
+        return len(fields)
+
+    async def upsert( self , table_name , fields , fields_update = None , timeout: float | None = None ) :
+        """异步版 upsert（INSERT ... ON DUPLICATE KEY UPDATE），返回记录数"""
+        if isinstance(fields, dict):
+            keys = list(fields.keys())
+            await self._run(_build_upsert_sql(table_name, keys, fields_update),
+                            _build_row_values(fields, keys), operation_name="upsert", timeout=timeout)
+            return 1
+        if not isinstance(fields, list):
+            raise ValueError("fields must be a dict or a list of dicts")
+        if not fields:
+            return 0
+        keys = list(fields[0].keys())
+        convert_row = row_converter(keys, fields)
+        values = [convert_row(item) for item in fields]
+        await self._run_batches(_build_upsert_sql(table_name, keys, fields_update), values, "upsert", timeout)
+        return len(fields)
+
+    async def update( self , table_name , fields , conditions , timeout: float | None = None ) :
+        """异步版 update，返回受影响的行数"""
+        if not fields:
+            raise ValueError("fields 不能为空")
+        if not conditions:
+            raise ValueError("conditions 不能为空，这会导致更新所有记录")
+        sql, params = _build_update_sql(table_name, fields, conditions)
+        rowcount, _ = await self._run(sql, params, operation_name="update", timeout=timeout)
+        return rowcount
+
+    async def batch_update( self , table_name , update_list , timeout: float | None = None ) :
+        """异步版 batch_update，update_list 格式同 SQLExecutor.batch_update（超过字节上限时拆成多条，同一事务提交）"""
+        _validate_update_list(update_list)
+        batches = list(byte_batches(update_list, _update_item_size, _ASYNC_STATEMENT_BUDGET, len(table_name) + 32))
+        if len(batches) == 1:
+            sql, params = _build_batch_update_sql(table_name, batches[0])
+            await self._run(sql, params, operation_name="batch_update", timeout=timeout)
+            return
+        async with self._bound() as executor:
+            for batch in batches:
+                sql, params = _build_batch_update_sql(table_name, batch)
+                await executor._run(sql, params, operation_name="batch_update", timeout=timeout)
+
+    async def delete( self , table_name , conditions , timeout: float | None = None ) :
+        """异步版 delete，返回受影响的行数"""
+        if not conditions:
+            raise ValueError("conditions 不能为空，这会导致删除所有记录")
+        sql, params = _build_delete_sql(table_name, conditions)
+        rowcount, _ = await self._run(sql, params, operation_name="delete", timeout=timeout)
+        return rowcount
+
+    async def _run_batches( self , sql , values , operation_name , timeout = None ) :
+        """按字节切分 executemany 的参数列表；多于一批时在同一事务中依次执行"""
+        batches = list(byte_batches(values, insert_row_size, _ASYNC_STATEMENT_BUDGET,
+                                    len(sql.encode("utf-8")), _ASYNC_INSERT_BATCH_SIZE))
+        if len(batches) == 1:
+            await self._run(sql, batches[0], operation_name=operation_name, timeout=timeout)
+            return
+        async with self._bound() as executor:
+            for batch in batches:
+                await executor._run(sql, batch, operation_name=operation_name, timeout=timeout)
+
+    @asynccontextmanager
+    async def _bound( self ) :
+        """已在事务中时复用当前执行器，否则开启新事务"""
+        if self._connection is not None:
+            yield self
+        else:
+            async with self.transaction() as executor:
+                yield executor
@@ -0,0 +1,220 @@
+"""
+asyncio 版 MySQL 连接池，语义与 ConnectionPool 一致，等待连接时不阻塞事件循环
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+from .exceptions import PoolClosedError, PoolTimeoutError
+from .models import MySQLConfig, PoolConfig
+from .pool import _PoolEntry
+from .utils.connect import connect_db_async
+
+
+async def _close_quietly(connection):
+    try:
+        await connection.close()
+    except Exception:
+        pass
+
+
+async def _reset_connection(connection):
+    """回滚未提交的事务，使连接以干净状态回到池中；失败时返回 False"""
+    try:
+        if getattr(connection, "in_transaction", False):
+            await connection.rollback()
+        return True
+    except Exception:
+        return False
+
+
+class AsyncConnectionPool:
+    """
+    异步 MySQL 连接池（基于 mysql.connector.aio）
+
+    容量、借出超时、最长存活时间与空闲回收规则与 ConnectionPool 相同，均由 PoolConfig 控制。
+    min_size 个连接在首次借出时（或显式调用 open()）建立。
+    """
+
+    def __init__(self, sql_config=None, database=None, pool_config: PoolConfig | dict | None = None,
+                 profile=None):
+        self.sql_config = MySQLConfig.resolve(sql_config)
+        self.database = database or getattr(self.sql_config, "database", None)
+        if not self.database:
+            raise ValueError(
+                "未指定数据库名称！请通过 database 参数 或 sql_config.database 属性或环境变量 LAZY_MYSQL_DATABASE 提供数据库名。"
+            )
+        # 连接配置档（名称或 ConnectionProfile）：池中所有连接建立时设置同一组会话变量
+        self.profile = self.sql_config.get_profile(profile)
+
+        # 处理 pool_config，支持 PoolConfig 模型和字典方式
+        if pool_config is None:
+            pool_config = PoolConfig()
+        elif isinstance(pool_config, dict):
+            pool_config = PoolConfig(**pool_config)
+        self.pool_config = pool_config
+
+        self._idle: deque[_PoolEntry] = deque()
+        self._in_use: dict[int, _PoolEntry] = {}
+        self._size = 0
+        self._closed = False
+        self._opened = False
+        # asyncio.Condition 需在事件循环内创建，首次使用时初始化
+        self._cond: asyncio.Condition | None = None
+
+    def _condition(self):
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    async def _new_connection(self):
+        if self.profile is None:
+            return await connect_db_async(self.sql_config, self.database)
+        return await connect_db_async(self.sql_config, self.database, profile=self.profile)
+
+    def _is_expired(self, entry, now):
+        max_lifetime = self.pool_config.max_lifetime
+        return max_lifetime is not None and now - entry.created_at >= max_lifetime
+
+    def _collect_stale_locked(self, to_close):
+        """回收过期或空闲过久的连接，至少保留 min_size 个"""
+        now = time.monotonic()
+        idle_timeout = self.pool_config.idle_timeout
+        kept = deque()
+        for entry in self._idle:
+            stale = self._is_expired(entry, now) or (
+                idle_timeout is not None
+                and now - entry.last_used >= idle_timeout
+                and self._size > self.pool_config.min_size
+            )
+            if stale:
+                self._size -= 1
+                to_close.append(entry.connection)
+            else:
+                kept.append(entry)
+        self._idle = kept
+
+    async def open(self):
+        """预先建立 min_size 个连接"""
+        if self._opened:
+            return
+        self._opened = True
+        for _ in range(self.pool_config.min_size):
+            connection = await self._new_connection()
+            async with self._condition():
+                self._idle.append(_PoolEntry(connection))
+                self._size += 1
+
+    async def acquire(self, timeout: float | None = None):
+        """
+        从连接池借出一个连接
+
+        :param timeout: 最长等待时间（秒），默认使用 pool_config.timeout
+        :return: 异步数据库连接对象，使用完毕后必须通过 release() 归还
+        :raises PoolTimeoutError: 等待超时
+        :raises PoolClosedError: 连接池已关闭
+        """
+        if not self._opened:
+            await self.open()
+        if timeout is None:
+            timeout = self.pool_config.timeout
+        deadline = time.monotonic() + timeout
+        cond = self._condition()
+        to_close = []
+        try:
+            async with cond:
+                while True:
+                    if self._closed:
+                        raise PoolClosedError("连接池已关闭，无法借出连接")
+                    self._collect_stale_locked(to_close)
+                    if self._idle:
+                        entry = self._idle.pop()
+                        self._in_use[id(entry.connection)] = entry
+                        return entry.connection
+                    if self._size < self.pool_config.max_size:
+                        self._size += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeoutError(
+                            f"连接池已满（max_size={self.pool_config.max_size}），等待 {timeout} 秒后仍未借到连接"
+                        )
+                    try:
+                        await asyncio.wait_for(cond.wait(), remaining)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            for connection in to_close:
+                await _close_quietly(connection)
+
+        try:
+            entry = _PoolEntry(await self._new_connection())
+        except BaseException:
+            async with cond:
+                self._size -= 1
+                cond.notify()
+            raise
+        async with cond:
+            self._in_use[id(entry.connection)] = entry
+        return entry.connection
+
+    async def release(self, connection, discard: bool = False):
+        """
+        归还连接到连接池；回滚失败、连接已过期或 discard=True 时直接关闭该连接
+
+        :param connection: acquire() 借出的连接
+        :param discard: 是否丢弃该连接（如连接已断开）
+        """
+        cond = self._condition()
+        async with cond:
+            entry = self._in_use.pop(id(connection), None)
+        if entry is None:
+            await _close_quietly(connection)
+            return
+
+        if not discard:
+            discard = not await _reset_connection(connection) or self._is_expired(entry, time.monotonic())
+
+        async with cond:
+            if discard or self._closed:
+                self._size -= 1
+            else:
+                entry.last_used = time.monotonic()
+                self._idle.append(entry)
+                connection = None
+            cond.notify()
+        if connection is not None:
+            await _close_quietly(connection)
+
+    @asynccontextmanager
+    async def connection(self):
+        """以异步上下文管理器方式借出连接，退出时自动归还"""
+        connection = await self.acquire()
+        try:
+            yield connection
+        finally:
+            await self.release(connection)
+
+    @property
+    def stats(self) -> dict:
+        """连接池当前状态：总连接数、空闲连接数、借出连接数"""
+        return {
+            "size": self._size,
+            "idle": len(self._idle),
+            "in_use": len(self._in_use),
+            "max_size": self.pool_config.max_size,
+        }
+
+    async def close(self):
+        """关闭连接池：立即关闭空闲连接，借出中的连接在归还时关闭"""
+        cond = self._condition()
+        async with cond:
+            self._closed = True
+            to_close = [entry.connection for entry in self._idle]
+            self._size -= len(self._idle)
+            self._idle.clear()
+            cond.notify_all()
+        for connection in to_close:
+            await _close_quietly(connection)
@@ -1,8 +1,8 @@
-from .insert import insert, upsert
+from .insert import insert, upsert, insert_df, upsert_df
 from .select import select, exists
 from .update import update
 from .batch_update import batch_update
 from .merge_lists import merge_update_lists
 from .delete import delete
 
-__all__ = ['insert', 'upsert', 'select', 'exists', 'update', 'batch_update', 'delete', 'merge_update_lists']
+__all__ = ['insert', 'upsert', 'insert_df', 'upsert_df', 'select', 'exists', 'update', 'batch_update', 'delete', 'merge_update_lists']
@@ -1,5 +1,5 @@
-import pandas as pd
-from ..utils.value_converter import prepare_db_value
+from ..utils.batching import byte_batches, estimate_value_size, statement_budget
+from ..utils.value_converter import CONVERTER_SAMPLE_ROWS, column_converter
 from ..tools.where_clause import build_where
 
 
@@ -10,6 +10,8 @@ def batch_update(executor, table_name, update_list, commit=False, self_close=Fal
     策略选择逻辑：
     1. 如果所有记录的WHERE条件都是单一字段 → 使用简化的 CASE key_field WHEN 语法（性能最优）
     2. 如果WHERE条件包含多字段或复杂条件 → 使用通用的 CASE WHEN ... THEN 语法
+
+    记录较多或较宽时按字节切分为多条 UPDATE（每条不超过连接的 max_allowed_packet），在同一事务中提交
     
     :param executor: SQLExecutor 实例
     :param table_name: 表名
@@ -37,6 +39,64 @@ def batch_update(executor, table_name, update_list, commit=False, self_close=Fal
         ... ]
         >>> executor.batch_update('users', update_list, commit=True)
     """
+    _validate_update_list(update_list)
+    batches = list(byte_batches(update_list, _update_item_size, statement_budget(executor), len(table_name) + 32))
+
+    for index, batch in enumerate(batches):
+        sql, params = _build_batch_update_sql(table_name, batch)
+        # 只有最后一条语句提交 / 关闭连接，全部批次在同一事务中生效
+        last = index == len(batches) - 1
+        executor.execute(sql, params, commit and last, self_close and last)
+
+
+def _condition_value_size(value):
+    if isinstance(value, (tuple, list, set)):
+        return sum(_condition_value_size(v) for v in value)
+    return estimate_value_size(value)
+
+
+def _update_item_size(item):
+    """估算一条更新记录在批量 UPDATE 中占用的字节数：每个字段一个 WHEN <条件> THEN <值>，WHERE 中再出现一次条件"""
+    condition_size = sum(
+        len(str(key)) + _condition_value_size(value) + 8 for key, value in item['conditions'].items()
+    )
+    fields_size = sum(
+        len(str(key)) + condition_size + estimate_value_size(value) + 16 for key, value in item['fields'].items()
+    )
+    return fields_size + condition_size + 6
+
+
+def _build_batch_update_sql(table_name, update_list):
+    """
+    校验 update_list 并构建批量 UPDATE 语句（同步/异步执行器共用）
+
+    :return: (sql, params)
+    """
+    _validate_update_list(update_list)
+    
+    # 分析 WHERE 条件的复杂度
+    condition_rows = [item['conditions'] for item in update_list]
+    
+    # 判断是否使用简化模式
+    is_simple_case, key_field = _check_simple_case(condition_rows)
+    
+    # 收集所有更新字段（按首次出现的顺序）
+    all_fields = _collect_columns([item['fields'] for item in update_list])
+    
+    # 根据模式选择不同的SQL构建策略
+    if is_simple_case:
+        sql, params = _build_simple_update_sql(
+            table_name, update_list, all_fields, key_field, condition_rows
+        )
+    else:
+        sql, params = _build_complex_update_sql(
+            table_name, update_list, all_fields
+        )
+    return sql, params
+
+
+def _validate_update_list(update_list):
+    """校验 update_list 的格式"""
     if not update_list:
         raise ValueError("update_list 不能为空")
     
@@ -56,43 +116,43 @@ def batch_update(executor, table_name, update_list, commit=False, self_close=Fal
         # 防御：检查 conditions 不能为空或None
         if not item['conditions']:
             raise ValueError("conditions 不能为空，这会导致更新所有记录")
-    
-    # 使用 pandas 分析 WHERE 条件的复杂度
-    df_conditions = pd.DataFrame([item['conditions'] for item in update_list])
-    
-    # 判断是否使用简化模式
-    is_simple_case, key_field = _check_simple_case(df_conditions)
-    
-    # 收集所有更新字段
-    df_updates = pd.DataFrame([item['fields'] for item in update_list])
-    all_fields = df_updates.columns.tolist()
-    
-    # 根据模式选择不同的SQL构建策略
-    if is_simple_case:
-        sql, params = _build_simple_update_sql(
-            table_name, update_list, all_fields, key_field, df_conditions
-        )
-    else:
-        sql, params = _build_complex_update_sql(
-            table_name, update_list, all_fields
-        )
-    
-    # 执行SQL
-    executor.execute(sql, params, commit, self_close)
 
 
-def _check_simple_case(df_conditions):
+def _as_rows(condition_rows):
+    """条件列表；兼容传入 DataFrame（转换为字典列表）"""
+    if hasattr(condition_rows, 'to_dict'):
+        return condition_rows.to_dict(orient='records')
+    return condition_rows
+
+
+def _collect_columns(rows):
+    """所有字典出现过的键（按首次出现的顺序去重）"""
+    return list(dict.fromkeys(key for row in rows for key in row))
+
+
+def _field_converters(update_list, all_fields):
+    """按前 CONVERTER_SAMPLE_ROWS 条记录抽样各字段的值类型，为每个字段生成专用的转换函数"""
+    sample = [item['fields'] for item in update_list[:CONVERTER_SAMPLE_ROWS]]
+    return {
+        field: column_converter([fields[field] for fields in sample if field in fields])
+        for field in all_fields
+    }
+
+
+def _check_simple_case(condition_rows):
     """
     检查是否可以使用简化的 CASE WHEN 语法
     
-    :param df_conditions: WHERE条件的DataFrame
+    :param condition_rows: 每条记录的 WHERE 条件字典列表
     :return: (is_simple_case, key_field) - 是否简化模式及主键字段名
     """
-    if len(df_conditions.columns) != 1:
+    condition_rows = _as_rows(condition_rows)
+    columns = _collect_columns(condition_rows)
+    if len(columns) != 1:
         return False, None
     
-    key_field = df_conditions.columns[0]
-    sample_values = df_conditions[key_field].tolist()
+    key_field = columns[0]
+    sample_values = [row[key_field] for row in condition_rows]
     
     # 检查是否所有值都是简单值（非元组）
     if any(isinstance(v, tuple) for v in sample_values):
@@ -112,6 +172,7 @@ def _build_case_clauses_simple(update_list, all_fields, key_field):
         格式: {field: [(key_value, value), ...]}
     """
     case_clauses = {field: [] for field in all_fields}
+    converters = _field_converters(update_list, all_fields)
     
     for item in update_list:
         record_fields = item['fields']
@@ -119,7 +180,7 @@ def _build_case_clauses_simple(update_list, all_fields, key_field):
         
         for field in all_fields:
             if field in record_fields:
-                value = prepare_db_value(record_fields[field])
+                value = converters[field](record_fields[field])
                 case_clauses[field].append((key_value, value))
     
     return case_clauses
@@ -136,6 +197,7 @@ def _build_case_clauses_complex(update_list, all_fields):
         all_conditions 格式: [(where_clause, where_params), ...]
     """
     case_clauses = {field: [] for field in all_fields}
+    converters = _field_converters(update_list, all_fields)
     all_conditions = []
     
     for item in update_list:
@@ -153,7 +215,7 @@ def _build_case_clauses_complex(update_list, all_fields):
         
         for field in all_fields:
             if field in record_fields:
-                value = prepare_db_value(record_fields[field])
+                value = converters[field](record_fields[field])
                 case_clauses[field].append((where_clause, where_params, value))
     
     return case_clauses, all_conditions
@@ -219,7 +281,7 @@ def _build_set_clause_complex(case_clauses):
     return ', '.join(set_parts), params
 
 
-def _build_simple_update_sql(table_name, update_list, all_fields, key_field, df_conditions):
+def _build_simple_update_sql(table_name, update_list, all_fields, key_field, condition_rows):
     """
     构建简化模式的完整UPDATE SQL
     
@@ -242,7 +304,7 @@ def _build_simple_update_sql(table_name, update_list, all_fields, key_field, df_
     set_clause, set_params = _build_set_clause_simple(case_clauses, key_field)
     
     # 构建WHERE IN子句
-    key_values = df_conditions[key_field].tolist()
+    key_values = [row[key_field] for row in _as_rows(condition_rows)]
     placeholders = ', '.join(['%s'] * len(key_values))
     where_clause = f"{key_field} IN ({placeholders})"
     
@@ -16,10 +16,15 @@ def delete(executor, table_name, conditions, commit=False, self_close=False):
             executor.close()
         raise ValueError("conditions 不能为空，这会导致删除所有记录")
 
-    # 构造SQL语句
-    sql, params = build_sql_with_where(f"DELETE FROM {table_name}", conditions)
-    sql += ";"
+    sql, params = _build_delete_sql(table_name, conditions)
 
     # 执行SQL
     executor.execute(sql, params, commit, self_close)
-    return executor.mycursor.rowcount
\ No newline at end of file
+    return executor.mycursor.rowcount
+
+
+def _build_delete_sql(table_name, conditions):
+    """构建 DELETE 语句（同步/异步执行器共用），返回 (sql, params)"""
+    sql, params = build_sql_with_where(f"DELETE FROM {table_name}", conditions)
+    sql += ";"
+    return sql, params
\ No newline at end of file
@@ -1,30 +1,74 @@
 import os
-import csv
 import tempfile
+import time
+from collections import deque
+from contextlib import nullcontext
+from itertools import chain, islice
 
-from ..utils.value_converter import prepare_db_row, prepare_db_value
+from ..utils.autotune import EXECUTEMANY, LOAD_DATA, get_tuner, save_tuning
+from ..utils.batching import MAX_BATCH_ROWS, byte_batches, execute_batches, insert_row_size, statement_budget
+from ..utils.bulk_session import LoadWarnings, bulk_load_session, capture_warnings
+from ..utils.frame_converter import frame_columns, frame_values
+from ..utils.load_data_format import FIELDS_CLAUSE, write_rows
+from ..utils.load_source import LOAD_SOURCES, fifo_source, fifo_supported
+from ..utils.parallel_load import check_parallelism, run_parallel
+from ..utils.server_vars import server_variable
+from ..utils.value_converter import CONVERTER_SAMPLE_ROWS, convert_value, row_converter
 
-def insert(executor, table_name, fields, skip_duplicate=False, commit=False, self_close=False, temp_dir=None):
+# 数据量达到该条数时使用 LOAD DATA INFILE（可迭代对象输入时先读取至多该条数来判断策略）
+LOAD_DATA_THRESHOLD = 100000
+# LOAD DATA 每批（每个临时文件）的条数
+LOAD_DATA_BATCH_SIZE = 50000
+
+def insert(executor, table_name, fields, skip_duplicate=False, commit=False, self_close=False, temp_dir=None,
+           bulk_session=False, load_source='file', parallelism=1, auto_tune=False):
     """
     智能SQL插入执行器方法，根据数据量自动选择最优插入策略
     
     策略选择：
     - 单条数据（dict）: 使用传统insert
-    - 数据量 < 1000条: 使用现有executemany
-    - 1000-50000条: 使用优化executemany（分批1000条）
-    - 50000-100000条: 使用优化executemany（分批5000条）
+    - 数据量 < 1000条: 使用现有executemany（按 max_allowed_packet 字节切分，一个事务）
+    - 1000-100000条: 使用优化executemany（按 max_allowed_packet 字节切分，每批提交）
     - 数据量 >= 100000条: 使用LOAD DATA INFILE（分批50000条）
+
+    parallelism > 1 时后两种策略的批次分配到 N 个连接并行写入（每批由所在连接提交）
+
+    executemany 按字节切分批次，每批不超过连接的 max_allowed_packet（每个连接只查询一次）
     
     :param executor: SQLExecutor 实例
     :param table_name: 表名
-    :param fields: 字段和值，格式为字典或字典列表
+    :param fields: 字段和值，格式为字典、字典列表，或逐条产出字典的可迭代对象（生成器、DataFrame 及分块读取的
+        DataFrame 迭代器等）；可迭代对象按批读取，内存占用取决于批大小而不是数据总量
     :param skip_duplicate: 是否跳过重复数据--基于主键或唯一索引(包含唯一复合索引)判断
         注意: 只有主键或当索引被明确设置为UNIQUE时才会触发跳过重复记录的行为,普通索引(如INDEX)不会导致跳过重复记录。
     :param commit: 是否自动提交
     :param self_close: 是否自动关闭连接
-    :param temp_dir: 临时文件目录，默认为系统临时目录
+    :param temp_dir: 临时文件（或命名管道）目录，默认为系统临时目录
+    :param bulk_session: LOAD DATA 期间是否临时放宽会话级检查（unique_checks / foreign_key_checks 等，
+        结束后恢复原值）；True 使用 BULK_LOAD_SESSION_VARS，也可传入会话变量字典
+    :param load_source: LOAD DATA 的数据源，'file'（临时文件）或 'fifo'（命名管道，边生成数据边发送，不写磁盘）
+    :param parallelism: 并行写入的连接数（>= 1000 条时生效），需要 commit=True；
+        部分连接失败时抛出 ParallelLoadError，其中包含已提交的条数与各工作线程的错误
+    :param auto_tune: 自动调优模式：不使用上述固定阈值，按每批实测的耗时与字节数调整批大小（AIMD），
+        按实测吞吐在 executemany 与 LOAD DATA 之间选择，学到的参数按表保存在进程内；
+        传入文件路径（str 或 os.PathLike）时同时从该文件加载并在结束后保存；其他类型抛出 ValueError
     :return: 插入成功的记录数（int）
     """
+    if load_source not in LOAD_SOURCES:
+        raise ValueError(f"load_source must be one of {LOAD_SOURCES}, got {load_source!r}")
+    if not isinstance(auto_tune, (bool, str, os.PathLike)):
+        raise ValueError(f"auto_tune must be a bool, str or os.PathLike, got {auto_tune!r}")
+    parallel = check_parallelism(executor, parallelism, commit)
+
+    if auto_tune and not isinstance(fields, dict):
+        if parallel or bulk_session:
+            raise ValueError("auto_tune 不能与 parallelism > 1 或 bulk_session 同时使用")
+        return _insert_auto_tuned(executor, table_name, fields, skip_duplicate, commit, self_close, temp_dir,
+                                  load_source, None if auto_tune is True else os.fspath(auto_tune))
+
+    if _is_dataframe(fields):
+        return insert_df(executor, table_name, fields, skip_duplicate, commit, self_close, temp_dir, bulk_session,
+                         load_source, parallelism)
 
     # 空列表快速返回
     if isinstance(fields, list) and not fields:
@@ -48,27 +92,31 @@ def insert(executor, table_name, fields, skip_duplicate=False, commit=False, sel
             # 小数据量：使用现有方案
             field_names = list(fields[0].keys())
             sql = _build_insert_sql(table_name, field_names, skip_duplicate)
-            values = [_build_row_values(item, field_names) for item in fields]
-            executor.execute(sql, values, commit, self_close)
-            
-        elif insert_num < 50000:
-            # 中等数据量：优化executemany，分批1000条
-            return _executemany_optimized(executor, table_name, fields, skip_duplicate, commit, 1000, self_close)
+            convert_row = row_converter(field_names, fields)
+            values = [convert_row(item) for item in fields]
+            # 通常一批即可发送；宽行（如大 JSON）超过 max_allowed_packet 时按字节切分，同一事务提交
+            execute_batches(executor, sql, values, statement_budget(executor), commit, self_close)
             
-        elif insert_num < 100000:
-            # 大数据量：优化executemany，分批5000条
-            return _executemany_optimized(executor, table_name, fields, skip_duplicate, commit, 5000, self_close)
+        elif insert_num < LOAD_DATA_THRESHOLD:
+            # 中等/大数据量：优化executemany，按 max_allowed_packet 切分批次，每批提交
+            return _executemany_optimized(executor, table_name, fields, skip_duplicate, commit, None, self_close,
+                                          parallelism)
             
         else:
             # 超大数据量：使用LOAD DATA INFILE
-            return _bulk_insert_load_data(executor, table_name, fields, skip_duplicate, commit, 50000, temp_dir, self_close)
+            return _bulk_insert_load_data(executor, table_name, fields, skip_duplicate, commit, LOAD_DATA_BATCH_SIZE,
+                                          temp_dir, self_close, bulk_session, load_source, parallelism)
             
         return insert_num
+
+    elif _is_row_iterable(fields):
+        return _insert_iterable(executor, table_name, fields, skip_duplicate, commit, self_close, temp_dir,
+                                bulk_session, load_source, parallelism)
     
     else:
         if self_close and commit :
             executor.close()
-        raise ValueError("fields must be a dict or a list of dicts")
+        raise ValueError("fields must be a dict, a list of dicts or an iterable of dicts")
 
 
 def upsert(executor, table_name, fields, fields_update=None, commit=False, self_close=False):
@@ -78,6 +126,9 @@ def upsert(executor, table_name, fields, fields_update=None, commit=False, self_
     单条：dict -> 直接 upsert
     多条：list[dict] -> 批量 executemany upsert
     
+    可迭代对象（生成器、DataFrame 及分块读取的 DataFrame 迭代器等）-> 逐批读取并 executemany
+    批次按字节切分，每批不超过连接的 max_allowed_packet
+
     :param fields_update: 指定冲突时更新的字段，None 表示更新所有字段
     示例：{'age'} 表示只更新 age 字段，其他字段保持不变
     """
@@ -89,12 +140,291 @@ def upsert(executor, table_name, fields, fields_update=None, commit=False, self_
 
     if isinstance(fields, dict):
         return _upsert_single(executor, table_name, fields, fields_update, commit, self_close)
+    elif _is_dataframe(fields):
+        return upsert_df(executor, table_name, fields, fields_update, commit, self_close)
     elif isinstance(fields, list):
         return _upsert_batch(executor, table_name, fields, fields_update, commit, self_close)
+    elif _is_row_iterable(fields):
+        return _upsert_iterable(executor, table_name, fields, fields_update, commit, self_close)
     else:
         if self_close:
             executor.close()
-        raise ValueError("fields must be a dict or a list of dicts")
+        raise ValueError("fields must be a dict, a list of dicts or an iterable of dicts")
+
+
+def insert_df(executor, table_name, df, skip_duplicate=False, commit=False, self_close=False, temp_dir=None,
+              bulk_session=False, load_source='file', parallelism=1):
+    """
+    插入 DataFrame：按列转换参数（每列按 dtype 选择一种转换方式，缺失值按掩码置为 None），
+    不经过 to_dict('records') 与逐个单元格的 prepare_db_value，策略选择与 insert 相同
+
+    :param df: pandas DataFrame，列名即字段名
+    其余参数同 insert
+    :return: 插入成功的记录数（int）
+    """
+    if not _is_dataframe(df):
+        raise TypeError(f"df must be a pandas DataFrame, got {type(df).__name__}")
+    if load_source not in LOAD_SOURCES:
+        raise ValueError(f"load_source must be one of {LOAD_SOURCES}, got {load_source!r}")
+    check_parallelism(executor, parallelism, commit)
+
+    insert_num = len(df)
+    if insert_num == 0:
+        if self_close:
+            executor.close()
+        return 0
+
+    field_names = frame_columns(df)
+    if insert_num >= LOAD_DATA_THRESHOLD:
+        # 按块转换后流式写入 LOAD DATA，同一时间只保留一块参数
+        return _bulk_insert_load_data(executor, table_name, frame_values(df), skip_duplicate, commit,
+                                      LOAD_DATA_BATCH_SIZE, temp_dir, self_close, bulk_session, load_source,
+                                      parallelism, field_names)
+    if insert_num >= 1000:
+        return _executemany_optimized(executor, table_name, list(frame_values(df)), skip_duplicate, commit, None,
+                                      self_close, parallelism, field_names)
+    sql = _build_insert_sql(table_name, field_names, skip_duplicate)
+    execute_batches(executor, sql, frame_values(df), statement_budget(executor), commit, self_close)
+    return insert_num
+
+
+def upsert_df(executor, table_name, df, fields_update=None, commit=False, self_close=False):
+    """
+    upsert DataFrame：按列转换参数后按字节切分 executemany，全部批次在同一事务中提交（同 list[dict] 输入）
+
+    :param df: pandas DataFrame，列名即字段名
+    其余参数同 upsert
+    :return: 插入或更新成功的记录数（int）
+    """
+    if not _is_dataframe(df):
+        raise TypeError(f"df must be a pandas DataFrame, got {type(df).__name__}")
+    if len(df) == 0:
+        if self_close:
+            executor.close()
+        return 0
+    sql = _build_upsert_sql(table_name, frame_columns(df), fields_update)
+    execute_batches(executor, sql, frame_values(df), statement_budget(executor), commit, self_close)
+    return len(df)
+
+
+def _is_dataframe(value):
+    return type(value).__module__.split('.')[0] == 'pandas' and hasattr(value, 'to_dict') and hasattr(value, 'columns')
+
+
+def _is_row_iterable(fields):
+    """是否为可逐条产出记录的可迭代对象（字符串、字节串等不算）"""
+    if _is_dataframe(fields):
+        return True
+    if isinstance(fields, (str, bytes, bytearray, dict)):
+        return False
+    return hasattr(fields, '__iter__')
+
+
+def _iter_rows(fields):
+    """逐条产出字典记录：DataFrame（包括分块读取的 DataFrame 迭代器中的每一块）按块展开"""
+    if _is_dataframe(fields):
+        fields = (fields,)
+    for item in fields:
+        if isinstance(item, dict):
+            yield item
+        elif _is_dataframe(item):
+            yield from item.to_dict('records')
+        else:
+            raise ValueError(f"fields 中的每一项必须是字典或 DataFrame，收到：{type(item).__name__}")
+
+
+def _chunked(rows, size):
+    """将记录迭代器切分为每批至多 size 条的列表"""
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _drain(buffer):
+    """逐条取出并释放缓冲区中的记录，已写出的记录不再占用内存"""
+    while buffer:
+        yield buffer.popleft()
+
+
+def _convert_chunks(rows, field_names, chunk_rows=10000):
+    """逐块为字典记录生成转换函数并产出参数元组"""
+    for chunk in _chunked(rows, chunk_rows):
+        yield from map(row_converter(field_names, chunk), chunk)
+
+
+def _value_stream(fields):
+    """
+    将输入统一为参数元组流
+
+    :return: (字段名, 参数元组迭代器, 总条数)；总条数未知（迭代器输入）时为 None，没有记录时字段名为 None
+    """
+    if _is_dataframe(fields):
+        return frame_columns(fields), frame_values(fields), len(fields)
+    if not (isinstance(fields, list) or _is_row_iterable(fields)):
+        raise ValueError("fields must be a dict, a list of dicts or an iterable of dicts")
+    total = len(fields) if isinstance(fields, list) else None
+    rows = _iter_rows(fields)
+    first = next(rows, None)
+    if first is None:
+        return None, iter(()), 0
+    field_names = list(first.keys())
+    return field_names, _convert_chunks(chain((first,), rows), field_names), total
+
+
+def _take_rows(values, pending, limit, budget=None, base_size=0):
+    """
+    从参数元组流中读取一批：至多 limit 条，指定 budget 时语句估算大小不超过 budget
+
+    :param pending: 上一批因超出字节上限而留下的一条记录
+    :return: (batch, 本批估算字节数, 留给下一批的记录)
+    """
+    batch = []
+    size = base_size
+    row = pending
+    while len(batch) < limit:
+        if row is None:
+            row = next(values, None)
+            if row is None:
+                break
+        row_size = insert_row_size(row)
+        if budget is not None and batch and size + row_size > budget:
+            break
+        batch.append(row)
+        size += row_size
+        row = None
+    return batch, size - base_size, row
+
+
+def _local_infile_enabled(executor):
+    """服务端是否允许 LOAD DATA LOCAL（读取不到时按允许处理，由实际执行结果决定）"""
+    ensure_connection = getattr(executor, '_ensure_connection', None)
+    if ensure_connection is not None:
+        ensure_connection()
+    connection = getattr(executor, 'mydb', None)
+    if connection is None:
+        return True
+    value = server_variable(connection, 'GLOBAL.local_infile')
+    return value is None or str(value).upper() not in ('0', 'OFF')
+
+
+def _is_local_infile_error(error):
+    """LOAD DATA 是否因 LOCAL INFILE 被驱动（2068）或服务端（3948）拒绝"""
+    message = str(error).upper()
+    return 'LOCAL INFILE' in message or 'LOADING LOCAL DATA IS DISABLED' in message
+
+
+def _prepare_fallback(executor, connection, commit):
+    """
+    LOAD DATA 被拒绝后，准备在执行器上改用 executemany 重试同一批
+
+    - 连接仍是执行该批前的连接（如 transaction() 内）：直接重试
+    - 连接已随失败的语句关闭：commit=True 时此前的批次均已提交，重新连接后重试；
+      否则此前未提交的批次已随连接回滚，不能继续，返回 False
+    """
+    if getattr(executor, 'mydb', None) is connection:
+        return True
+    if not commit:
+        return False
+    executor._bind_connection(*executor._open_replacement())
+    return True
+
+
+def _insert_auto_tuned(executor, table_name, fields, skip_duplicate, commit, self_close, temp_dir, load_source,
+                       persist_path=None):
+    """
+    自动调优的插入：每批开始前由该表的 InsertTuner 选择策略与批大小，执行后记录耗时与字节数
+
+    - executemany 批次同时受 max_allowed_packet 字节上限约束
+    - 服务端关闭 local_infile 时只使用 executemany；LOAD DATA 因 LOCAL INFILE 被拒绝时，该批改用 executemany 重试
+    - commit=True 时每批提交
+    """
+    if load_source == 'fifo' and not fifo_supported():
+        load_source = 'file'
+    inserted_count = 0
+    try:
+        field_names, values, total = _value_stream(fields)
+        if field_names is None:
+            return 0
+        tuner = get_tuner(getattr(executor, 'database', None), table_name, persist_path)
+        sql = _build_insert_sql(table_name, field_names, skip_duplicate)
+        build_load_sql = _load_data_sql_builder(table_name, field_names, skip_duplicate)
+        budget = statement_budget(executor)
+        if tuner.load_data_available and not _local_infile_enabled(executor):
+            tuner.disable_load_data()
+        load_warnings = executor.last_load_warnings = LoadWarnings()
+        pending = None
+
+        while total is None or inserted_count < total:
+            strategy = tuner.choose(None if total is None else total - inserted_count)
+            if strategy == LOAD_DATA:
+                batch, nbytes, pending = _take_rows(values, pending, tuner.batch_rows(LOAD_DATA))
+            else:
+                batch, nbytes, pending = _take_rows(values, pending, tuner.batch_rows(EXECUTEMANY), budget, len(sql))
+            if not batch:
+                break
+
+            connection = getattr(executor, 'mydb', None)
+            started = time.perf_counter()
+            try:
+                if strategy == LOAD_DATA:
+                    def write_data(stream, batch=batch):
+                        _write_load_data_rows(stream, batch)
+
+                    with capture_warnings(executor):
+                        if load_source == 'fifo':
+                            _load_batch_from_fifo(executor, build_load_sql, write_data, commit, temp_dir)
+                        else:
+                            _load_batch_from_file(executor, build_load_sql, write_data, commit, temp_dir)
+                        load_warnings.collect(getattr(executor, 'mycursor', None))
+                else:
+                    executor.execute(sql, batch, commit=commit)
+            except Exception as e:
+                if strategy != LOAD_DATA or not _is_local_infile_error(e):
+                    tuner.penalize(strategy)
+                    raise
+                # 驱动或服务端拒绝 LOCAL INFILE：之后的插入只使用 executemany，本批按字节切分后改用 executemany 写入
+                tuner.disable_load_data()
+                if not _prepare_fallback(executor, connection, commit):
+                    raise
+                print(f"[auto-tune] LOAD DATA LOCAL INFILE rejected, retrying the batch of {len(batch)} records "
+                      f"with executemany")
+                execute_batches(executor, sql, batch, budget, commit=commit)
+                inserted_count += len(batch)
+                continue
+            elapsed = time.perf_counter() - started
+
+            tuner.record(strategy, len(batch), nbytes, elapsed)
+            inserted_count += len(batch)
+            print(f"[auto-tune] {strategy} batch of {len(batch)} records ({nbytes} bytes) in {elapsed * 1000:.0f} ms, "
+                  f"{len(batch) / max(elapsed, 1e-6):,.0f} rows/s, next {strategy} batch_size : {tuner.batch_rows(strategy)}")
+    finally:
+        if self_close:
+            executor.close()
+        if persist_path is not None:
+            try:
+                save_tuning(persist_path)
+            except OSError as e:
+                print(f"[auto-tune] Failed to save tuning state to {persist_path}: {e}")
+
+    print(f"[auto-tune] All completed! Total {inserted_count} records inserted")
+    return inserted_count
+
+
+def _insert_iterable(executor, table_name, fields, skip_duplicate, commit, self_close, temp_dir, bulk_session,
+                     load_source='file', parallelism=1):
+    """
+    可迭代对象输入的插入：先读取至多 LOAD_DATA_THRESHOLD 条判断数据量，
+    不足时已全部读入，按列表输入的策略处理；达到时剩余记录按批流式写入 LOAD DATA
+    """
+    rows = _iter_rows(fields)
+    head = deque(islice(rows, LOAD_DATA_THRESHOLD))
+    if len(head) < LOAD_DATA_THRESHOLD:
+        return insert(executor, table_name, list(head), skip_duplicate, commit, self_close, temp_dir, bulk_session,
+                      load_source, parallelism)
+    return _bulk_insert_load_data(executor, table_name, chain(_drain(head), rows), skip_duplicate, commit,
+                                  LOAD_DATA_BATCH_SIZE, temp_dir, self_close, bulk_session, load_source, parallelism)
 
 
 def _build_insert_sql(table_name, fields, skip_duplicate=False):
@@ -106,24 +436,12 @@ def _build_insert_sql(table_name, fields, skip_duplicate=False):
 
 
 def _build_row_values(data, field_names):
-    processed_data = prepare_db_row(data)
-    return tuple(processed_data[field] for field in field_names)
-
-
-def _format_load_data_value(value):
-    normalized_value = prepare_db_value(value)
-
-    if normalized_value is None:
-        return r'\N'
-
-    if isinstance(normalized_value, bool):
-        return int(normalized_value)
-
-    return normalized_value
+    """单条记录的参数元组；批量记录使用 row_converter 按批生成的转换函数"""
+    return tuple([convert_value(data[field]) for field in field_names])
 
 
-def _upsert_single(executor, table_name, data, fields_update, commit, self_close):
-    keys = list(data.keys())
+def _build_upsert_sql(table_name, keys, fields_update=None):
+    """构建 INSERT ... ON DUPLICATE KEY UPDATE 语句的公共方法"""
     insert_sql = f"INSERT INTO {table_name} ({', '.join(keys)}) VALUES ({', '.join(['%s'] * len(keys))})"
     
     # 确定要更新的字段
@@ -135,119 +453,240 @@ def _upsert_single(executor, table_name, data, fields_update, commit, self_close
         update_keys = [k for k in keys if k in fields_update]
     
     update_sql = ', '.join([f"{k} = VALUES({k})" for k in update_keys])
-    sql = f"{insert_sql} ON DUPLICATE KEY UPDATE {update_sql}"
+    return f"{insert_sql} ON DUPLICATE KEY UPDATE {update_sql}"
+
+
+def _upsert_single(executor, table_name, data, fields_update, commit, self_close):
+    keys = list(data.keys())
+    sql = _build_upsert_sql(table_name, keys, fields_update)
     executor.execute(sql, _build_row_values(data, keys), commit=commit, self_close=self_close)
     return 1
 
 
 def _upsert_batch(executor, table_name, data_list, fields_update, commit, self_close):
     keys = list(data_list[0].keys())
-    insert_sql = f"INSERT INTO {table_name} ({', '.join(keys)}) VALUES ({', '.join(['%s'] * len(keys))})"
-    
-    # 确定要更新的字段
-    if fields_update is None:
-        # 更新所有字段
-        update_keys = keys
-    else:
-        # 只更新指定的字段
-        update_keys = [k for k in keys if k in fields_update]
-    
-    update_sql = ', '.join([f"{k} = VALUES({k})" for k in update_keys])
-    sql = f"{insert_sql} ON DUPLICATE KEY UPDATE {update_sql}"
-    values = [_build_row_values(d, keys) for d in data_list]
-    executor.execute(sql, values, commit=commit, self_close=self_close)
+    sql = _build_upsert_sql(table_name, keys, fields_update)
+    convert_row = row_converter(keys, data_list)
+    values = [convert_row(d) for d in data_list]
+    execute_batches(executor, sql, values, statement_budget(executor), commit, self_close)
     return len(data_list)
 
 
+def _upsert_iterable(executor, table_name, fields, fields_update, commit, self_close):
+    """可迭代对象输入的 upsert：按字节切分批次逐批 executemany（每批提交），同一时间只保留一批记录"""
+    upserted_count = 0
+    try:
+        rows = _iter_rows(fields)
+        head = list(islice(rows, CONVERTER_SAMPLE_ROWS))
+        if not head:
+            return 0
+        keys = list(head[0].keys())
+        sql = _build_upsert_sql(table_name, keys, fields_update)
+        values = map(row_converter(keys, head), chain(head, rows))
+        del head
+        for batch in byte_batches(values, insert_row_size, statement_budget(executor), len(sql)):
+            executor.execute(sql, batch, commit=commit)
+            upserted_count += len(batch)
+    finally:
+        if self_close:
+            executor.close()
+    return upserted_count
+
+
 def _bulk_insert_load_data(executor, table_name, fields, skip_duplicate=False, 
-                          commit=True, batch_size=50000, temp_dir=None, self_close=False):
+                          commit=True, batch_size=50000, temp_dir=None, self_close=False, bulk_session=False,
+                          load_source='file', parallelism=1, field_names=None):
     """
     使用LOAD DATA INFILE进行超高速批量插入，专为百万级数据量优化
     
     性能说明：
     - 160万条数据预计耗时30-60秒
     - 比传统executemany快20-50倍
-    - 内存占用极低，支持流式处理
+    - 内存占用极低，支持流式处理：fields 为迭代器时逐批读取，同一时间只保留一批记录
+
+    服务端报告的警告（截断、类型转换、重复键被忽略等）汇总到 executor.last_load_warnings（LoadWarnings）
+
+    load_source='fifo' 时每批写入命名管道而不是临时文件：数据生成与驱动发送同时进行，不产生磁盘 I/O
+
+    parallelism > 1 时批次分配到多个工作连接并行导入，每个连接各自提交（bulk_session 在每个工作连接上生效）
+
+    指定 field_names 时 fields 为已转换的参数元组（如 insert_df 按列转换的结果），顺序与 field_names 一致
     """
+    if load_source == 'fifo' and not fifo_supported():
+        print("[LOAD DATA] Named pipes are not supported on this platform, falling back to temp files")
+        load_source = 'file'
     
-    if not isinstance(fields, list) or not fields:
+    if isinstance(fields, list):
+        total_records = len(fields)
+        batches = (fields[start:start + batch_size] for start in range(0, total_records, batch_size))
+    else:
+        # 迭代器输入：总数未知，逐批读取
+        total_records = None
+        batches = _chunked(iter(fields), batch_size)
+    first_batch = next(batches, None)
+    if not first_batch:
         if self_close:
             executor.close()
         return 0
     
     # 获取字段名和顺序
-    field_names = list(fields[0].keys())
-    fields_str = ', '.join(field_names)
+    converted = field_names is not None
+    if not converted:
+        field_names = list(first_batch[0].keys())
+    build_load_sql = _load_data_sql_builder(table_name, field_names, skip_duplicate)
+    batches = chain((first_batch,), batches)
+    del first_batch
     
-    total_records = len(fields)
     inserted_count = 0
-    total_batches = (total_records - 1) // batch_size + 1
-    
-    print(f"[LOAD DATA] Starting to process - total_records : {total_records} , total_batches : {total_batches}, batch_size : {batch_size} records")
-    
+    if total_records is None:
+        total_batches = '?'
+        print(f"[LOAD DATA] Starting to process - streaming input, batch_size : {batch_size} records")
+    else:
+        total_batches = (total_records - 1) // batch_size + 1
+        print(f"[LOAD DATA] Starting to process - total_records : {total_records} , total_batches : {total_batches}, batch_size : {batch_size} records")
+
+    load_warnings = executor.last_load_warnings = LoadWarnings()
+    session_vars = None if bulk_session is True else bulk_session
+
+    def load_batch(target, batch_data):
+        """在 target 执行器上导入一批记录，返回本批的警告数"""
+        # 字典记录按本批抽样的列类型生成转换函数；已转换的参数元组直接写入
+        convert_row = None if converted else row_converter(field_names, batch_data)
+
+        def write_data(stream):
+            # 写入数据，确保字段顺序一致
+            rows = batch_data if convert_row is None else map(convert_row, batch_data)
+            _write_load_data_rows(stream, rows)
+
+        with capture_warnings(target):
+            if load_source == 'fifo':
+                _load_batch_from_fifo(target, build_load_sql, write_data, commit, temp_dir)
+            else:
+                _load_batch_from_file(target, build_load_sql, write_data, commit, temp_dir)
+            return load_warnings.collect(getattr(target, 'mycursor', None))
+
+    if parallelism > 1:
+        def load_worker_batch(worker_executor, worker_index, batch_data):
+            batch_warnings = load_batch(worker_executor, batch_data)
+            print(f"[LOAD DATA] Worker {worker_index} committed a batch of {len(batch_data)} records"
+                  + (f", {batch_warnings} warnings" if batch_warnings else ""))
+            return len(batch_data)
+
+        print(f"[LOAD DATA] Loading in parallel on {parallelism} connections")
+        worker_session = (lambda worker_executor: bulk_load_session(worker_executor, session_vars)) if bulk_session else None
+        try:
+            inserted_count = run_parallel(batches, executor._worker_executor, load_worker_batch, parallelism,
+                                          worker_session)
+        finally:
+            if self_close:
+                executor.close()
+        print(f"[LOAD DATA] All completed! Total {inserted_count} records inserted")
+        return inserted_count
+
+    if bulk_session:
+        session = bulk_load_session(executor, session_vars)
+    else:
+        session = nullcontext()
+
     try:
-        # 分批处理，避免单次文件过大
-        for batch_start in range(0, total_records, batch_size):
-            batch_end = min(batch_start + batch_size, total_records)
-            batch_data = fields[batch_start:batch_end]
-            batch_num = batch_start // batch_size + 1
-            
-            print(f"[LOAD DATA] Processing batch {batch_num}/{total_batches} ({batch_start}-{batch_end-1})...")
-            
-            # 创建临时CSV文件
-            with tempfile.NamedTemporaryFile(
-                mode='w+', 
-                suffix='.csv', 
-                delete=False, 
-                newline='', 
-                dir=temp_dir,
-                encoding='utf-8'
-            ) as tmp_file:
-                
-                csv_writer = csv.writer(tmp_file, quoting=csv.QUOTE_MINIMAL)
-                
-                # 写入数据，确保字段顺序一致
-                for row in batch_data:
-                    csv_writer.writerow([_format_load_data_value(row[field]) for field in field_names])
-                
-                tmp_file_path = tmp_file.name
-            
-            # 构造LOAD DATA语句
-            load_into_clause = "IGNORE INTO TABLE" if skip_duplicate else "INTO TABLE"
-            load_sql = f"""
-            LOAD DATA LOCAL INFILE '{tmp_file_path.replace(os.sep, '/')}'
-            {load_into_clause} {table_name}
-            FIELDS TERMINATED BY ','
-            OPTIONALLY ENCLOSED BY '"'
-            LINES TERMINATED BY '\n'
-            ({fields_str})
-            """
+        with session:
+            # 分批处理，避免单次文件过大
+            for batch_num, batch_data in enumerate(batches, 1):
+                batch_start = inserted_count
+                batch_end = batch_start + len(batch_data)
 
-            
-            # 执行批量插入 - executor.execute已处理异常和提交
-            executor.execute(load_sql, commit=commit)
-            inserted_count += len(batch_data)
-            
-            print(f"[LOAD DATA] Batch {batch_num}/{total_batches} completed, inserted {inserted_count}/{total_records} records")
-            
-            # 清理临时文件
-            try:
-                os.unlink(tmp_file_path)
-            except OSError:
-                pass  # 忽略文件删除错误
+                print(f"[LOAD DATA] Processing batch {batch_num}/{total_batches} ({batch_start}-{batch_end-1})...")
+
+                batch_warnings = load_batch(executor, batch_data)
+                inserted_count += len(batch_data)
+
+                print(f"[LOAD DATA] Batch {batch_num}/{total_batches} completed, inserted {inserted_count}/{total_records or '?'} records"
+                      + (f", {batch_warnings} warnings" if batch_warnings else ""))
     
     finally:
         if self_close:
             executor.close()
     
     print(f"[LOAD DATA] All completed! Total {inserted_count} records inserted")
+    if load_warnings.count:
+        print(f"[LOAD DATA] Server reported {load_warnings.count} warnings, first ones: {load_warnings.samples[:5]}")
     return inserted_count
 
 
+def _load_data_sql_builder(table_name, field_names, skip_duplicate=False):
+    """返回 path -> LOAD DATA 语句 的函数"""
+    fields_str = ', '.join(field_names)
+    load_into_clause = "IGNORE INTO TABLE" if skip_duplicate else "INTO TABLE"
+
+    def build_load_sql(path):
+        # 构造LOAD DATA语句
+        return f"""
+                LOAD DATA LOCAL INFILE '{path.replace(os.sep, '/')}'
+                {load_into_clause} {table_name}
+                {FIELDS_CLAUSE}
+                ({fields_str})
+                """
+    return build_load_sql
+
+
+def _write_load_data_rows(stream, rows):
+    """将已转换的参数元组写为 LOAD DATA 读取的制表符分隔文本（格式见 utils.load_data_format）"""
+    write_rows(stream, rows)
+
+
+def _load_batch_from_file(executor, build_load_sql, write_data, commit, temp_dir):
+    """将一批记录写入临时文件后执行 LOAD DATA"""
+    with tempfile.NamedTemporaryFile(
+        mode='w+', 
+        suffix='.tsv', 
+        delete=False, 
+        newline='', 
+        dir=temp_dir,
+        encoding='utf-8'
+    ) as tmp_file:
+        write_data(tmp_file)
+        tmp_file_path = tmp_file.name
+
+    try:
+        # 执行批量插入 - executor.execute已处理异常和提交
+        executor.execute(build_load_sql(tmp_file_path), commit=commit)
+    finally:
+        # 清理临时文件
+        try:
+            os.unlink(tmp_file_path)
+        except OSError:
+            pass  # 忽略文件删除错误
+
+
+def _load_batch_from_fifo(executor, build_load_sql, write_data, commit, temp_dir):
+    """
+    经命名管道执行 LOAD DATA：后台线程写入数据，驱动同时读取并发送
+
+    语句执行完之前无法确认数据是否完整写入，因此先不提交：写线程失败（如数据转换异常）时
+    管道提前结束、服务端只收到部分数据，此时回滚并抛出写线程的异常
+    """
+    with fifo_source(write_data, temp_dir) as (fifo_path, writer):
+        executor.execute(build_load_sql(fifo_path), commit=False)
+        try:
+            writer.wait()
+        except BaseException:
+            rollback = getattr(executor, '_rollback_if_needed', None)
+            if rollback is not None:
+                rollback(True)
+            raise
+    if commit:
+        executor.commit()
+
+
 def _executemany_optimized(executor, table_name, fields, skip_duplicate=False, 
-                          commit=True, batch_size=10000, self_close=False):
+                          commit=True, batch_size=None, self_close=False, parallelism=1, field_names=None):
     """
     优化的分批executemany插入，适合1-50万数据量
+
+    按字节切分批次：驱动将 executemany 的 INSERT 改写为一条多行 VALUES 语句，
+    每批不超过连接的 max_allowed_packet；batch_size 为每批最多的记录数（默认 MAX_BATCH_ROWS）
+    parallelism > 1 时批次分配到多个工作连接并行执行，每批由所在连接提交
+    指定 field_names 时 fields 为已转换的参数元组列表，顺序与 field_names 一致
     """
     
     if not isinstance(fields, list) or not fields:
@@ -256,28 +695,43 @@ def _executemany_optimized(executor, table_name, fields, skip_duplicate=False,
         return 0
     
     total_records = len(fields)
-    field_names = list(fields[0].keys())
+    if field_names is None:
+        field_names = list(fields[0].keys())
+        rows = map(row_converter(field_names, fields), fields)
+    else:
+        rows = fields
     sql = _build_insert_sql(table_name, field_names, skip_duplicate)
     inserted_count = 0
-    total_batches = (total_records - 1) // batch_size + 1
+    budget = statement_budget(executor)
     
-    print(f"[executemany] Starting to process - total_records : {total_records} , total_batches : {total_batches}, batch_size : {batch_size} records")
+    print(f"[executemany] Starting to process - total_records : {total_records} , batch_bytes : {budget}, max batch_size : {batch_size or MAX_BATCH_ROWS} records")
     
+    batches = byte_batches(rows, insert_row_size, budget, len(sql), batch_size)
+    if parallelism > 1:
+        def execute_worker_batch(worker_executor, worker_index, values):
+            worker_executor.execute(sql, values, commit=True)
+            print(f"[executemany] Worker {worker_index} committed a batch of {len(values)} records")
+            return len(values)
+
+        print(f"[executemany] Inserting in parallel on {parallelism} connections")
+        try:
+            inserted_count = run_parallel(batches, executor._worker_executor, execute_worker_batch, parallelism)
+        finally:
+            if self_close:
+                executor.close()
+        print(f"[executemany] All completed! Total {inserted_count} records inserted")
+        return inserted_count
+
     try:
-        for batch_start in range(0, total_records, batch_size):
-            batch_end = min(batch_start + batch_size, total_records)
-            batch_data = fields[batch_start:batch_end]
-            batch_num = batch_start // batch_size + 1
-            
-            print(f"[executemany] Processing batch {batch_num}/{total_batches} ({batch_start}-{batch_end-1})...")
-            
-            values = [_build_row_values(item, field_names) for item in batch_data]
+        for batch_num, values in enumerate(batches, 1):
+            batch_start = inserted_count
+            print(f"[executemany] Processing batch {batch_num} ({batch_start}-{batch_start + len(values) - 1})...")
             
             # 执行批量插入 - executor.execute已处理异常和提交
             executor.execute(sql, values, commit=commit)
-            inserted_count += len(batch_data)
+            inserted_count += len(values)
             
-            print(f"[executemany] Batch {batch_num}/{total_batches} completed, inserted {inserted_count}/{total_records} records")
+            print(f"[executemany] Batch {batch_num} completed, inserted {inserted_count}/{total_records} records")
     
     finally:
         if self_close:
@@ -1,6 +1,6 @@
 from ..tools.where_clause import build_sql_with_where
 from ..models.fetch_config import FetchConfig
-from ..tools.result_formatter import fetch_format
+from ..tools.result_formatter import fetch_format, iter_fetch
 
 
 def _build_query_sql(select_expr, table_names, conditions=None, join_conditions=None):
@@ -52,7 +52,8 @@ def _build_query_sql(select_expr, table_names, conditions=None, join_conditions=
     return sql, params
 
 def select(executor, table_names, fields=None, conditions=None, order_by=None, limit:int|None=None,
-           distinct:bool=False, join_conditions=None, self_close:bool=False, fetch_config=None):
+           distinct:bool=False, join_conditions=None, self_close:bool=False, fetch_config=None,
+           stream:bool=False, chunk_size:int|None=None):
     """
     通用的SQL查询执行器方法，支持JOIN操作
     :param executor: SQLExecutor 实例
@@ -106,8 +107,29 @@ def select(executor, table_names, fields=None, conditions=None, order_by=None, l
                 data_label=["id", "name", "email"],
                 show_count=True
             )
+    :param stream: 是否流式读取（非缓冲游标 + fetchmany），为 True 时返回生成器，fetch_mode 必须为 "all"
+    :param chunk_size: 流式读取的分块大小，None 时逐行返回（仅 stream=True 时有效）
     :return: 查询结果，格式根据fetch_config配置而定
     """
+    sql, params = _build_select_sql(table_names, fields, conditions, order_by, limit, distinct, join_conditions)
+    fetch_mode, output_format, show_count, data_label = _resolve_fetch_config(fields, fetch_config)
+
+    if stream:
+        if fetch_mode != "all":
+            raise ValueError("stream=True 仅支持 fetch_mode='all'")
+        return iter_fetch(executor, sql, params, chunk_size, output_format, data_label, self_close)
+
+    result = fetch_format(executor, sql, fetch_mode, output_format, show_count, data_label, params, self_close)
+    return result
+
+
+def _build_select_sql(table_names, fields, conditions=None, order_by=None, limit=None,
+                      distinct=False, join_conditions=None):
+    """
+    构建完整的 SELECT 语句（同步/异步执行器共用）
+
+    :return: (sql, params)
+    """
     if fields is None:
         raise ValueError("fields 参数不能为空")
 
@@ -138,7 +160,15 @@ def select(executor, table_names, fields=None, conditions=None, order_by=None, l
     # 添加LIMIT子句（如果提供）
     if limit:
         sql += f" LIMIT {limit}"
+    return sql, params
+
 
+def _resolve_fetch_config(fields, fetch_config=None):
+    """
+    解析 fetch_config，data_label 为空时根据 fields 自动生成
+
+    :return: (fetch_mode, output_format, show_count, data_label)
+    """
     # 处理 fetch_config，支持 FetchConfig 模型和旧的字典方式
     if fetch_config is None:
         fetch_config = FetchConfig()
@@ -166,9 +196,7 @@ def select(executor, table_names, fields=None, conditions=None, order_by=None, l
         else:
             # 如果fields是列表，直接使用
             data_label = fields
-
-    result = fetch_format(executor, sql, fetch_mode, output_format, show_count, data_label, params, self_close)
-    return result
+    return fetch_mode, output_format, show_count, data_label
 
 
 def exists(executor, table_names, conditions=None, join_conditions=None, self_close:bool=False) -> bool:
@@ -203,14 +231,20 @@ def exists(executor, table_names, conditions=None, join_conditions=None, self_cl
         >>> executor.exists('orders', {'created_at': ('>=', NDayInterval(7))})
         True
     """
-    # 构造FROM/JOIN/WHERE子句（SELECT 1 ... LIMIT 1 优化）
-    sql, params = _build_query_sql("1", table_names, conditions, join_conditions)
-
-    # 添加 LIMIT 1 优化性能
-    sql += " LIMIT 1"
+    sql, params = _build_exists_sql(table_names, conditions, join_conditions)
 
     # 执行查询
     result = fetch_format(executor, sql, "one", "", False, None, params, self_close)
 
     # 如果有结果返回 True，否则返回 False
-    return result is not None
\ No newline at end of file
+    return result is not None
+
+
+def _build_exists_sql(table_names, conditions=None, join_conditions=None):
+    """构建存在性检查语句（SELECT 1 ... LIMIT 1），返回 (sql, params)"""
+    # 构造FROM/JOIN/WHERE子句（SELECT 1 ... LIMIT 1 优化）
+    sql, params = _build_query_sql("1", table_names, conditions, join_conditions)
+
+    # 添加 LIMIT 1 优化性能
+    sql += " LIMIT 1"
+    return sql, params
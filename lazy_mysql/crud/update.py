@@ -1,4 +1,4 @@
-from ..utils.value_converter import prepare_db_row
+from ..utils.value_converter import convert_value
 from ..tools.where_clause import build_where
 
 def update(executor, table_name, fields, conditions, commit=False, self_close=False):
@@ -23,8 +23,21 @@ def update(executor, table_name, fields, conditions, commit=False, self_close=Fa
             executor.close()
         raise ValueError("conditions 不能为空，这会导致更新所有记录")
 
+    sql, params = _build_update_sql(table_name, fields, conditions)
+
+    # 执行SQL
+    executor.execute(sql, params, commit, self_close)
+    return executor.mycursor.rowcount
+
+
+def _build_update_sql(table_name, fields, conditions):
+    """
+    构建 UPDATE 语句（同步/异步执行器共用）
+
+    :return: (sql, params)
+    """
     # 统一处理写入值，保持与 insert / batch_update 一致的类型转换规则
-    processed_fields = prepare_db_row(fields)
+    processed_fields = {field: convert_value(value) for field, value in fields.items()}
 
     # 构造SET子句
     set_clause = ', '.join([f"{field} = %s" for field in processed_fields.keys()])
@@ -39,7 +52,4 @@ def update(executor, table_name, fields, conditions, commit=False, self_close=Fa
 
     # 构造SQL语句
     sql = f'''UPDATE {table_name} SET {set_clause} WHERE {where_clause};'''
-
-    # 执行SQL
-    executor.execute(sql, params, commit, self_close)
-    return executor.mycursor.rowcount
\ No newline at end of file
+    return sql, params
\ No newline at end of file
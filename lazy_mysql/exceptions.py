@@ -0,0 +1,51 @@
+"""lazy_mysql 自定义异常类型。"""
+
+
+class PoolTimeoutError(TimeoutError):
+    """在 PoolConfig.timeout 时间内未能从连接池借出连接。"""
+
+
+class PoolClosedError(RuntimeError):
+    """连接池已关闭，无法继续借出连接。"""
+
+
+class CircuitOpenError(ConnectionError):
+    """RetryPolicy 熔断器已打开：连续连接失败次数达到阈值，冷却期内直接失败而不再重试。"""
+
+
+class QueryTimeoutError(TimeoutError):
+    """语句执行超过 timeout：SELECT 被服务端 MAX_EXECUTION_TIME 中断，或其他语句被看门狗 KILL QUERY 中断。"""
+
+
+class PipelineError(Exception):
+    """
+    pipeline() 批量发送的语句执行失败
+
+    :ivar index: 出错语句在 pipeline 中的序号（从 0 开始）
+    :ivar sql: 出错的 SQL 语句
+    :ivar rowcounts: 出错前已成功执行的语句的受影响行数
+    """
+
+    def __init__(self, message, index, sql, rowcounts):
+        super().__init__(message)
+        self.index = index
+        self.sql = sql
+        self.rowcounts = rowcounts
+
+
+class ParallelLoadError(Exception):
+    """
+    insert(..., parallelism=N) 并行写入时部分工作连接失败
+
+    每批写入后由所在连接立即提交，失败前已提交的数据不会回滚。
+
+    :ivar inserted: 已提交的记录总数
+    :ivar worker_counts: 各工作连接已提交的记录数（按工作线程序号）
+    :ivar errors: 失败的工作线程序号 -> 异常
+    """
+
+    def __init__(self, message, inserted, worker_counts, errors):
+        super().__init__(message)
+        self.inserted = inserted
+        self.worker_counts = worker_counts
+        self.errors = errors
@@ -1,13 +1,23 @@
 import json
 import logging
+import time
+from contextlib import contextmanager, nullcontext
 from typing import Literal
 from mysql.connector.abstracts import MySQLConnectionAbstract, MySQLCursorAbstract
 from mysql.connector.pooling import PooledMySQLConnection
+from .exceptions import QueryTimeoutError
 from .models import FetchConfig, MySQLConfig
+from .retry import CONNECTION, DEADLOCK, LOCK_WAIT, RetryPolicy
 from .utils import connection, should_retry_connection_error
+from .utils.prepared_cache import PreparedStatementCache
+from .utils.transaction import Transaction
+from .utils.pipeline import Pipeline
+from .utils.hot_spare import HotSpare
+from .utils.timeout import KillQueryWatchdog, is_timeout_error, with_max_execution_time
 from .tools.log_utils import format_sql_for_log, truncate_long_in_lists, truncate_params_for_log
-from .tools.sql_utils import resolve_sql
+from .tools.sql_utils import is_read_only_sql, resolve_sql
 from .crud import (insert as insert_func, upsert as upsert_func, 
+                    insert_df as insert_df_func, upsert_df as upsert_df_func,
                     update as update_func, batch_update as batch_update_func,
                     delete as delete_func,
                     select as select_func, exists as exists_func
@@ -15,13 +25,82 @@ from .crud import (insert as insert_func, upsert as upsert_func,
 
 
 
+def prepare_params( sql , params ) :
+    """
+    规范化 execute 的 params 参数（同步/异步执行器共用）
+
+    :return: (params, many) - 规范化后的参数；many 为 True 时应使用 executemany 批量执行
+    :raises ValueError: 批量参数中存在空参数集、SELECT 批量执行或 params 格式非法
+    """
+    if not params :
+        return None, False
+    if isinstance(params, dict) or isinstance(params, tuple):
+        # 单个字典 或 元组参数
+        return params, False
+    if isinstance(params, list):
+        if isinstance(params[0], (dict, tuple, list)):
+            if any(p in (None, [], (), {}) for p in params):
+                raise ValueError("批量执行参数列表中存在空参数集（None/[]/()/{}），请检查 params")
+            # 简单高效地检测SELECT查询（检查SQL开头）
+            sql_start = sql.lstrip()[:10].upper()
+            if sql_start.startswith('SELECT'):
+                raise ValueError("SELECT查询不支持批量执行（会严重影响性能）！")
+            return params, True
+        # 单个列表参数，转换为元组
+        return tuple(params), False
+    raise ValueError(f"Invalid params format: {params}")
+
+
 class SQLExecutor :
     """SQL执行器类，提供统一的数据库操作接口"""
 
     mydb: MySQLConnectionAbstract | PooledMySQLConnection | None = None
     mycursor: MySQLCursorAbstract | None = None
-
-    def __init__( self , sql_config=None ,database=None,dict_cursor=False) :
+    # 通过 from_pool() 创建时指向所属连接池；close() 时将连接归还池中而非关闭
+    _pool = None
+    # prepared=True 时：当前连接上的预处理语句缓存，以及执行文本协议语句的基础游标
+    # （mycursor 始终指向最近一次执行语句所用的游标）
+    prepared = False
+    prepared_cache_size = 256
+    _prepared_cache = None
+    _text_cursor = None
+    # 重试策略；为 None 时沿用默认规则（仅在首次连接断开时重连重试一次）
+    retry_policy: RetryPolicy | None = None
+    _retry_started_at = 0.0
+    # retry_transaction() 重放事务期间禁用语句级重试，由事务整体重放
+    _replaying = False
+    # transaction() 作用域内的事务状态（统一提交 / 保存点 / 分组提交）
+    _transaction = None
+    # pipeline() 作用域：写入语句入队，合并为多语句请求发送
+    _pipeline = None
+    # lazy_connect=True 时首次执行语句才建立连接；空闲超过 idle_ping_threshold 秒的连接在执行前先 ping
+    _connect_pending = False
+    idle_ping_threshold: float | None = None
+    _last_used = 0.0
+    # 语句默认超时秒数（None / 0 表示不限制）；_scoped_timeout 为 CRUD 方法 timeout 参数在本次调用内的值
+    query_timeout: float | None = None
+    _scoped_timeout = None
+    # hot_spare=True 时后台维护的备用连接，连接断开时直接换用
+    _hot_spare: HotSpare | None = None
+    # 最近一次 LOAD DATA 导入的服务端警告（LoadWarnings：count 与前若干条明细）
+    last_load_warnings = None
+    # 连接配置档（ConnectionProfile）：建立连接时设置的会话变量与超时；连接池模式下与连接池一致
+    profile = None
+
+    def __init__( self , sql_config=None ,database=None,dict_cursor=False, pool=None,
+                  prepared=False , prepared_cache_size=256 , retry_policy: RetryPolicy | None = None ,
+                  lazy_connect=False , idle_ping_threshold: float | None = None ,
+                  query_timeout: float | None = None , hot_spare = False , profile = None ) :
+        if pool is not None:
+            if hot_spare:
+                raise ValueError("连接池模式下不支持 hot_spare：失效连接由连接池替换，可通过 PoolConfig.min_size 预先建立连接")
+            sql_config = sql_config or pool.sql_config
+            if database and database != pool.database:
+                raise ValueError(f"database 参数({database})与连接池的数据库({pool.database})不一致")
+            database = pool.database
+            if profile is not None and pool.sql_config.get_profile(profile) != pool.profile:
+                raise ValueError("profile 参数与连接池的配置档不一致：连接池中的连接按连接池的 profile 建立")
+            profile = pool.profile
         self.sql_config = MySQLConfig.resolve(sql_config)
         self.database = database or getattr(self.sql_config, "database", None)
         if not self.database:
@@ -29,41 +108,211 @@ class SQLExecutor :
                 "未指定数据库名称！请通过 database 参数 或 sql_config.database 属性或环境变量 LAZY_MYSQL_DATABASE 提供数据库名。"
             )
         self.dict_cursor = dict_cursor
-        self.mydb , self.mycursor = connection( self.sql_config, self.database, dict_cursor=dict_cursor )
+        self._pool = pool
+        self.prepared = prepared
+        self.prepared_cache_size = prepared_cache_size
+        self.retry_policy = retry_policy
+        self.idle_ping_threshold = idle_ping_threshold
+        self.profile = self.sql_config.get_profile(profile)
+        if query_timeout is None and self.profile is not None:
+            query_timeout = self.profile.query_timeout
+        self.query_timeout = query_timeout
         self.logger = logging.getLogger(__name__)
+        if hot_spare:
+            self._hot_spare = HotSpare(self._open_connection, self._close_spare)
+        if lazy_connect:
+            # 延迟到首次执行语句时再建立连接（或从连接池借出）
+            self._connect_pending = True
+        else:
+            self._bind_connection(*self._open_connection())
+
+    @classmethod
+    def from_pool( cls , pool , dict_cursor=False , prepared=False , prepared_cache_size=256 ,
+                   retry_policy: RetryPolicy | None = None , lazy_connect=False ,
+                   idle_ping_threshold: float | None = None , query_timeout: float | None = None ,
+                   profile = None ) :
+        """
+        从连接池借出连接创建执行器，close()（包括 self_close=True）时连接归还连接池
+
+        :param pool: ConnectionPool 实例
+        :param dict_cursor: 是否使用字典游标
+        :param prepared: 是否启用预处理语句缓存（缓存随连接保存，再次借出同一连接时继续复用）
+        :param prepared_cache_size: 每个连接最多缓存的预处理语句数
+        :param retry_policy: 语句级重试策略
+        :param lazy_connect: 是否延迟到首次执行语句时才借出连接
+        :param idle_ping_threshold: 连接空闲超过该秒数时，执行语句前先 ping 检测
+        :param query_timeout: 语句默认超时秒数，各方法的 timeout 参数优先
+        :param profile: 连接配置档，须与连接池的 profile 一致（默认使用连接池的配置档）
+        :return: SQLExecutor 实例
+        """
+        return cls(pool.sql_config, pool.database, dict_cursor=dict_cursor, pool=pool,
+                   prepared=prepared, prepared_cache_size=prepared_cache_size, retry_policy=retry_policy,
+                   lazy_connect=lazy_connect, idle_ping_threshold=idle_ping_threshold,
+                   query_timeout=query_timeout, profile=profile)
+
+    def _bind_connection( self , mydb , mycursor ) :
+        """绑定（新建立的）连接与基础游标，prepared 模式下同时取得该连接上的预处理语句缓存"""
+        self.mydb , self.mycursor = mydb , mycursor
+        self._last_used = time.monotonic()
+        if self.prepared:
+            self._text_cursor = mycursor
+            self._prepared_cache = PreparedStatementCache.for_connection(mydb, self.prepared_cache_size)
+        if self._hot_spare is not None:
+            self._hot_spare.fill()
+
+    @staticmethod
+    def _close_spare( mydb ) :
+        mydb.close()
+
+    def _open_replacement( self ) :
+        """建立替换断开连接的新连接：hot_spare 模式下优先换用已就绪的备用连接，返回 (连接对象, 游标对象)"""
+        spare = self._hot_spare.take() if self._hot_spare is not None else None
+        return spare or self._open_connection()
+
+    def _ensure_connection( self ) :
+        """
+        执行语句前调用：lazy_connect 模式下首次使用时建立连接；
+        连接空闲超过 idle_ping_threshold 时先 ping，失效则在发出语句前重连，而不是等语句失败后再重连
+        """
+        if self.mydb is None:
+            if self._connect_pending:
+                self._connect_pending = False
+                self._bind_connection(*self._open_connection())
+            return
+        now = time.monotonic()
+        threshold = self.idle_ping_threshold
+        # 事务内不做重连（会丢失事务中已执行的语句）
+        if threshold is not None and self._transaction is None and now - self._last_used >= threshold:
+            try:
+                self.mydb.ping()
+            except Exception as e:
+                if not self._try_reconnect("ping"):
+                    raise Exception(f"SQL ping failed: {str(e)}")
+        self._last_used = time.monotonic()
+
+    def _effective_timeout( self , timeout = None ) :
+        """本条语句的超时秒数：显式传入 > CRUD 方法的 timeout 参数 > query_timeout；0 表示不限制"""
+        for value in (timeout, self._scoped_timeout, self.query_timeout):
+            if value is not None:
+                if value < 0:
+                    raise ValueError(f"timeout 不能为负数，收到：{value}")
+                return value or None
+        return None
+
+    @contextmanager
+    def _timeout_scope( self , timeout ) :
+        """CRUD / 查询方法的 timeout 参数：作用于该方法内部执行的所有语句"""
+        if timeout is None:
+            yield
+            return
+        previous, self._scoped_timeout = self._scoped_timeout, timeout
+        try:
+            yield
+        finally:
+            self._scoped_timeout = previous
+
+    def _apply_select_timeout( self , sql , timeout = None ) :
+        """为 SELECT 加上 MAX_EXECUTION_TIME 提示（流式读取使用，非 SELECT 语句原样返回）"""
+        timeout = self._effective_timeout(timeout)
+        if not timeout:
+            return sql
+        return with_max_execution_time(sql, timeout) or sql
+
+    @property
+    def prepared_stats( self ) -> dict | None :
+        """预处理语句缓存的命中统计（hits / misses / evictions / size / max_size），未启用时返回 None"""
+        if self._prepared_cache is None:
+            return None
+        return self._prepared_cache.stats
+
+    def _open_connection( self ) :
+        """建立（或从连接池借出）连接，返回 (连接对象, 游标对象)"""
+        if self._pool is None:
+            options = {}
+            if self.retry_policy is not None:
+                options["retry_policy"] = self.retry_policy
+            if self.profile is not None:
+                options["profile"] = self.profile
+            return connection( self.sql_config, self.database, dict_cursor=self.dict_cursor , **options )
+        # 需要新建连接时使用执行器的重试策略
+        mydb = self._pool.acquire() if self.retry_policy is None else self._pool.acquire(retry_policy=self.retry_policy)
+        try:
+            return mydb, mydb.cursor(buffered=True, dictionary=self.dict_cursor)
+        except Exception:
+            self._pool.release(mydb, discard=True)
+            raise
+
+    def __enter__( self ) :
+        return self
 
+    def __exit__( self , exc_type , exc_val , exc_tb ) :
+        self.close()
+
+    # 关闭数据库连接（连接池模式下归还连接）
+    def close( self , discard=False ) :
+        """
+        关闭数据库连接；通过连接池创建的执行器会将连接归还连接池
+
+        :param discard: 连接池模式下是否丢弃连接（如连接已断开）而非归还复用
+        """
+        if self._pipeline is not None:
+            # pipeline() 内推迟到发送完队列中的语句后关闭
+            self._pipeline.close_on_exit = True
+            return
+        if self._transaction is not None:
+            # transaction() 内（如 self_close=True）推迟到事务结束后关闭
+            self._transaction.close_on_exit = True
+            return
+        self._close_connection(discard)
+        if self._hot_spare is not None:
+            self._hot_spare.close()
 
-    # 关闭数据库连接
-    def close( self ) :
+    def _close_connection( self , discard=False ) :
+        """关闭（连接池模式下归还）当前连接，不影响备用连接"""
         try:
+            if self._prepared_cache is not None:
+                # 预处理语句随连接保留（连接关闭时由服务端释放），这里只丢弃未读结果并关闭基础游标
+                self._prepared_cache.discard_unread()
+                self.mycursor = self._text_cursor
             if self.mycursor is not None:
                 self.mycursor.close()
         except Exception:
             pass
         try:
             if self.mydb is not None:
-                self.mydb.close()
+                if self._pool is not None:
+                    self._pool.release(self.mydb, discard=discard)
+                else:
+                    self.mydb.close()
         except Exception:
             pass
         # 将 self.mycursor 和 self.mydb 置为 None，最大程度减少程序退出时的 __del__ 调用
         # 降低 PyCharm 调试器与 mysql-connector-python 的兼容性问题
         self.mycursor = None
         self.mydb = None
+        self._text_cursor = None
+        self._prepared_cache = None
+        self._connect_pending = False
 
     def __del__(self):
         # 兜底：如果用户忘记调用 close()，在对象销毁时尝试清理
         # 使用 getattr 避免在解释器关闭时访问已销毁的属性
         try:
-            mycursor = getattr(self, 'mycursor', None)
+            mycursor = getattr(self, '_text_cursor', None) or getattr(self, 'mycursor', None)
             mydb = getattr(self, 'mydb', None)
+            pool = getattr(self, '_pool', None)
             if mycursor is not None:
                 mycursor.close()
             if mydb is not None:
-                mydb.close()
+                if pool is not None:
+                    pool.release(mydb)
+                else:
+                    mydb.close()
         except Exception:
             pass
 
-    def _handle_connection_error(self, error, operation_name, retry_count=0, sql=None, params=None, needs_rollback=False):
+    def _handle_connection_error(self, error, operation_name, retry_count=0, sql=None, params=None,
+                                 needs_rollback=False, retryable=True, watchdog=None, close_on_timeout=False):
         """
         统一的连接错误处理逻辑
         
@@ -73,16 +322,131 @@ class SQLExecutor :
         :param sql: SQL语句（可选，用于日志）
         :param params: 参数（可选，用于日志）
         :param needs_rollback: 是否需要回滚事务
+        :param retryable: 是否允许重试（如流式读取中途失败时不可重试）
+        :param watchdog: 执行该语句时使用的 KillQueryWatchdog，用于识别被 KILL QUERY 中断的语句
+        :param close_on_timeout: 超时时是否关闭连接（超时只中断语句，默认保留连接）
         :return: 如果重试成功返回True，否则抛出异常
         """
-        if should_retry_connection_error(error, retry_count) and self._try_reconnect(operation_name):
+        if is_timeout_error(error, watchdog):
+            # 超时的语句已被服务端中断，连接仍可用；不重试，避免超出调用方的时间预算
+            self._log_failed_statement(sql, params)
+            if self._transaction is None:
+                self._rollback_if_needed(needs_rollback)
+                if close_on_timeout:
+                    self.close()
+            raise QueryTimeoutError(f"SQL {operation_name} timed out: {str(error)}") from error
+        if retryable and self._should_retry(error, operation_name, retry_count):
             return True
 
         self._log_failed_statement(sql, params)
+        if self._transaction is not None:
+            # 事务内的失败由 transaction() 回滚（或回滚到保存点），连接保持可用
+            raise Exception(f"SQL {operation_name} failed: {str(error)}")
         self._rollback_if_needed(needs_rollback)
         self.close()
         raise Exception(f"SQL {operation_name} failed: {str(error)}")
 
+    def _should_retry(self, error, operation_name, retry_count):
+        """
+        判断语句是否可以重试，并完成重试前的等待与重连
+
+        - 未配置 retry_policy：仅首次连接断开时重连重试一次
+        - 配置了 retry_policy：连接断开 → 退避后重连重试；锁等待超时(1205) → 退避后直接重试该语句；
+          死锁(1213) 会回滚整个事务，单条语句无法重试，需使用 retry_transaction()
+        - transaction() 内不做重连重试（重连会丢失事务中已执行的语句）
+        """
+        if self._replaying:
+            return False
+        policy = self.retry_policy
+        if policy is None:
+            # 事务内重连会丢失此前未提交的语句，不做重试
+            return (self._transaction is None
+                    and should_retry_connection_error(error, retry_count)
+                    and self._try_reconnect(operation_name))
+
+        if retry_count == 0:
+            self._retry_started_at = time.monotonic()
+        kind = policy.classify(error)
+        if kind == CONNECTION and self._transaction is not None:
+            return False
+        delay = policy.next_delay(error, retry_count + 1, self._retry_started_at, kind=kind)
+        if delay is None:
+            return False
+        if kind == CONNECTION and self._hot_spare is not None and self._hot_spare.ready:
+            # 备用连接已就绪：立即切换，无需退避等待
+            delay = 0.0
+        self.logger.warning(
+            "%s during %s (%s/%s). Retrying in %.2f seconds...",
+            kind, operation_name, retry_count + 1, policy.max_retries, delay,
+        )
+        if delay:
+            time.sleep(delay)
+        if kind == LOCK_WAIT:
+            return True
+        return self._try_reconnect(operation_name)
+
+    def retry_transaction( self , func , retry_policy: RetryPolicy | None = None ) :
+        """
+        在事务中执行 func(executor) 并提交；因死锁、锁等待超时或连接断开导致失败时回滚并整体重放
+
+        func 内的语句不要传 commit=True，由本方法在 func 返回后直接在当前连接上提交。
+        提交（COMMIT）阶段因死锁 / 锁等待失败时服务端已回滚，整体重放；
+        连接断开时无法确定事务是否已生效，丢弃该连接并直接抛出异常，不重连也不重放。
+
+        :param func: 接收执行器的可调用对象，返回值作为本方法的返回值
+        :param retry_policy: 重试策略，默认使用执行器的 retry_policy，均未设置时使用 RetryPolicy()
+        :return: func 的返回值
+
+        :example:
+            >>> def transfer(tx):
+            ...     tx.execute("UPDATE accounts SET balance = balance - %s WHERE id = %s", (100, 1))
+            ...     tx.execute("UPDATE accounts SET balance = balance + %s WHERE id = %s", (100, 2))
+            >>> executor.retry_transaction(transfer)
+        """
+        policy = retry_policy or self.retry_policy or RetryPolicy()
+        started_at = None
+        attempt = 0
+        while True:
+            if self.mydb is None:
+                self._bind_connection(*self._open_replacement())
+            self._replaying = True
+            committing = False
+            try:
+                result = func(self)
+                if self._pipeline is not None:
+                    self._pipeline.flush()
+                if self._prepared_cache is not None:
+                    self._prepared_cache.discard_unread()
+                committing = True
+                # 不走 self.commit() 的重连重试：重连后的新连接上提交不会包含本事务的语句
+                self.mydb.commit()
+                return result
+            except Exception as e:
+                kind = policy.classify(e)
+                if committing and kind == CONNECTION:
+                    # 提交阶段连接断开：无法确定事务是否已生效，丢弃连接并抛出，不重连也不重放
+                    self._close_connection(discard=True)
+                    raise
+                self._rollback_if_needed(True)
+                attempt += 1
+                started_at = started_at or time.monotonic()
+                delay = policy.next_delay(e, attempt, started_at, kinds=(CONNECTION, LOCK_WAIT, DEADLOCK))
+                if delay is None:
+                    raise
+                if kind == CONNECTION and self._hot_spare is not None and self._hot_spare.ready:
+                    delay = 0.0
+                self.logger.warning(
+                    "Transaction failed (%s), replaying in %.2f seconds (%s/%s): %s",
+                    kind, delay, attempt, policy.max_retries, e,
+                )
+                if delay:
+                    time.sleep(delay)
+                if self.mydb is not None and kind == CONNECTION:
+                    # 断开的连接不能继续使用（连接池模式下不归还复用）
+                    self._close_connection(discard=True)
+            finally:
+                self._replaying = False
+
     def _try_reconnect(self, operation_name):
         """关闭旧连接并重新建立连接，返回重连是否成功。"""
         try:
@@ -90,10 +454,15 @@ class SQLExecutor :
                 "Connection lost or timeout during %s. Attempting to reconnect...",
                 operation_name,
             )
-            self.close()
-            self.mydb, self.mycursor = connection(
-                self.sql_config, self.database, dict_cursor=self.dict_cursor,
-            )
+            if self._hot_spare is not None:
+                # close() 会同时关闭备用连接，这里只关闭断开的连接
+                self._close_connection()
+            elif self._pool is not None:
+                # 断开的连接不能归还复用
+                self.close(discard=True)
+            else:
+                self.close()
+            self._bind_connection(*self._open_replacement())
             return True
         except Exception as reconnect_error:
             self.logger.error("Reconnection failed during %s: %s", operation_name, reconnect_error)
@@ -172,13 +541,25 @@ class SQLExecutor :
         提交数据库事务，支持自动重连和回滚
         :param retry_count: 内部参数，用于记录重试次数，避免无限循环
         """
+        if self.mydb is None and self._connect_pending:
+            # lazy_connect 模式下尚未执行过任何语句，无需提交
+            return
         if self.mydb is None:
             raise RuntimeError("数据库连接已关闭，无法提交事务")
+        if self._pipeline is not None:
+            self._pipeline.flush()
+        if self._transaction is not None:
+            # transaction() 内由事务统一提交；分组提交模式下立即提交已执行的语句
+            if self._transaction.group_commit:
+                self._transaction.flush()
+            return
         try :
+            if self._prepared_cache is not None:
+                self._prepared_cache.discard_unread()
             self.mydb.commit()
         except Exception as e :
             if self._handle_connection_error(e, "commit", retry_count, needs_rollback=True):
-                return self.commit(retry_count=1)
+                return self.commit(retry_count=retry_count + 1)
 
     # 提交并关闭数据库连接
     def commit_close( self ) :
@@ -186,7 +567,8 @@ class SQLExecutor :
         self.close()
 
     # sql 语句执行器
-    def execute( self , sql , params = None , commit = False , self_close = False , retry_count = 0 ) :
+    def execute( self , sql , params = None , commit = False , self_close = False , retry_count = 0 ,
+                 timeout: float | None = None ) :
         """
         SQL语句执行方法，支持多种参数格式，自动判断单条/批量执行
         
@@ -205,6 +587,8 @@ class SQLExecutor :
 
         :param sql: SQL语句（支持直接传入SQL文本或 .sql 文件路径），支持 %s 和 %(name)s 占位符
         :param retry_count: 内部参数，用于记录重试次数，避免无限循环
+        :param timeout: 语句超时秒数，默认使用 query_timeout；SELECT 加 MAX_EXECUTION_TIME 提示由服务端中断，
+            其他语句超时后由看门狗通过旁路连接发送 KILL QUERY；超时抛出 QueryTimeoutError（连接保持可用）
         
         """
         try:
@@ -212,53 +596,243 @@ class SQLExecutor :
         except Exception:
             self.close()
             raise
+        if self._pipeline is not None:
+            if not is_read_only_sql(sql):
+                # pipeline() 内的写入语句先入队，由 pipeline 合并发送
+                self._pipeline.add(sql, *prepare_params(sql, params), commit=commit)
+                if self_close:
+                    self.close()
+                return
+            # 读取语句需要看到此前入队语句的结果
+            self._pipeline.flush()
+        self._ensure_connection()
         if self.mycursor is None or self.mydb is None:
             raise RuntimeError("数据库连接已关闭，无法执行SQL")
+        timeout = self._effective_timeout(timeout)
+        watchdog = None
         try :
-            if params :
-                if isinstance(params, dict) or isinstance(params, tuple):
-                    # 单个字典 或 元组参数
-                    self.mycursor.execute(sql, params)
-                elif isinstance(params, list):
-                    if not params:
-                        self.mycursor.execute(sql)
-                    elif isinstance(params[0], (dict, tuple, list)):
-                        if any(p in (None, [], (), {}) for p in params):
-                            raise ValueError("批量执行参数列表中存在空参数集（None/[]/()/{}），请检查 params")
-                        # 简单高效地检测SELECT查询（检查SQL开头）
-                        sql_start = sql.lstrip()[:10].upper()
-                        if sql_start.startswith('SELECT'):
-                            raise ValueError("SELECT查询不支持批量执行（会严重影响性能）！")
-
-                        # 批量参数处理：参数列表的列表/元组/字典
-                        self.mycursor.executemany(sql, params)
-                    else:
-                        # 单个列表参数，转换为元组
-                        params = tuple(params)
-                        self.mycursor.execute(sql, params)
+            params, many = prepare_params(sql, params)
+            if timeout:
+                # SELECT 由服务端按 MAX_EXECUTION_TIME 中断，其他语句由看门狗发送 KILL QUERY
+                hinted = with_max_execution_time(sql, timeout)
+                if hinted is None:
+                    watchdog = KillQueryWatchdog(self, timeout)
                 else:
-                    raise ValueError(f"Invalid params format: {params}")
-            else :
-                self.mycursor.execute(sql)
+                    sql = hinted
+            with watchdog or nullcontext():
+                if self._prepared_cache is not None and self._execute_prepared(sql, params, many):
+                    # 已通过缓存的预处理语句执行
+                    pass
+                elif many :
+                    # 批量参数处理：参数列表的列表/元组/字典
+                    self.mycursor.executemany(sql, params)
+                elif params :
+                    self.mycursor.execute(sql, params)
+                else :
+                    self.mycursor.execute(sql)
 
-            if commit :
+            if self._transaction is not None :
+                # transaction() 内 commit 参数不生效，由事务统一提交（或按分组提交规则提交）
+                self._transaction.statement_executed()
+            elif commit :
                 # 提交事务
                 self.mydb.commit()
 
         except Exception as e :
-            if self._handle_connection_error(e, "execute", retry_count, sql=sql, params=params, needs_rollback=commit):
-                return self.execute(sql, params, commit, self_close, retry_count=1)
+            if self._handle_connection_error(e, "execute", retry_count, sql=sql, params=params, needs_rollback=commit,
+                                             watchdog=watchdog, close_on_timeout=self_close):
+                return self.execute(sql, params, commit, self_close, retry_count=retry_count + 1, timeout=timeout)
 
         # 关闭连接
         if self_close:
             self.close()
 
 
+    def transaction( self , group_commit_size: int | None = None ,
+                     group_commit_interval_ms: float | None = None ) :
+        """
+        事务上下文管理器：退出时统一提交一次，异常时回滚；嵌套使用时创建保存点（SAVEPOINT）
+
+        事务内 CRUD 方法的 commit=True 不再逐条提交，self_close=True 推迟到事务结束后关闭连接；
+        语句失败不会关闭连接，异常离开 with 块时回滚。
+
+        分组提交（group commit）：为逐条调用 insert/update 的循环设计，每执行 group_commit_size 条语句
+        或距上次提交超过 group_commit_interval_ms 毫秒（在语句执行完成时检查）提交一次，
+        异常时只回滚最近一次提交之后的语句。存在保存点时提交推迟到保存点释放之后。
+
+        :param group_commit_size: 每多少条语句提交一次（仅最外层有效）
+        :param group_commit_interval_ms: 距上次提交超过多少毫秒后提交（仅最外层有效）
+        :return: 上下文管理器，as 子句得到执行器本身
+
+        :example:
+            >>> with executor.transaction():
+            ...     executor.update('accounts', {'balance': 90}, {'id': 1})
+            ...     with executor.transaction():          # SAVEPOINT
+            ...         executor.insert('audit_log', {'account_id': 1})
+            ...     executor.update('accounts', {'balance': 110}, {'id': 2})
+
+            >>> with executor.transaction(group_commit_size=500, group_commit_interval_ms=200):
+            ...     for record in records:
+            ...         executor.insert('events', record, commit=True)
+        """
+        return Transaction(self, group_commit_size, group_commit_interval_ms)
+
+    def pipeline( self , max_batch_bytes: int | None = None ) :
+        """
+        语句流水线：with 块内的写入语句（execute 及 insert / upsert / update / batch_update / delete）先入队，
+        退出时合并为多语句请求发送，每个请求不超过服务端 max_allowed_packet，一次往返执行多条语句
+
+        - 块内 CRUD 方法返回 -1（行数未知），各语句的受影响行数按入队顺序记录在 pipeline.rowcounts
+        - 读取语句（select / query 等）照常立即执行，执行前先发送已入队的语句
+        - commit=True 的语句在全部发送后统一提交一次；transaction() 内由事务提交
+        - 某条语句失败时抛出 PipelineError（index / sql 指向出错语句），其后的语句不会执行；
+          连接断开时不自动重试（无法确定哪些语句已执行）
+
+        :param max_batch_bytes: 单个请求的最大字节数，默认按服务端 max_allowed_packet 计算
+        :return: 上下文管理器，as 子句得到 Pipeline 对象
+
+        :example:
+            >>> with executor.pipeline() as pipe:
+            ...     for user_id, name in renames:
+            ...         executor.update('users', {'name': name}, {'id': user_id})
+            ...     executor.delete('sessions', {'user_id': expired_ids}, commit=True)
+            >>> pipe.rowcounts
+            [1, 1, 0, 37]
+        """
+        return Pipeline(self, max_batch_bytes)
+
+    def gather( self , specs , max_concurrency: int | None = None , return_exceptions = True ) :
+        """
+        在多个独立连接上并发执行相互独立的查询，按传入顺序返回结果，总耗时约等于最慢的一条查询
+
+        每个工作线程使用一个新的执行器（从连接池创建的执行器从同一连接池借出，否则新建连接），
+        沿用本执行器的 dict_cursor / prepared / retry_policy / query_timeout 等设置；本执行器的连接不参与执行，
+        因此看不到本执行器上未提交的写入。
+
+        :param specs: 查询描述列表
+            - 字典：method 指定方法（select / exists / query / fetch_format / fetch_and_response，默认 query），
+              其余键作为该方法的关键字参数，结果按各自的 fetch_config 格式化
+            - 可调用对象：接收工作执行器，返回值作为结果
+        :param max_concurrency: 最多同时使用的连接数，默认 8（连接池模式下还受 max_size 限制）
+        :param return_exceptions: 为 True（默认）时单条查询失败不影响其他查询，结果中对应位置为异常对象；
+            为 False 时不再执行剩余查询，抛出第一个错误
+        :return: 结果列表，顺序与 specs 一致
+
+        :example:
+            >>> users, order_count, recent = executor.gather([
+            ...     {'method': 'select', 'table_names': 'users', 'fields': ['id', 'name'], 'limit': 10},
+            ...     {'sql': "SELECT COUNT(*) FROM orders", 'fetch_config': {'fetch_mode': 'one'}},
+            ...     lambda ex: ex.query("SELECT * FROM orders ORDER BY id DESC LIMIT 5"),
+            ... ], max_concurrency=3)
+        """
+        from .utils.gather import gather as gather_func
+        return gather_func(specs, self._worker_executor, max_concurrency, return_exceptions)
+
+    def _worker_executor( self ) :
+        """创建与本执行器设置相同、延迟连接的新执行器（gather 的工作线程使用）"""
+        options = dict(dict_cursor=self.dict_cursor, prepared=self.prepared,
+                       prepared_cache_size=self.prepared_cache_size, retry_policy=self.retry_policy,
+                       lazy_connect=True, idle_ping_threshold=self.idle_ping_threshold,
+                       query_timeout=self.query_timeout, profile=self.profile)
+        if self._pool is not None:
+            return SQLExecutor.from_pool(self._pool, **options)
+        return SQLExecutor(self.sql_config, self.database, **options)
+
+    def _execute_prepared( self , sql , params , many ) :
+        """
+        prepared 模式下使用缓存的预处理语句执行单条带元组参数的语句，返回是否已执行
+
+        批量执行（executemany 会将 INSERT 改写为多行 VALUES，比逐条执行预处理语句更快）、
+        字典参数与无参数语句仍使用文本协议。
+        """
+        if many or not isinstance(params, tuple):
+            self._prepared_cache.discard_unread()
+            self.mycursor = self._text_cursor
+            return False
+        cursor = self._prepared_cache.execute(sql, params, dictionary=self.dict_cursor)
+        if cursor is None:
+            self.mycursor = self._text_cursor
+            return False
+        self.mycursor = cursor
+        return True
+
+    def _open_stream_cursor( self , sql , params = None , retry_count = 0 ) :
+        """创建非缓冲游标并执行查询，返回可用于 fetchmany 流式读取的游标"""
+        if self._pipeline is not None:
+            self._pipeline.flush()
+        self._ensure_connection()
+        if self.mycursor is None or self.mydb is None:
+            raise RuntimeError("数据库连接已关闭，无法执行SQL")
+        if isinstance(params, list):
+            params = tuple(params)
+        if self._prepared_cache is not None:
+            self._prepared_cache.discard_unread()
+        cursor = None
+        try :
+            # 连接默认 buffered=True，此处显式创建非缓冲游标，结果集留在服务端按需读取
+            cursor = self.mydb.cursor(buffered=False, dictionary=self.dict_cursor)
+            if params :
+                cursor.execute(sql, params)
+            else :
+                cursor.execute(sql)
+            return cursor
+        except Exception as e :
+            if cursor is not None:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+            if self._handle_connection_error(e, "iter_query", retry_count, sql=sql, params=params):
+                return self._open_stream_cursor(sql, params, retry_count=retry_count + 1)
+
+    # 流式查询（手写SQL）
+    def iter_query( self , sql , params = None , chunk_size: int | None = None ,
+                    fetch_config: FetchConfig | dict | None = None , self_close = False ,
+                    timeout: float | None = None ) :
+        """
+        流式执行自定义SQL查询，使用非缓冲游标 + fetchmany 分批读取，内存占用与结果集大小无关
+
+        :param sql: SQL语句（支持直接传入SQL文本或 .sql 文件路径）
+        :param params: 参数
+        :param chunk_size: 分块大小，None 时逐行返回；为整数时每次返回最多 chunk_size 行组成的块
+        :param fetch_config: 获取配置，仅 output_format 与 data_label 生效，fetch_mode 必须为 "all"
+            - "" (默认): 元组（逐行）或元组列表（分块）
+            - "list_1": 第一个字段的值（逐行）或扁平列表（分块）
+            - "df": DataFrame（必须指定 chunk_size）
+            - "df_dict": 字典（逐行）或字典列表（分块）
+        :param self_close: 是否在遍历结束后自动关闭连接
+        :param timeout: 超时秒数，仅对 SELECT 生效（MAX_EXECUTION_TIME，计时包含读取结果的时间）
+        :return: 生成器
+
+        :example:
+            >>> for chunk in executor.iter_query("SELECT id, name FROM users", chunk_size=5000,
+            ...                                  fetch_config={'output_format': 'df', 'data_label': ['id', 'name']}):
+            ...     process(chunk)
+
+        注意：遍历结束前不能在同一执行器上执行其他语句。
+        """
+        try:
+            sql = resolve_sql(sql)
+        except Exception:
+            self.close()
+            raise
+        if fetch_config is None:
+            fetch_config = FetchConfig()
+        elif isinstance(fetch_config, dict):
+            fetch_config = FetchConfig(**fetch_config)
+        if fetch_config.fetch_mode != "all":
+            raise ValueError("iter_query 仅支持 fetch_mode='all'")
+
+        from .tools.result_formatter import iter_fetch
+        with self._timeout_scope(timeout):
+            return iter_fetch(self, sql, params, chunk_size, fetch_config.output_format,
+                              fetch_config.data_label, self_close)
+
     # 定义解析结果程序(格式化返回结果)
     def fetch_format( self , sql , fetch_mode: Literal["all", "oneTuple", "one"] ,
                       output_format: Literal["", "list_1", "df", "df_dict"] | Literal["dict"] = "" ,
                       show_count = False , data_label = None ,
-                      params = None , self_close = False ) :
+                      params = None , self_close = False , timeout: float | None = None ) :
         """
         定义解析结果程序(格式化返回结果)
         :param sql: SQL语句（支持直接传入SQL文本或 .sql 文件路径）
@@ -268,6 +842,7 @@ class SQLExecutor :
         :param data_label: 数据标签，用于DataFrame的列名或字典的键名
         :param params: 参数
         :param self_close: 是否自动关闭连接
+        :param timeout: 语句超时秒数，默认使用 query_timeout，超时抛出 QueryTimeoutError
         :return: 查询结果，格式根据参数配置而定
             - fetch_mode="all" + output_format="": 返回元组列表，如 [(1, '张三', 'zhang@example.com'), (2, '李四', 'li@example.com')]
             - fetch_mode="all" + output_format="list_1": 返回扁平化列表，如 [1, 2, 3]（提取每行第一个字段）
@@ -284,33 +859,70 @@ class SQLExecutor :
             self.close()
             raise
         from .tools.result_formatter import fetch_format as fetch_format_func
-        return fetch_format_func(self, sql, fetch_mode, output_format, show_count, data_label, params, self_close)
+        with self._timeout_scope(timeout):
+            return fetch_format_func(self, sql, fetch_mode, output_format, show_count, data_label, params, self_close)
 
 
     # 插入数据
-    def insert( self , table_name , fields , skip_duplicate = False, commit = False , self_close = False ) :
+    def insert( self , table_name , fields , skip_duplicate = False, commit = False , self_close = False ,
+                timeout: float | None = None , bulk_session = False , load_source = 'file' , temp_dir = None ,
+                parallelism = 1 , auto_tune = False ) :
         """
         智能插入数据到指定表，根据数据量自动选择最优插入策略
 
         策略选择：
         - 单条数据（dict）: 使用传统insert
-        - 数据量 < 1000条: 使用现有executemany
-        - 1000-50000条: 使用优化executemany（分批1000条）
-        - 50000-100000条: 使用优化executemany（分批5000条）
+        - 数据量 < 1000条: 使用现有executemany（按 max_allowed_packet 字节切分，一个事务）
+        - 1000-100000条: 使用优化executemany（按 max_allowed_packet 字节切分，每批提交）
         - 数据量 >= 100000条: 使用LOAD DATA INFILE（分批50000条）
 
         :param table_name: 表名
-        :param fields: 字段和值，格式为字典或字典列表，如 {'field1': 'value1', 'field2': 'value2'} 或 [{'field1': 'value1'}, {'field1': 'value2'}]
+        :param fields: 字段和值，格式为字典或字典列表，如 {'field1': 'value1', 'field2': 'value2'} 或 [{'field1': 'value1'}, {'field1': 'value2'}]；
+            也可以是逐条产出字典的可迭代对象（生成器、DataFrame、pd.read_csv(..., chunksize=N) 等），按批读取写入
         :param skip_duplicate: 是否跳过重复数据
         :param commit: 是否自动提交
         :param self_close: 是否自动关闭连接
+        :param timeout: 语句超时秒数，默认使用 query_timeout，超时抛出 QueryTimeoutError
+        :param bulk_session: 使用 LOAD DATA 时是否临时放宽会话级检查以加快导入（unique_checks=0、foreign_key_checks=0、
+            加大 bulk_insert_buffer_size，结束后包括失败时恢复原值），也可传入会话变量字典；
+            数据须已确认满足唯一约束与外键约束
+        :param load_source: LOAD DATA 的数据源：'file' 先写临时文件；'fifo' 写入命名管道，
+            数据生成与网络发送同时进行，不产生磁盘 I/O（适合只读或 tmpfs 受限的容器，Windows 上回退为 'file'）
+        :param temp_dir: 临时文件（或命名管道）目录，默认为系统临时目录
+        :param parallelism: >= 1000 条时将批次分配到 N 个连接并行写入（连接池模式下从同一连接池借出，否则新建连接），
+            每批由所在连接提交，需要 commit=True；部分连接失败时抛出 ParallelLoadError（含已提交条数与各工作线程的错误）
+        :param auto_tune: 自动调优：按每批实测的耗时与字节数以 AIMD 方式调整批大小，按实测吞吐在 executemany 与
+            LOAD DATA 之间选择，学到的参数按表保存在进程内（传入 str / os.PathLike 文件路径时从该文件加载并在结束后保存）；
+            commit=True 时每批提交
+        :return: 插入成功的记录数（int）；LOAD DATA 的服务端警告见 last_load_warnings
+        """
+        with self._timeout_scope(timeout):
+            return insert_func(self, table_name, fields, skip_duplicate, commit, self_close, temp_dir,
+                               bulk_session=bulk_session, load_source=load_source, parallelism=parallelism,
+                               auto_tune=auto_tune)
+
+
+    # 插入 DataFrame
+    def insert_df( self , table_name , df , skip_duplicate = False , commit = False , self_close = False ,
+                   timeout: float | None = None , bulk_session = False , load_source = 'file' , temp_dir = None ,
+                   parallelism = 1 ) :
+        """
+        插入 DataFrame，按列转换参数：每列按 dtype 选择一种转换方式（datetime64 -> datetime、
+        NaN / NA / NaT 按掩码置为 None、object 列中的 dict / list -> JSON），直接交给 executemany 或 LOAD DATA，
+        不经过 to_dict('records') 与逐个单元格的转换。insert() 传入 DataFrame 时同样走这一路径。
+
+        :param df: pandas DataFrame，列名即字段名
+        其余参数同 insert
         :return: 插入成功的记录数（int）
         """
-        return insert_func(self, table_name, fields, skip_duplicate, commit, self_close)
+        with self._timeout_scope(timeout):
+            return insert_df_func(self, table_name, df, skip_duplicate, commit, self_close, temp_dir,
+                                  bulk_session=bulk_session, load_source=load_source, parallelism=parallelism)
 
 
     # 插入或更新数据
-    def upsert( self , table_name , fields , fields_update = None, commit = False , self_close = False ) :
+    def upsert( self , table_name , fields , fields_update = None, commit = False , self_close = False ,
+                timeout: float | None = None ) :
         """
         智能 INSERT ... ON DUPLICATE KEY UPDATE 执行器
         存在就更新，不存在就插入
@@ -318,18 +930,37 @@ class SQLExecutor :
         多条：list[dict] -> 批量 executemany upsert
 
         :param table_name: 表名
-        :param fields: 字段和值，格式为字典或字典列表，如 {'field1': 'value1', 'field2': 'value2'} 或 [{'field1': 'value1'}, {'field1': 'value2'}]
+        :param fields: 字段和值，格式为字典或字典列表，如 {'field1': 'value1', 'field2': 'value2'} 或 [{'field1': 'value1'}, {'field1': 'value2'}]；
+            也可以是逐条产出字典的可迭代对象，按 max_allowed_packet 字节切分 executemany
         :param fields_update: 指定冲突时更新的字段集合，None 表示更新所有字段
         示例：{'age'} 表示只更新 age 字段，其他字段保持不变
         :param commit: 是否自动提交
         :param self_close: 是否自动关闭连接
+        :param timeout: 语句超时秒数，默认使用 query_timeout，超时抛出 QueryTimeoutError
         :return: 插入或更新成功的记录数（int）
         """
-        return upsert_func(self, table_name, fields, fields_update, commit, self_close)
+        with self._timeout_scope(timeout):
+            return upsert_func(self, table_name, fields, fields_update, commit, self_close)
+
+
+    # 插入或更新 DataFrame
+    def upsert_df( self , table_name , df , fields_update = None , commit = False , self_close = False ,
+                   timeout: float | None = None ) :
+        """
+        upsert DataFrame，按列转换参数后按字节切分 executemany，全部批次在同一事务中提交；
+        upsert() 传入 DataFrame 时同样走这一路径
+
+        :param df: pandas DataFrame，列名即字段名
+        其余参数同 upsert
+        :return: 插入或更新成功的记录数（int）
+        """
+        with self._timeout_scope(timeout):
+            return upsert_df_func(self, table_name, df, fields_update, commit, self_close)
 
 
     # 更新数据
-    def update( self , table_name , fields , conditions , commit = False , self_close = False ) :
+    def update( self , table_name , fields , conditions , commit = False , self_close = False ,
+                timeout: float | None = None ) :
         """
         通用的SQL更新执行器方法，支持动态构造WHERE子句
 
@@ -338,12 +969,15 @@ class SQLExecutor :
         :param conditions: WHERE条件，格式为字典，如 {'field1': 'value1', 'field2': 'value2'}
         :param commit: 是否自动提交
         :param self_close: 是否自动关闭连接
+        :param timeout: 语句超时秒数，默认使用 query_timeout，超时抛出 QueryTimeoutError
         :return: 受影响的行数（int）
         """
-        return update_func(self, table_name, fields, conditions, commit, self_close)
+        with self._timeout_scope(timeout):
+            return update_func(self, table_name, fields, conditions, commit, self_close)
 
     # 批量更新数据
-    def batch_update( self , table_name , update_list , commit = False , self_close = False ) :
+    def batch_update( self , table_name , update_list , commit = False , self_close = False ,
+                      timeout: float | None = None ) :
         """
         智能批量更新方法，自动判断WHERE条件复杂度并选择最优SQL生成策略
         
@@ -359,6 +993,7 @@ class SQLExecutor :
             ]
         :param commit: 是否自动提交
         :param self_close: 是否自动关闭连接
+        :param timeout: 语句超时秒数，默认使用 query_timeout，超时抛出 QueryTimeoutError
         :return: None
         
         :example:
@@ -376,10 +1011,12 @@ class SQLExecutor :
             ... ]
             >>> executor.batch_update('users', update_list, commit=True)
         """
-        batch_update_func(self, table_name, update_list, commit, self_close)
+        with self._timeout_scope(timeout):
+            batch_update_func(self, table_name, update_list, commit, self_close)
 
     # 删除数据
-    def delete( self , table_name , conditions , commit = False , self_close = False ) :
+    def delete( self , table_name , conditions , commit = False , self_close = False ,
+                timeout: float | None = None ) :
         """
         通用的SQL删除执行器方法，支持动态构造WHERE子句
 
@@ -387,15 +1024,18 @@ class SQLExecutor :
         :param conditions: WHERE条件，格式为字典，如 {'field1': 'value1', 'field2': 'value2'}
         :param commit: 是否自动提交
         :param self_close: 是否自动关闭连接
+        :param timeout: 语句超时秒数，默认使用 query_timeout，超时抛出 QueryTimeoutError
         :return: 受影响的行数（int）
         """
-        return delete_func(self, table_name, conditions, commit, self_close)
+        with self._timeout_scope(timeout):
+            return delete_func(self, table_name, conditions, commit, self_close)
 
 
     # 选择数据
     def select( self , table_names , fields = None , conditions = None, order_by = None , limit:int|None=None,
                 distinct:bool=False , join_conditions = None ,
-                self_close:bool=False , fetch_config: FetchConfig | dict | None = None ) :
+                self_close:bool=False , fetch_config: FetchConfig | dict | None = None ,
+                stream:bool=False , chunk_size:int|None=None , timeout: float | None = None ) :
         """
         通用的SQL查询执行器方法，支持JOIN操作
         :param table_names: 表名，可以是字符串或列表
@@ -448,15 +1088,21 @@ class SQLExecutor :
                     data_label=["id", "name", "email"],
                     show_count=True
                 )
+        :param stream: 是否流式读取（非缓冲游标 + fetchmany），为 True 时返回生成器，详见 iter_query
+        :param chunk_size: 流式读取的分块大小，None 时逐行返回（仅 stream=True 时有效）
+        :param timeout: 语句超时秒数，默认使用 query_timeout，超时抛出 QueryTimeoutError
         :return: 查询结果，格式根据fetch_config配置而定
         """
         if fields is None:
             raise ValueError("fields 参数不能为空")
 
-        return select_func(self, table_names, fields, conditions, order_by, limit, distinct, join_conditions, self_close, fetch_config)
+        with self._timeout_scope(timeout):
+            return select_func(self, table_names, fields, conditions, order_by, limit, distinct, join_conditions, self_close,
+                               fetch_config, stream=stream, chunk_size=chunk_size)
 
 
-    def exists(self, table_names, conditions=None, join_conditions=None, self_close:bool=False) -> bool:
+    def exists(self, table_names, conditions=None, join_conditions=None, self_close:bool=False,
+               timeout: float | None = None) -> bool:
         """
         快速判断指定条件的数据是否在数据库中存在
 
@@ -469,6 +1115,7 @@ class SQLExecutor :
             {'order_dateTime': ('>=', NDayInterval(7))}  # 最近7天
         :param join_conditions: JOIN条件，格式为字典，如 {"join_type": "JOIN", "conditions": ["field1", "=", "field2"]}
         :param self_close: 是否自动关闭连接
+        :param timeout: 语句超时秒数，默认使用 query_timeout，超时抛出 QueryTimeoutError
         :return: 如果存在符合条件的记录返回 True，否则返回 False
 
         :example:
@@ -487,12 +1134,14 @@ class SQLExecutor :
             >>> executor.exists('orders', {'created_at': ('>=', NDayInterval(7))})
             True
         """
-        return exists_func(self, table_names, conditions, join_conditions, self_close)
+        with self._timeout_scope(timeout):
+            return exists_func(self, table_names, conditions, join_conditions, self_close)
 
 
     def fetch_and_response( self,table_names , fields = None , conditions = None,
         distinct:bool=False, join_conditions=None, fetch_config: FetchConfig | dict | None = None,
-        order_by=None, limit:int|None=None, format_func=None , self_close:bool=True ) :
+        order_by=None, limit:int|None=None, format_func=None , self_close:bool=True ,
+        timeout: float | None = None ) :
         """
         通用的产品数据获取与格式化方法
 
@@ -540,24 +1189,40 @@ class SQLExecutor :
         :param limit: LIMIT子句，限制返回记录数
         :param format_func: 自定义格式化函数，用于对结果进行额外处理
         :param self_close: 是否自动关闭连接
+        :param timeout: 语句超时秒数，默认使用 query_timeout，超时时 success 为 False
         :return: 包含success、result、message的字典
         """
         if fields is None:
             raise ValueError("fields 参数不能为空")
+        fetch_config = self._response_fetch_config(fetch_config)
+        # 使用默认的select方法
+        return self._build_response(
+            lambda: self.select( table_names , fields , conditions ,order_by, limit,
+                                 distinct, join_conditions, self_close , fetch_config , timeout = timeout ),
+            format_func,
+        )
 
-        # 处理 fetch_config，支持 FetchConfig 模型和旧的字典方式
+    @staticmethod
+    def _response_fetch_config( fetch_config ) :
+        """fetch_and_response 的 fetch_config：支持 FetchConfig 模型和旧的字典方式，默认 output_format 为 df_dict"""
         if fetch_config is None:
-            fetch_config = FetchConfig(output_format="df_dict")
-        elif isinstance(fetch_config, dict):
+            return FetchConfig(output_format="df_dict")
+        if isinstance(fetch_config, dict):
             # 设置默认 output_format 为 df_dict
             config_dict = {"output_format": "df_dict"}
             config_dict.update(fetch_config)
-            fetch_config = FetchConfig(**config_dict)  # pyright: ignore[reportArgumentType]
+            return FetchConfig(**config_dict)  # pyright: ignore[reportArgumentType]
+        return fetch_config
 
+    @staticmethod
+    def _build_response( run_select , format_func=None ) :
+        """
+        执行 run_select() 并包装为 fetch_and_response 的响应字典，查询或格式化失败时 success 为 False
+
+        RoutingExecutor 传入经从库故障转移的查询，故障转移结束后才包装结果
+        """
         try :
-            # 使用默认的select方法
-            result = self.select( table_names , fields , conditions ,order_by, limit,
-                                            distinct, join_conditions, self_close , fetch_config )
+            result = run_select()
             success = True
             message = "success"
             
@@ -582,7 +1247,8 @@ class SQLExecutor :
         return { "success" : success , "result" : result , "message" : message }
 
     # 支持复杂查询的执行方法（手写SQL查询）
-    def query(self, sql, params=None, fetch_config: FetchConfig | dict | None = None, self_close=False):
+    def query(self, sql, params=None, fetch_config: FetchConfig | dict | None = None, self_close=False,
+              timeout: float | None = None):
         """
         执行自定义SQL查询
         :param sql: SQL语句
@@ -638,6 +1304,7 @@ class SQLExecutor :
                     show_count=True
                 )
         :param self_close: 是否自动关闭连接
+        :param timeout: 语句超时秒数，默认使用 query_timeout，超时抛出 QueryTimeoutError
         :return: 查询结果，格式根据fetch_config配置而定
         """
         # 处理 fetch_config，支持 FetchConfig 模型和旧的字典方式
@@ -656,5 +1323,6 @@ class SQLExecutor :
         data_label = fetch_config.data_label or []
 
         # 调用底层 fetch_format 执行查询并格式化结果
-        result = self.fetch_format(sql, fetch_mode, output_format, show_count, data_label, params, self_close)
+        result = self.fetch_format(sql, fetch_mode, output_format, show_count, data_label, params, self_close,
+                                   timeout=timeout)
         return result
@@ -1,4 +1,15 @@
+from .connection_profile import ConnectionProfile
 from .fetch_config import FetchConfig
-from .mysql_config import DEFAULT_MYSQL_CONFIG, MySQLConfig
+from .mysql_config import MySQLConfig
+from .pool_config import PoolConfig
+from .routing_config import RoutingConfig
 
-__all__ = ["FetchConfig", "MySQLConfig", "DEFAULT_MYSQL_CONFIG"]
+__all__ = ["FetchConfig", "MySQLConfig", "DEFAULT_MYSQL_CONFIG", "PoolConfig", "RoutingConfig", "ConnectionProfile"]
+
+
+def __getattr__(name):
+    # DEFAULT_MYSQL_CONFIG 延迟到首次访问时构建（见 mysql_config.__getattr__）
+    if name == "DEFAULT_MYSQL_CONFIG":
+        from . import mysql_config
+        return mysql_config.DEFAULT_MYSQL_CONFIG
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
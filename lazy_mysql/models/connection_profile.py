@@ -0,0 +1,88 @@
+"""
+连接配置档（ConnectionProfile）：按用途区分的会话变量与超时设置
+"""
+
+import re
+from typing import Any
+
+from pydantic import BaseModel, field_validator
+
+_VAR_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _sql_literal(value: Any) -> str:
+    if isinstance(value, bool):
+        return "ON" if value else "OFF"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return "'" + str(value).replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+class ConnectionProfile(BaseModel):
+    """
+    连接配置档：建立连接时设置的会话变量与超时
+
+    会话变量通过 init_command 在建立连接时一次性设置（不额外占用往返），
+    连接池中的连接同样在建立时设置，因此一个连接池只对应一个配置档。
+    """
+
+    # 建立连接时设置的会话变量，如 {"innodb_lock_wait_timeout": 5, "transaction_isolation": "READ-COMMITTED"}
+    session_vars: dict[str, str | int | float | bool] = {}
+    # 执行器的语句默认超时秒数（SQLExecutor 未指定 query_timeout 时使用）
+    query_timeout: float | None = None
+    # 建立连接超时秒数
+    connect_timeout: int | None = None
+    # 客户端读写套接字超时秒数（None 不限制）
+    read_timeout: int | None = None
+    write_timeout: int | None = None
+
+    @field_validator("session_vars")
+    @classmethod
+    def _check_var_names(cls, v: dict) -> dict:
+        for name in v:
+            if not _VAR_NAME.match(name):
+                raise ValueError(f"会话变量名不合法：{name!r}")
+        return v
+
+    @property
+    def init_command(self) -> str | None:
+        """建立连接时执行的 SET SESSION 语句，没有会话变量时返回 None"""
+        if not self.session_vars:
+            return None
+        return "SET SESSION " + ", ".join(
+            f"{name} = {_sql_literal(value)}" for name, value in self.session_vars.items()
+        )
+
+    def connect_kwargs(self) -> dict[str, Any]:
+        """传给 mysql.connector.connect 的参数（未设置的项不传）"""
+        kwargs = {
+            "init_command": self.init_command,
+            "connection_timeout": self.connect_timeout,
+            "read_timeout": self.read_timeout,
+            "write_timeout": self.write_timeout,
+        }
+        return {key: value for key, value in kwargs.items() if value is not None}
+
+
+# 内置配置档，可在 MySQLConfig.profiles 中同名覆盖
+# 语句超时使用 query_timeout 而不是会话变量 max_execution_time：后者对连接上所有 SELECT 生效，
+# 方法的 timeout 参数（包括 timeout=0）无法覆盖
+BUILTIN_PROFILES: dict[str, ConnectionProfile] = {
+    # 在线事务：锁等待与语句尽快失败，避免请求堆积
+    "oltp": ConnectionProfile(
+        session_vars={"innodb_lock_wait_timeout": 5},
+        query_timeout=5,
+        connect_timeout=5,
+    ),
+    # 批量导入：允许长时间的锁等待与网络读写
+    "bulk": ConnectionProfile(
+        session_vars={"innodb_lock_wait_timeout": 120, "net_read_timeout": 600, "net_write_timeout": 600},
+        connect_timeout=10,
+    ),
+    # 报表查询：READ COMMITTED 减少长查询持有的一致性快照，查询最长 5 分钟
+    "report": ConnectionProfile(
+        session_vars={"transaction_isolation": "READ-COMMITTED"},
+        query_timeout=300,
+        connect_timeout=10,
+    ),
+}
@@ -7,6 +7,8 @@ from typing import Any, ClassVar
 
 from pydantic import BaseModel, field_validator
 
+from .connection_profile import BUILTIN_PROFILES, ConnectionProfile
+
 class MySQLConfig(BaseModel):
     """MySQL数据库配置类"""
 
@@ -15,14 +17,50 @@ class MySQLConfig(BaseModel):
     _ENV_USER: ClassVar[str] = "LAZY_MYSQL_USER"
     _ENV_PASSWD: ClassVar[str] = "LAZY_MYSQL_PASSWD"
     _ENV_DATABASE: ClassVar[str] = "LAZY_MYSQL_DATABASE"
+    _ENV_DRIVER: ClassVar[str] = "LAZY_MYSQL_DRIVER"
+    _ENV_UNIX_SOCKET: ClassVar[str] = "LAZY_MYSQL_UNIX_SOCKET"
+    _ENV_SSL_CA: ClassVar[str] = "LAZY_MYSQL_SSL_CA"
+    _ENV_SSL_CERT: ClassVar[str] = "LAZY_MYSQL_SSL_CERT"
+    _ENV_SSL_KEY: ClassVar[str] = "LAZY_MYSQL_SSL_KEY"
+    _ENV_SSL_VERIFY_CERT: ClassVar[str] = "LAZY_MYSQL_SSL_VERIFY_CERT"
+    _ENV_SSL_DISABLED: ClassVar[str] = "LAZY_MYSQL_SSL_DISABLED"
+
+    # 可从环境变量读取的字段（profiles 只能通过字典 / 配置对象 / 显式参数提供）
+    _ENV_FIELDS: ClassVar[dict[str, str]] = {
+        "host": _ENV_HOST,
+        "port": _ENV_PORT,
+        "user": _ENV_USER,
+        "passwd": _ENV_PASSWD,
+        "database": _ENV_DATABASE,
+        "driver": _ENV_DRIVER,
+        "unix_socket": _ENV_UNIX_SOCKET,
+        "ssl_ca": _ENV_SSL_CA,
+        "ssl_cert": _ENV_SSL_CERT,
+        "ssl_key": _ENV_SSL_KEY,
+        "ssl_verify_cert": _ENV_SSL_VERIFY_CERT,
+        "ssl_disabled": _ENV_SSL_DISABLED,
+    }
 
     host: str | None = None
     port: int | None = None
     user: str | None = None
     passwd: str | None = None
     database: str | None = None
-
-    @field_validator("host", "user", "passwd", "database", mode="before")
+    # 驱动后端：None / "auto"（C 扩展可用时优先使用，否则纯 Python）、"c"、"pure" 或通过 register_driver 注册的名称
+    driver: str | None = None
+    # Unix 域套接字路径：与 MySQL 部署在同一台机器时使用，设置后忽略 host / port（仅 POSIX 系统）
+    unix_socket: str | None = None
+    # TLS：CA 证书、客户端证书与私钥路径，是否校验服务端证书，是否禁用 TLS
+    ssl_ca: str | None = None
+    ssl_cert: str | None = None
+    ssl_key: str | None = None
+    ssl_verify_cert: bool | None = None
+    ssl_disabled: bool | None = None
+    # 自定义连接配置档（与内置的 oltp / bulk / report 同名时覆盖内置配置），执行器通过 profile 参数选用
+    profiles: dict[str, ConnectionProfile] | None = None
+
+    @field_validator("host", "user", "passwd", "database", "driver", "unix_socket",
+                     "ssl_ca", "ssl_cert", "ssl_key", "ssl_verify_cert", "ssl_disabled", mode="before")
     @classmethod
     def _empty_str_to_none(cls, v: Any) -> Any:
         if v == "":
@@ -51,13 +89,7 @@ class MySQLConfig(BaseModel):
                 return None
             return raw
 
-        return {
-            "host": _get(cls._ENV_HOST),
-            "port": _get(cls._ENV_PORT),
-            "user": _get(cls._ENV_USER),
-            "passwd": _get(cls._ENV_PASSWD),
-            "database": _get(cls._ENV_DATABASE),
-        }
+        return {field: _get(key) for field, key in cls._ENV_FIELDS.items()}
 
     @classmethod
     def _first_non_empty(cls, *values: Any) -> Any:
@@ -67,17 +99,22 @@ class MySQLConfig(BaseModel):
         return None
 
     @classmethod
-    def from_env(cls, *, host=None, port=None, user=None, passwd=None, database=None):
-        """从系统环境变量读取MySQL配置；显式传入的字段优先级更高，空值不会覆盖已有值。"""
+    def from_env(cls, *, host=None, port=None, user=None, passwd=None, database=None, driver=None, **options):
+        """
+        从系统环境变量读取MySQL配置；显式传入的字段优先级更高，空值不会覆盖已有值。
+
+        :param options: 其余字段（unix_socket / ssl_ca / ssl_cert / ssl_key / ssl_verify_cert / ssl_disabled / profiles）
+        """
         env = cls._read_env()
+        explicit = dict(options, host=host, port=port, user=user, passwd=passwd, database=database, driver=driver)
+        unknown = set(explicit) - set(cls.model_fields)
+        if unknown:
+            raise TypeError(f"MySQLConfig 不支持的字段：{', '.join(sorted(unknown))}")
 
-        return cls(
-            host=cls._first_non_empty(host, env["host"]),
-            port=cls._first_non_empty(port, env["port"]),
-            user=cls._first_non_empty(user, env["user"]),
-            passwd=cls._first_non_empty(passwd, env["passwd"]),
-            database=cls._first_non_empty(database, env["database"]),
-        )
+        return cls(**{
+            field: cls._first_non_empty(explicit.get(field), env.get(field))
+            for field in cls.model_fields
+        })
 
     @classmethod
     def from_dict(cls, sql_config):
@@ -85,50 +122,59 @@ class MySQLConfig(BaseModel):
         return cls.resolve(sql_config)
 
     @classmethod
-    def resolve(cls, sql_config=None, *, host=None, port=None, user=None, passwd=None, database=None):
+    def resolve(cls, sql_config=None, *, host=None, port=None, user=None, passwd=None, database=None,
+                driver=None, **options):
         """
         统一解析配置来源，优先级：显式参数 > 字典/配置对象 > 环境变量。
 
         空值（None 或 ''）不会覆盖已有值。
         """
-        base_host = None
-        base_port = None
-        base_user = None
-        base_passwd = None
-        base_database = None
-
-        config_dict = None
         if isinstance(sql_config, dict):
-            config_dict = dict(sql_config)
+            base = dict(sql_config)
         elif sql_config is not None:
-            base_host = getattr(sql_config, "host", None)
-            base_port = getattr(sql_config, "port", None)
-            base_user = getattr(sql_config, "user", None)
-            base_passwd = getattr(sql_config, "passwd", None)
-            base_database = getattr(sql_config, "database", None)
-
-        if config_dict is not None:
-            base_host = cls._first_non_empty(base_host, config_dict.get("host"))
-            base_port = cls._first_non_empty(base_port, config_dict.get("port"))
-            base_user = cls._first_non_empty(base_user, config_dict.get("user"))
-            base_passwd = cls._first_non_empty(base_passwd, config_dict.get("passwd"))
-            base_database = cls._first_non_empty(
-                base_database,
-                config_dict.get("database"),
-            )
-
-        merged_host = cls._first_non_empty(host, base_host)
-        merged_port = cls._first_non_empty(port, base_port)
-        merged_user = cls._first_non_empty(user, base_user)
-        merged_passwd = cls._first_non_empty(passwd, base_passwd)
-        merged_database = cls._first_non_empty(database, base_database)
-
-        return cls.from_env(
-            host=merged_host,
-            port=merged_port,
-            user=merged_user,
-            passwd=merged_passwd,
-            database=merged_database,
-        )
-# 默认配置
-DEFAULT_MYSQL_CONFIG = MySQLConfig.resolve()
+            base = {field: getattr(sql_config, field, None) for field in cls.model_fields}
+        else:
+            base = {}
+
+        explicit = dict(options, host=host, port=port, user=user, passwd=passwd, database=database, driver=driver)
+        merged = {
+            field: cls._first_non_empty(explicit.get(field), base.get(field))
+            for field in cls.model_fields
+        }
+        return cls.from_env(**merged)
+
+    def get_profile(self, profile: "str | ConnectionProfile | dict | None") -> ConnectionProfile | None:
+        """
+        解析连接配置档：名称先在 profiles 中查找，再查找内置配置档；None 表示不使用配置档
+
+        :param profile: 配置档名称、ConnectionProfile 实例或字典
+        """
+        if profile is None or isinstance(profile, ConnectionProfile):
+            return profile
+        if isinstance(profile, dict):
+            return ConnectionProfile(**profile)
+        profiles = {**BUILTIN_PROFILES, **(self.profiles or {})}
+        if profile not in profiles:
+            raise ValueError(f"未定义的连接配置档：{profile!r}，可选值：{', '.join(sorted(profiles))}")
+        return profiles[profile]
+
+    def transport_kwargs(self) -> dict[str, Any]:
+        """Unix 套接字与 TLS 相关的连接参数（未设置的项不传，使用驱动默认值）"""
+        kwargs = {
+            "unix_socket": self.unix_socket,
+            "ssl_ca": self.ssl_ca,
+            "ssl_cert": self.ssl_cert,
+            "ssl_key": self.ssl_key,
+            "ssl_verify_cert": self.ssl_verify_cert,
+            "ssl_disabled": self.ssl_disabled,
+        }
+        return {key: value for key, value in kwargs.items() if value is not None}
+
+
+def __getattr__(name):
+    # 默认配置：首次访问时才读取环境变量并缓存，import 时不做任何解析
+    if name == "DEFAULT_MYSQL_CONFIG":
+        config = globals()["DEFAULT_MYSQL_CONFIG"] = MySQLConfig.resolve()
+        return config
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
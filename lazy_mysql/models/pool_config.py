@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field, model_validator
+
+
+class PoolConfig(BaseModel):
+    """连接池配置类，用于控制连接池的容量、借出等待时间与连接回收策略"""
+
+    min_size: int = Field(default=0, ge=0, description="连接池保持的最少连接数，创建连接池时预先建立")
+    max_size: int = Field(default=10, ge=1, description="连接池允许同时存在的最大连接数")
+    timeout: float = Field(default=30.0, gt=0, description="借出连接时的最长等待时间（秒），超时抛出 PoolTimeoutError")
+    max_lifetime: float | None = Field(default=3600.0, gt=0, description="单个连接的最长存活时间（秒），None 表示不限制")
+    idle_timeout: float | None = Field(default=600.0, gt=0, description="空闲连接的最长保留时间（秒），超过后回收（保留 min_size 个），None 表示不回收")
+    idle_ping_threshold: float | None = Field(default=None, ge=0, description="借出空闲超过该时长（秒）的连接前先 ping 检测，失效则替换为新连接，None 表示不检测")
+
+    @model_validator(mode="after")
+    def _check_size(self):
+        if self.min_size > self.max_size:
+            raise ValueError(f"min_size({self.min_size}) 不能大于 max_size({self.max_size})")
+        return self
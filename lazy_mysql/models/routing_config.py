@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+
+from .mysql_config import MySQLConfig
+
+
+class RoutingConfig(BaseModel):
+    """读写分离配置类，用于指定从库列表以及写入后读取主库的一致性策略"""
+
+    replicas: list[MySQLConfig] = Field(default_factory=list, description="从库配置列表，未填写的字段（用户、密码、数据库等）沿用主库配置")
+    sticky_window: float = Field(default=1.0, ge=0, description="写入后该时长（秒）内的读取继续走主库，保证读到自己的写入")
+    gtid_consistency: bool = Field(default=False, description="是否按 GTID 判断从库是否已追上写入：追上后的从库可在 sticky_window 内提前承担读取")
+    replica_down_interval: float = Field(default=30.0, ge=0, description="从库连接失败后暂停路由到该从库的时长（秒），期间读取改走其他从库或主库")
+    replica_connect_retries: int = Field(default=0, ge=0, description="连接从库失败时的重试次数：默认不重试，立即改走其他从库或主库")
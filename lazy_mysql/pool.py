@@ -0,0 +1,319 @@
+"""
+线程安全的 MySQL 连接池，提供借出（acquire）/归还（release）语义
+"""
+
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+
+from .exceptions import PoolClosedError, PoolTimeoutError
+from .models import MySQLConfig, PoolConfig
+from .utils import connect_db
+from .utils.bulk_session import SESSION_DIRTY_ATTR
+from .utils.fork import abandon_connection
+
+
+class _PoolEntry:
+    """连接池中的单个连接及其创建/最近使用时间"""
+
+    __slots__ = ("connection", "created_at", "last_used")
+
+    def __init__(self, connection):
+        now = time.monotonic()
+        self.connection = connection
+        self.created_at = now
+        self.last_used = now
+
+
+def _close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+class ConnectionPool:
+    """
+    MySQL 连接池
+
+    - 连接按需创建，总数不超过 max_size；创建时预先建立 min_size 个连接
+    - 借出时最多等待 timeout 秒，超时抛出 PoolTimeoutError
+    - 超过 max_lifetime 的连接在归还或借出时关闭并重建
+    - 空闲超过 idle_timeout 的连接被回收，但至少保留 min_size 个
+    - 设置 idle_ping_threshold 时，空闲超过该时长的连接在借出前先 ping，失效连接被替换
+    - fork 安全：在子进程中使用时丢弃从父进程继承的连接（不关闭，避免断开父进程的连接），按需重新建立
+
+    :example:
+        >>> pool = ConnectionPool(config, pool_config={'max_size': 20})
+        >>> with pool.lease() as executor:
+        ...     executor.select('users', ['id', 'name'])
+        >>> pool.close()
+    """
+
+    def __init__(self, sql_config=None, database=None, pool_config: PoolConfig | dict | None = None,
+                 profile=None):
+        self.sql_config = MySQLConfig.resolve(sql_config)
+        self.database = database or getattr(self.sql_config, "database", None)
+        if not self.database:
+            raise ValueError(
+                "未指定数据库名称！请通过 database 参数 或 sql_config.database 属性或环境变量 LAZY_MYSQL_DATABASE 提供数据库名。"
+            )
+        # 连接配置档（名称或 ConnectionProfile）：池中所有连接建立时设置同一组会话变量
+        self.profile = self.sql_config.get_profile(profile)
+
+        # 处理 pool_config，支持 PoolConfig 模型和字典方式
+        if pool_config is None:
+            pool_config = PoolConfig()
+        elif isinstance(pool_config, dict):
+            pool_config = PoolConfig(**pool_config)
+        self.pool_config = pool_config
+
+        self._idle: deque[_PoolEntry] = deque()
+        self._in_use: dict[int, _PoolEntry] = {}
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._pid = os.getpid()
+        # fork 后被丢弃的继承连接（子进程中归还时忽略）；保存连接对象本身（弱引用），
+        # 按 id() 记录时，继承连接被回收后新连接可能得到相同的 id 而被误当成已丢弃
+        self._abandoned = weakref.WeakSet()
+
+        for _ in range(pool_config.min_size):
+            self._idle.append(_PoolEntry(self._new_connection()))
+            self._size += 1
+
+    def _check_fork(self):
+        """检测到进程号变化（当前在 fork 出的子进程中）时丢弃继承的连接"""
+        if self._pid == os.getpid():
+            return
+        # fork 时父进程其他线程可能持有锁，子进程中该锁状态不可信，直接重建
+        self._cond = threading.Condition()
+        for entry in [*self._idle, *self._in_use.values()]:
+            abandon_connection(entry.connection)
+        self._abandoned = weakref.WeakSet(entry.connection for entry in self._in_use.values())
+        self._idle.clear()
+        self._in_use.clear()
+        self._size = 0
+        self._pid = os.getpid()
+
+    def _new_connection(self, retry_policy=None):
+        options = {}
+        if retry_policy is not None:
+            options["retry_policy"] = retry_policy
+        if self.profile is not None:
+            options["profile"] = self.profile
+        return connect_db(self.sql_config, self.database, **options)
+
+    def _is_expired(self, entry, now):
+        max_lifetime = self.pool_config.max_lifetime
+        return max_lifetime is not None and now - entry.created_at >= max_lifetime
+
+    def _take_idle_locked(self, to_close):
+        """取出一个可用的空闲连接（后进先出），过期连接放入 to_close 待关闭"""
+        now = time.monotonic()
+        while self._idle:
+            entry = self._idle.pop()
+            if self._is_expired(entry, now):
+                self._size -= 1
+                to_close.append(entry.connection)
+                continue
+            return entry
+        return None
+
+    def _prune_locked(self, to_close):
+        """回收空闲过久的连接，至少保留 min_size 个"""
+        idle_timeout = self.pool_config.idle_timeout
+        if idle_timeout is None:
+            return
+        now = time.monotonic()
+        # 队首为最久未使用的连接
+        while self._idle and self._size > self.pool_config.min_size:
+            entry = self._idle[0]
+            if now - entry.last_used < idle_timeout and not self._is_expired(entry, now):
+                break
+            self._idle.popleft()
+            self._size -= 1
+            to_close.append(entry.connection)
+
+    def acquire(self, timeout: float | None = None, retry_policy=None):
+        """
+        从连接池借出一个连接
+
+        :param timeout: 最长等待时间（秒），默认使用 pool_config.timeout
+        :param retry_policy: 需要新建连接时使用的重试策略，默认使用全局默认策略
+        :return: 数据库连接对象，使用完毕后必须通过 release() 归还
+        :raises PoolTimeoutError: 等待超时
+        :raises PoolClosedError: 连接池已关闭
+        """
+        self._check_fork()
+        if timeout is None:
+            timeout = self.pool_config.timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            entry = self._checkout(timeout, deadline)
+            if entry is None:
+                break
+            if self._is_alive(entry):
+                return entry.connection
+            # 空闲期间已被服务端断开（如超过 wait_timeout），丢弃后重新借出
+            self.release(entry.connection, discard=True)
+
+        try:
+            entry = _PoolEntry(self._new_connection(retry_policy))
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._in_use[id(entry.connection)] = entry
+        return entry.connection
+
+    def _is_alive(self, entry):
+        """空闲超过 idle_ping_threshold 的连接借出前 ping 一次，返回连接是否可用"""
+        threshold = self.pool_config.idle_ping_threshold
+        if threshold is None or time.monotonic() - entry.last_used < threshold:
+            return True
+        try:
+            entry.connection.ping()
+            return True
+        except Exception:
+            return False
+
+    def _checkout(self, timeout, deadline):
+        """
+        在锁内取出一个空闲连接，或为新建连接占位
+
+        :return: 空闲连接的 _PoolEntry（已登记为借出）；返回 None 表示已占位，调用方需在锁外新建连接
+        """
+        to_close = []
+        try:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolClosedError("连接池已关闭，无法借出连接")
+                    self._prune_locked(to_close)
+                    entry = self._take_idle_locked(to_close)
+                    if entry is not None:
+                        self._in_use[id(entry.connection)] = entry
+                        return entry
+                    if self._size < self.pool_config.max_size:
+                        # 先占位，在锁外建立连接，避免握手阻塞其他线程
+                        self._size += 1
+                        return None
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeoutError(
+                            f"连接池已满（max_size={self.pool_config.max_size}），等待 {timeout} 秒后仍未借到连接"
+                        )
+                    self._cond.wait(remaining)
+        finally:
+            for connection in to_close:
+                _close_quietly(connection)
+
+    def release(self, connection, discard: bool = False):
+        """
+        归还连接到连接池
+
+        归还前会回滚未提交的事务；回滚失败、连接已过期或 discard=True 时直接关闭该连接。
+
+        :param connection: acquire() 借出的连接
+        :param discard: 是否丢弃该连接（如连接已断开）
+        """
+        self._check_fork()
+        if connection in self._abandoned:
+            # 子进程中归还父进程借出的连接：已在 _check_fork 中丢弃，不能关闭
+            self._abandoned.discard(connection)
+            return
+        with self._cond:
+            entry = self._in_use.pop(id(connection), None)
+        if entry is None:
+            # 非本连接池借出的连接，直接关闭
+            _close_quietly(connection)
+            return
+
+        if not discard:
+            discard = not _reset_connection(connection) or self._is_expired(entry, time.monotonic())
+
+        to_close = []
+        with self._cond:
+            if discard or self._closed:
+                self._size -= 1
+                to_close.append(connection)
+            else:
+                entry.last_used = time.monotonic()
+                self._idle.append(entry)
+                self._prune_locked(to_close)
+            self._cond.notify()
+        for item in to_close:
+            _close_quietly(item)
+
+    def prune(self):
+        """立即回收空闲过久或超过最长存活时间的连接"""
+        self._check_fork()
+        to_close = []
+        with self._cond:
+            self._prune_locked(to_close)
+        for connection in to_close:
+            _close_quietly(connection)
+
+    @contextmanager
+    def lease(self, dict_cursor=False):
+        """
+        以上下文管理器方式借出连接，返回绑定该连接的 SQLExecutor，退出时自动归还
+
+        :param dict_cursor: 是否使用字典游标
+        """
+        from .executor import SQLExecutor
+
+        executor = SQLExecutor.from_pool(self, dict_cursor=dict_cursor)
+        try:
+            yield executor
+        finally:
+            executor.close()
+
+    @property
+    def stats(self) -> dict:
+        """连接池当前状态：总连接数、空闲连接数、借出连接数"""
+        self._check_fork()
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "max_size": self.pool_config.max_size,
+            }
+
+    def close(self):
+        """关闭连接池：立即关闭空闲连接，借出中的连接在归还时关闭"""
+        self._check_fork()
+        with self._cond:
+            self._closed = True
+            to_close = [entry.connection for entry in self._idle]
+            self._size -= len(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for connection in to_close:
+            _close_quietly(connection)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _reset_connection(connection):
+    """回滚未提交的事务，使连接以干净状态回到池中；失败或会话变量未恢复时返回 False"""
+    if getattr(connection, SESSION_DIRTY_ATTR, False) is True:
+        # 批量导入放宽的会话变量未能恢复（导入失败时连接被提前归还），不能交给下一个使用者
+        return False
+    try:
+        if getattr(connection, "in_transaction", False):
+            connection.rollback()
+        return True
+    except Exception:
+        return False
@@ -0,0 +1,177 @@
+"""
+可配置的重试策略：按 MySQL errno 分类错误，指数退避 + 随机抖动，总时长上限与熔断器
+"""
+
+import random
+import threading
+import time
+
+from mysql.connector.errors import ConnectionTimeoutError
+
+from .exceptions import CircuitOpenError
+
+# 错误类别
+CONNECTION = "connection"   # 连接断开/无法连接：重连后重试
+LOCK_WAIT = "lock_wait"     # 锁等待超时：服务端只回滚当前语句，可直接重试该语句
+DEADLOCK = "deadlock"       # 死锁：服务端回滚整个事务，只能整体重放事务（retry_transaction）
+
+# 2002/2003 无法连接，2006 server has gone away，2013 查询中断开，2055 读写失败，4031 空闲超时被服务端断开
+CONNECTION_ERRNOS = frozenset({2002, 2003, 2006, 2013, 2055, 4031})
+ER_LOCK_WAIT_TIMEOUT = 1205
+ER_LOCK_DEADLOCK = 1213
+
+# 无 errno 时（如驱动包装后的异常）按错误信息兜底匹配连接类错误
+_CONNECTION_ERROR_MESSAGES = (
+    "Lost connection to MySQL server",
+    "MySQL server has gone away",
+    "The Read Operation timed out",
+    "TimeoutError",
+    "connection timeout",
+)
+
+
+def classify_error(error) -> str | None:
+    """
+    判断异常的重试类别，沿 __cause__ / __context__ 查找被包装的原始驱动异常
+
+    :return: CONNECTION / LOCK_WAIT / DEADLOCK，不可重试时返回 None
+    """
+    seen = set()
+    current = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        errno = getattr(current, "errno", None)
+        if errno in CONNECTION_ERRNOS:
+            return CONNECTION
+        if errno == ER_LOCK_WAIT_TIMEOUT:
+            return LOCK_WAIT
+        if errno == ER_LOCK_DEADLOCK:
+            return DEADLOCK
+        if isinstance(current, CircuitOpenError):
+            # 熔断中的失败不应再触发重试
+            return None
+        if isinstance(current, (ConnectionTimeoutError, ConnectionError)):
+            return CONNECTION
+        current = current.__cause__ or current.__context__
+
+    message = str(error).lower()
+    if any(keyword.lower() in message for keyword in _CONNECTION_ERROR_MESSAGES):
+        return CONNECTION
+    return None
+
+
+class RetryPolicy:
+    """
+    重试策略
+
+    - 第 n 次重试前等待 min(max_delay, base_delay * 2^(n-1))，jitter=True 时在 [0, 该值] 内随机（full jitter），
+      避免故障切换后大量客户端同时重连
+    - 从首次失败起超过 deadline 秒不再重试（下一次等待会越过 deadline 时同样放弃）
+    - 连续 breaker_threshold 次连接失败后熔断 breaker_cooldown 秒，期间直接抛出 CircuitOpenError 而不再阻塞等待；
+      冷却结束后恢复尝试，成功一次即关闭熔断器，再失败一次则重新熔断
+
+    同一个 RetryPolicy 实例可以在多个执行器 / 连接池之间共享，熔断状态随实例共享。
+
+    :example:
+        >>> policy = RetryPolicy(max_retries=8, base_delay=0.2, max_delay=5, deadline=20)
+        >>> executor = SQLExecutor(config, retry_policy=policy)
+        >>> executor.retry_transaction(lambda tx: transfer(tx, 1, 2, 100))
+    """
+
+    def __init__(self, max_retries: int = 5, base_delay: float = 0.5, max_delay: float = 8.0,
+                 deadline: float | None = 30.0, jitter: bool = True,
+                 breaker_threshold: int | None = 10, breaker_cooldown: float = 30.0):
+        """
+        :param max_retries: 最大重试次数（不含首次执行）
+        :param base_delay: 首次重试的退避基数（秒）
+        :param max_delay: 单次等待上限（秒）
+        :param deadline: 从首次失败起的总重试时长上限（秒），None 表示不限制
+        :param jitter: 是否对等待时间加随机抖动
+        :param breaker_threshold: 连续连接失败多少次后熔断，None 表示不启用熔断器
+        :param breaker_cooldown: 熔断持续时间（秒）
+        """
+        if max_retries < 0:
+            raise ValueError("max_retries 不能为负数")
+        if base_delay < 0 or max_delay < 0:
+            raise ValueError("base_delay / max_delay 不能为负数")
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.jitter = jitter
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+
+        self._lock = threading.Lock()
+        self._consecutive_failures = 0
+        self._open_until = 0.0
+
+    classify = staticmethod(classify_error)
+
+    def backoff(self, attempt: int) -> float:
+        """第 attempt 次重试（从 1 开始）前的等待时间"""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def next_delay(self, error, attempt: int, started_at: float,
+                   kinds=(CONNECTION, LOCK_WAIT), kind: str | None = None) -> float | None:
+        """
+        计算第 attempt 次重试前的等待时间
+
+        :param error: 本次失败的异常
+        :param attempt: 即将进行的重试序号（从 1 开始）
+        :param started_at: 首次失败的 time.monotonic() 时间
+        :param kinds: 允许重试的错误类别
+        :param kind: 调用方已知的错误类别（如建立连接阶段的失败），None 时由 classify() 判断
+        :return: 等待秒数；不可重试、次数用尽、超过 deadline 或已熔断时返回 None
+        """
+        if kind is None:
+            kind = self.classify(error)
+        if kind == CONNECTION:
+            self.record_failure()
+        if kind not in kinds or attempt > self.max_retries or self.is_open():
+            return None
+        delay = self.backoff(attempt)
+        if self.deadline is not None and time.monotonic() + delay - started_at > self.deadline:
+            return None
+        return delay
+
+    # ---------------- 熔断器 ----------------
+
+    def is_open(self) -> bool:
+        """熔断器是否处于打开状态"""
+        with self._lock:
+            return time.monotonic() < self._open_until
+
+    def check_circuit(self):
+        """熔断期间抛出 CircuitOpenError"""
+        with self._lock:
+            remaining = self._open_until - time.monotonic()
+        if remaining > 0:
+            raise CircuitOpenError(
+                f"连续 {self.breaker_threshold} 次连接失败，熔断中，{remaining:.1f} 秒后重试"
+            )
+
+    def record_failure(self):
+        """记录一次连接失败，连续失败达到阈值时打开熔断器"""
+        if self.breaker_threshold is None:
+            return
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._consecutive_failures >= self.breaker_threshold:
+                self._open_until = time.monotonic() + self.breaker_cooldown
+                # 冷却结束后只需再失败一次即重新熔断（半开状态）
+                self._consecutive_failures = self.breaker_threshold - 1
+
+    def record_success(self):
+        """记录一次成功连接，关闭熔断器"""
+        with self._lock:
+            self._consecutive_failures = 0
+            self._open_until = 0.0
+
+    @property
+    def stats(self) -> dict:
+        """熔断器状态：连续失败次数与是否熔断中"""
+        return {"consecutive_failures": self._consecutive_failures, "open": self.is_open()}
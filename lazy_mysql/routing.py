@@ -0,0 +1,362 @@
+"""
+读写分离：读取路由到从库，写入路由到主库，写入后的一段时间内（或直到从库追上 GTID）读取继续走主库
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from .executor import SQLExecutor
+from .models import FetchConfig, MySQLConfig, RoutingConfig
+from .retry import CONNECTION, RetryPolicy, classify_error
+from .tools.sql_utils import is_read_only_sql, resolve_sql
+
+# 从库暂停路由的截止时间（time.monotonic()），按 (host, port, unix_socket, database) 在进程内共享：
+# from_pools 的用法中每个请求创建一个执行器，按实例记录时每个请求都会重新探测已宕机的从库。
+# 键只含地址，不持有连接池或配置对象；暂停到期的条目在下次标记时清除
+_replica_down_until: dict = {}
+_replica_down_lock = threading.Lock()
+
+
+def _replica_key(node):
+    """从库节点在共享故障状态中的键：连接地址与数据库（from_pool 创建的节点沿用连接池的配置）"""
+    config = node.sql_config
+    return (config.host, config.port, getattr(config, "unix_socket", None), node.database)
+
+
+def _replica_retry_policy(routing_config):
+    """
+    从库使用的重试策略：连接失败时不重试（或只做 replica_connect_retries 次短暂重试），立即改走其他从库或主库；
+    不启用熔断器，从库故障由 replica_down_interval 处理
+    """
+    return RetryPolicy(max_retries=routing_config.replica_connect_retries, base_delay=0.1, max_delay=0.5,
+                       deadline=2.0, breaker_threshold=None)
+
+
+class RoutingExecutor:
+    """
+    读写分离执行器，方法与 SQLExecutor 同名同参，替换执行器即可分流读取，无需修改调用代码
+
+    - select / exists / query / fetch_and_response / fetch_format / iter_query → 从库（轮询）
+    - insert / upsert / update / batch_update / delete / execute → 主库
+    - 写入后 sticky_window 秒内的读取走主库（读到自己的写入）；开启 gtid_consistency 时，
+      已应用该写入 GTID 的从库可提前恢复承担读取
+    - transaction() 内的所有语句、加锁读取（FOR UPDATE 等）以及非只读 SQL 走主库
+    - 从库连接失败时暂停路由到该从库 replica_down_interval 秒，本次读取改走其他从库或主库；
+      暂停状态按从库地址在进程内共享，连接从库时默认不重试
+
+    每个节点都是延迟连接的 SQLExecutor：未被路由到的从库不会建立连接。
+    与 SQLExecutor 一样不是线程安全的，"写后读主库"的粘滞状态按执行器实例（会话）维护。
+
+    :example:
+        >>> executor = RoutingExecutor(config, routing_config={
+        ...     'replicas': [{'host': '10.0.0.11'}, {'host': '10.0.0.12'}],
+        ...     'sticky_window': 2,
+        ... })
+        >>> executor.insert('users', {'name': '张三'}, commit=True)   # 主库
+        >>> executor.select('users', ['id', 'name'])                   # 2 秒内仍走主库
+    """
+
+    def __init__(self, sql_config=None, routing_config: RoutingConfig | dict | None = None,
+                 database=None, dict_cursor=False, **executor_options):
+        """
+        :param sql_config: 主库配置
+        :param routing_config: 读写分离配置（RoutingConfig 或字典），replicas 中未填写的字段沿用主库配置
+        :param database: 指定数据库（主从共用）
+        :param dict_cursor: 是否使用字典游标
+        :param executor_options: 其余参数（prepared / retry_policy / idle_ping_threshold 等）原样传给各节点的 SQLExecutor；
+            retry_policy 只用于主库，从库的重试由 replica_connect_retries 决定
+        """
+        routing_config = self._resolve_routing_config(routing_config)
+        primary_config = MySQLConfig.resolve(sql_config)
+        primary = SQLExecutor(primary_config, database, dict_cursor=dict_cursor, lazy_connect=True,
+                              **executor_options)
+        replica_options = {**executor_options, "retry_policy": _replica_retry_policy(routing_config)}
+        replicas = [
+            SQLExecutor(self._replica_config(primary_config, replica), primary.database,
+                        dict_cursor=dict_cursor, lazy_connect=True, **replica_options)
+            for replica in routing_config.replicas
+        ]
+        self._setup(primary, replicas, routing_config)
+
+    @classmethod
+    def from_pools(cls, primary_pool, replica_pools, routing_config: RoutingConfig | dict | None = None,
+                   dict_cursor=False, **executor_options):
+        """
+        从主库与从库的连接池创建执行器（Web 服务中每个请求创建一个，连接池全局共享）
+
+        :param primary_pool: 主库 ConnectionPool
+        :param replica_pools: 从库 ConnectionPool 列表
+        :param routing_config: 读写分离配置，此时忽略其中的 replicas
+        :param dict_cursor: 是否使用字典游标
+        :param executor_options: 其余参数原样传给各节点的 SQLExecutor.from_pool（retry_policy 只用于主库）
+        :return: RoutingExecutor 实例
+        """
+        self = object.__new__(cls)
+        routing_config = cls._resolve_routing_config(routing_config)
+        primary = SQLExecutor.from_pool(primary_pool, dict_cursor=dict_cursor, lazy_connect=True,
+                                        **executor_options)
+        replica_options = {**executor_options, "retry_policy": _replica_retry_policy(routing_config)}
+        replicas = [
+            SQLExecutor.from_pool(pool, dict_cursor=dict_cursor, lazy_connect=True, **replica_options)
+            for pool in replica_pools
+        ]
+        self._setup(primary, replicas, routing_config)
+        return self
+
+    @staticmethod
+    def _resolve_routing_config(routing_config):
+        # 处理 routing_config，支持 RoutingConfig 模型和字典方式
+        if routing_config is None:
+            return RoutingConfig()
+        if isinstance(routing_config, dict):
+            return RoutingConfig(**routing_config)
+        return routing_config
+
+    @staticmethod
+    def _replica_config(primary_config, replica):
+        """从库配置中的非空字段覆盖主库配置"""
+        config = MySQLConfig.resolve(
+            primary_config,
+            host=replica.host, port=replica.port, user=replica.user,
+            passwd=replica.passwd, database=replica.database, driver=replica.driver,
+            **replica.model_dump(exclude_none=True,
+                                 exclude={"host", "port", "user", "passwd", "database", "driver"}),
+        )
+        if replica.host and not replica.unix_socket:
+            # 主库的 Unix 套接字只能连到本机的主库，指定了 host 的从库按 host / port 连接
+            config = config.model_copy(update={"unix_socket": None})
+        return config
+
+    def _setup(self, primary, replicas, routing_config):
+        self.primary = primary
+        self.replicas = replicas
+        self.routing_config = routing_config
+        self.logger = logging.getLogger(__name__)
+        self._next_replica = 0
+        self._replica_keys = [_replica_key(replica) for replica in replicas]
+        # 最近一次写入的时间；GTID 模式下写入对应的 GTID 集合（首次需要时从主库读取）以及已追上的从库
+        self._last_write = None
+        self._write_gtid = None
+        self._caught_up: set[int] = set()
+
+    @property
+    def database(self):
+        return self.primary.database
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """关闭（或归还）主库与所有从库的连接"""
+        for node in (self.primary, *self.replicas):
+            node.close()
+
+    # ---------- 路由 ----------
+
+    @staticmethod
+    def _arm(node):
+        # 节点被 self_close=True 等关闭后，下次使用时重新建立连接
+        if node.mydb is None and node._transaction is None:
+            node._connect_pending = True
+        return node
+
+    def _mark_write(self):
+        self._last_write = time.monotonic()
+        self._write_gtid = None
+        self._caught_up.clear()
+
+    def _in_sticky_window(self):
+        return (self._last_write is not None
+                and time.monotonic() - self._last_write < self.routing_config.sticky_window)
+
+    def _available_replicas(self):
+        """按轮询顺序返回当前可用的从库下标"""
+        count = len(self.replicas)
+        now = time.monotonic()
+        start = self._next_replica
+        self._next_replica = (start + 1) % count if count else 0
+        with _replica_down_lock:
+            down_until = [_replica_down_until.get(key, 0.0) for key in self._replica_keys]
+        return [i for i in ((start + k) % count for k in range(count)) if down_until[i] <= now]
+
+    def _replica_caught_up(self, index):
+        """GTID 模式：从库是否已应用最近一次写入（主库当时的 gtid_executed）"""
+        if index in self._caught_up:
+            return True
+        if self._write_gtid is None:
+            self._write_gtid = self._arm(self.primary).query(
+                "SELECT @@GLOBAL.gtid_executed", fetch_config=FetchConfig(fetch_mode="one")
+            ) or ""
+        if self._write_gtid == "":
+            # 主库未开启 GTID，无法判断，继续按 sticky_window 走主库
+            return False
+        caught_up = self._arm(self.replicas[index]).query(
+            "SELECT GTID_SUBSET(%s, @@GLOBAL.gtid_executed)", (self._write_gtid,),
+            fetch_config=FetchConfig(fetch_mode="one"),
+        )
+        if caught_up:
+            self._caught_up.add(index)
+        return bool(caught_up)
+
+    def _read_targets(self):
+        """本次读取依次尝试的从库下标（均不可用时走主库）"""
+        if self.primary._transaction is not None:
+            return []
+        if self._in_sticky_window() and not self.routing_config.gtid_consistency:
+            return []
+        return self._available_replicas()
+
+    def _try_replica(self, index, func, *args, **kwargs):
+        """
+        在从库上执行 func，连接失败时标记该从库暂不可用
+
+        :return: (是否成功, func 的返回值)
+        """
+        try:
+            return True, func(*args, **kwargs)
+        except Exception as e:
+            if classify_error(e) != CONNECTION:
+                raise
+            now = time.monotonic()
+            with _replica_down_lock:
+                for key in [key for key, until in _replica_down_until.items() if until <= now]:
+                    del _replica_down_until[key]
+                _replica_down_until[self._replica_keys[index]] = now + self.routing_config.replica_down_interval
+            self.logger.warning("Replica %s unavailable, routing reads elsewhere: %s", index, e)
+            return False, None
+
+    def _read(self, method, *args, **kwargs):
+        for index in self._read_targets():
+            if self._in_sticky_window():
+                # GTID 模式：跳过尚未应用最近一次写入的从库
+                ok, caught_up = self._try_replica(index, self._replica_caught_up, index)
+                if not (ok and caught_up):
+                    continue
+            node = self._arm(self.replicas[index])
+            ok, result = self._try_replica(index, getattr(node, method), *args, **kwargs)
+            if ok:
+                return result
+        return getattr(self._arm(self.primary), method)(*args, **kwargs)
+
+    def _write(self, method, *args, **kwargs):
+        try:
+            return getattr(self._arm(self.primary), method)(*args, **kwargs)
+        finally:
+            # 失败的写入也可能已在主库部分生效（如连接在 COMMIT 后断开），同样进入粘滞窗口
+            self._mark_write()
+
+    def _read_sql(self, method, sql, *args, **kwargs):
+        """自定义 SQL：只读语句路由到从库，其余（含加锁读取）走主库"""
+        sql = resolve_sql(sql)
+        if is_read_only_sql(sql):
+            return self._read(method, sql, *args, **kwargs)
+        return self._write(method, sql, *args, **kwargs)
+
+    # ---------- 读取（从库） ----------
+
+    def select(self, *args, **kwargs):
+        """SELECT 查询，参数同 SQLExecutor.select"""
+        return self._read("select", *args, **kwargs)
+
+    def exists(self, *args, **kwargs) -> bool:
+        """判断记录是否存在，参数同 SQLExecutor.exists"""
+        return self._read("exists", *args, **kwargs)
+
+    def fetch_and_response(self, table_names, fields=None, conditions=None, distinct=False, join_conditions=None,
+                           fetch_config=None, order_by=None, limit=None, format_func=None, self_close=True,
+                           timeout=None):
+        """
+        查询并包装为响应字典，参数同 SQLExecutor.fetch_and_response
+
+        SQLExecutor.fetch_and_response 会把异常包装为 success=False 的响应，从库连接失败时无法故障转移；
+        这里先经 _read 执行 select（从库失败时改走其他从库或主库），再包装结果
+        """
+        if fields is None:
+            raise ValueError("fields 参数不能为空")
+        fetch_config = SQLExecutor._response_fetch_config(fetch_config)
+        return SQLExecutor._build_response(
+            lambda: self._read("select", table_names, fields, conditions, order_by, limit, distinct,
+                               join_conditions, self_close, fetch_config, timeout=timeout),
+            format_func,
+        )
+
+    def query(self, sql, *args, **kwargs):
+        """执行自定义查询，参数同 SQLExecutor.query；非只读 SQL 走主库"""
+        return self._read_sql("query", sql, *args, **kwargs)
+
+    def fetch_format(self, sql, *args, **kwargs):
+        """执行查询并格式化结果，参数同 SQLExecutor.fetch_format；非只读 SQL 走主库"""
+        return self._read_sql("fetch_format", sql, *args, **kwargs)
+
+    def iter_query(self, sql, *args, **kwargs):
+        """流式查询，参数同 SQLExecutor.iter_query；非只读 SQL 走主库"""
+        return self._read_sql("iter_query", sql, *args, **kwargs)
+
+    # ---------- 写入（主库） ----------
+
+    def execute(self, *args, **kwargs):
+        """执行 SQL 语句，参数同 SQLExecutor.execute"""
+        return self._write("execute", *args, **kwargs)
+
+    def insert(self, *args, **kwargs):
+        """插入数据，参数同 SQLExecutor.insert"""
+        return self._write("insert", *args, **kwargs)
+
+    def upsert(self, *args, **kwargs):
+        """插入或更新数据，参数同 SQLExecutor.upsert"""
+        return self._write("upsert", *args, **kwargs)
+
+    def update(self, *args, **kwargs):
+        """更新数据，参数同 SQLExecutor.update"""
+        return self._write("update", *args, **kwargs)
+
+    def batch_update(self, *args, **kwargs):
+        """批量更新，参数同 SQLExecutor.batch_update"""
+        return self._write("batch_update", *args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        """删除数据，参数同 SQLExecutor.delete"""
+        return self._write("delete", *args, **kwargs)
+
+    def commit(self):
+        """提交主库上的事务"""
+        self.primary.commit()
+        # 提交后主库的 GTID 集合才包含本次写入，需重新读取
+        self._write_gtid = None
+        self._caught_up.clear()
+
+    def commit_close(self):
+        """提交主库上的事务并关闭所有连接"""
+        self.commit()
+        self.close()
+
+    @contextmanager
+    def transaction(self, *args, **kwargs):
+        """在主库上开启事务，作用域内的读取也走主库，参数同 SQLExecutor.transaction"""
+        try:
+            with self._arm(self.primary).transaction(*args, **kwargs) as executor:
+                yield executor
+        finally:
+            # 粘滞窗口从事务结束（提交）时开始计算
+            self._mark_write()
+
+    @contextmanager
+    def pipeline(self, *args, **kwargs):
+        """在主库上开启语句流水线，参数同 SQLExecutor.pipeline"""
+        try:
+            with self._arm(self.primary).pipeline(*args, **kwargs) as pipe:
+                yield pipe
+        finally:
+            self._mark_write()
+
+    def retry_transaction(self, func, retry_policy=None):
+        """在主库上执行可重放的事务，参数同 SQLExecutor.retry_transaction"""
+        try:
+            return self._arm(self.primary).retry_transaction(func, retry_policy)
+        finally:
+            self._mark_write()
@@ -0,0 +1,265 @@
+"""
+多线程共享的执行器：每次调用（或每个线程）从连接池借出独立的连接与游标，线程之间互不干扰
+"""
+
+import os
+import threading
+import weakref
+from contextlib import contextmanager
+
+from .executor import SQLExecutor
+from .pool import ConnectionPool
+
+
+def _forget_connection(executor):
+    """fork 后丢弃执行器上继承的连接引用（连接本身由连接池丢弃），避免执行器被回收时关闭父进程的连接"""
+    executor.mydb = None
+    executor.mycursor = None
+    executor._text_cursor = None
+    executor._prepared_cache = None
+
+
+def _commit_before_release(executor):
+    """归还连接时会回滚未提交的事务，借出的执行器在归还前先提交（self_close=True 时连接已归还）"""
+    if executor.mydb is not None and getattr(executor.mydb, "in_transaction", True):
+        executor.commit()
+
+
+class ThreadSafeExecutor:
+    """
+    线程安全的执行器门面，方法与 SQLExecutor 同名同参，可在 concurrent.futures 线程池的各个任务间共享
+
+    - 默认（per_thread=False）每次调用从连接池借出一个执行器，执行后自动提交并归还，每次调用是一个独立事务
+    - per_thread=True 时每个线程固定借出一个执行器，行为与单线程使用 SQLExecutor 一致（需自行 commit），
+      线程结束后连接随执行器回收归还，也可调用 release_thread() 提前归还
+    - transaction() / pipeline() 作用域内，当前线程的调用都使用同一个连接
+    - 并发连接数受连接池 max_size 限制，超出时等待（最长 pool_config.timeout 秒）
+    - fork 安全：在子进程中使用时丢弃继承自父进程的连接并重新建立
+
+    :example:
+        >>> executor = ThreadSafeExecutor(config, pool_config={'max_size': 8})
+        >>> with concurrent.futures.ThreadPoolExecutor(8) as workers:
+        ...     counts = list(workers.map(lambda day: executor.query(SQL, [day], fetch_config=ONE), days))
+        >>> executor.close()
+    """
+
+    def __init__(self, sql_config=None, database=None, pool_config=None, dict_cursor=False,
+                 per_thread=False, pool: ConnectionPool | None = None, **executor_options):
+        """
+        :param sql_config: 数据库配置
+        :param database: 指定数据库
+        :param pool_config: 连接池配置（PoolConfig 或字典），传入 pool 时忽略
+        :param dict_cursor: 是否使用字典游标
+        :param per_thread: 是否每个线程固定使用一个连接
+        :param pool: 使用已有的连接池（close() 时不关闭该连接池）
+        :param executor_options: 其余参数（prepared / retry_policy / query_timeout 等）原样传给借出的 SQLExecutor；
+            profile 同时用于新建的连接池
+        """
+        self._owns_pool = pool is None
+        self.pool = pool if pool is not None else ConnectionPool(sql_config, database, pool_config,
+                                                                     profile=executor_options.get("profile"))
+        self.dict_cursor = dict_cursor
+        self.per_thread = per_thread
+        self.executor_options = executor_options
+        self._init_thread_state()
+
+    def _init_thread_state(self):
+        self._pid = os.getpid()
+        self._local = threading.local()
+        # per_thread 模式下各线程的执行器（弱引用：线程结束后执行器被回收，连接随之归还）
+        self._thread_executors = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def _check_fork(self):
+        """检测到进程号变化时丢弃继承的执行器（连接由连接池在子进程中丢弃）"""
+        if self._pid == os.getpid():
+            return
+        inherited = list(self._thread_executors.values())
+        pinned = getattr(self._local, "executor", None)
+        for executor in inherited + ([pinned] if pinned is not None else []):
+            _forget_connection(executor)
+        self._init_thread_state()
+
+    @property
+    def database(self):
+        return self.pool.database
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _new_executor(self):
+        return SQLExecutor.from_pool(self.pool, dict_cursor=self.dict_cursor, **self.executor_options)
+
+    def _current(self):
+        """当前线程固定使用的执行器（per_thread 模式，或 transaction() / pipeline() 作用域内），没有时返回 None"""
+        executor = getattr(self._local, "executor", None)
+        if executor is None and self.per_thread:
+            executor = self._local.executor = self._new_executor()
+            with self._lock:
+                self._thread_executors[threading.get_ident()] = executor
+        return executor
+
+    def _call(self, method, *args, **kwargs):
+        self._check_fork()
+        executor = self._current()
+        if executor is not None:
+            return getattr(executor, method)(*args, **kwargs)
+        executor = self._new_executor()
+        try:
+            result = getattr(executor, method)(*args, **kwargs)
+            _commit_before_release(executor)
+            return result
+        finally:
+            executor.close()
+
+    def _stream(self, method, *args, **kwargs):
+        """流式读取：借出的连接在遍历结束（或生成器关闭）后才归还"""
+        self._check_fork()
+        executor = self._current()
+        if executor is not None:
+            yield from getattr(executor, method)(*args, **kwargs)
+            return
+        executor = self._new_executor()
+        try:
+            yield from getattr(executor, method)(*args, **kwargs)
+        finally:
+            executor.close()
+
+    # ---------- 读取 ----------
+
+    def select(self, *args, **kwargs):
+        """查询数据，参数同 SQLExecutor.select"""
+        if kwargs.get("stream"):
+            return self._stream("select", *args, **kwargs)
+        return self._call("select", *args, **kwargs)
+
+    def exists(self, *args, **kwargs) -> bool:
+        """判断数据是否存在，参数同 SQLExecutor.exists"""
+        return self._call("exists", *args, **kwargs)
+
+    def fetch_and_response(self, *args, **kwargs):
+        """查询并包装结果，参数同 SQLExecutor.fetch_and_response"""
+        return self._call("fetch_and_response", *args, **kwargs)
+
+    def query(self, *args, **kwargs):
+        """执行自定义SQL查询，参数同 SQLExecutor.query"""
+        return self._call("query", *args, **kwargs)
+
+    def fetch_format(self, *args, **kwargs):
+        """执行查询并格式化结果，参数同 SQLExecutor.fetch_format"""
+        return self._call("fetch_format", *args, **kwargs)
+
+    def iter_query(self, *args, **kwargs):
+        """流式查询，参数同 SQLExecutor.iter_query；遍历期间占用一个连接"""
+        return self._stream("iter_query", *args, **kwargs)
+
+    def gather(self, specs, max_concurrency=None, return_exceptions=True):
+        """并发执行相互独立的查询，各查询使用连接池中不同的连接，参数同 SQLExecutor.gather"""
+        from .utils.gather import gather as gather_func
+
+        self._check_fork()
+        options = {**self.executor_options, "lazy_connect": True}
+        return gather_func(
+            specs,
+            lambda: SQLExecutor.from_pool(self.pool, dict_cursor=self.dict_cursor, **options),
+            max_concurrency,
+            return_exceptions,
+        )
+
+    # ---------- 写入 ----------
+
+    def execute(self, *args, **kwargs):
+        """执行SQL，参数同 SQLExecutor.execute"""
+        return self._call("execute", *args, **kwargs)
+
+    def insert(self, *args, **kwargs):
+        """插入数据，参数同 SQLExecutor.insert"""
+        return self._call("insert", *args, **kwargs)
+
+    def upsert(self, *args, **kwargs):
+        """插入或更新数据，参数同 SQLExecutor.upsert"""
+        return self._call("upsert", *args, **kwargs)
+
+    def update(self, *args, **kwargs):
+        """更新数据，参数同 SQLExecutor.update"""
+        return self._call("update", *args, **kwargs)
+
+    def batch_update(self, *args, **kwargs):
+        """批量更新数据，参数同 SQLExecutor.batch_update"""
+        return self._call("batch_update", *args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        """删除数据，参数同 SQLExecutor.delete"""
+        return self._call("delete", *args, **kwargs)
+
+    def commit(self):
+        """提交当前线程固定使用的连接上的事务（每次调用借出连接时已自动提交，无需调用）"""
+        self._check_fork()
+        executor = self._current()
+        if executor is not None:
+            executor.commit()
+
+    # ---------- 事务 ----------
+
+    @contextmanager
+    def _pinned(self):
+        """作用域内当前线程的调用固定使用同一个执行器，as 子句得到该执行器"""
+        self._check_fork()
+        executor = self._current()
+        if executor is not None:
+            yield executor
+            return
+        executor = self._local.executor = self._new_executor()
+        try:
+            yield executor
+            _commit_before_release(executor)
+        finally:
+            self._local.executor = None
+            executor.close()
+
+    @contextmanager
+    def transaction(self, *args, **kwargs):
+        """开启事务，作用域内当前线程的调用使用同一个连接，参数同 SQLExecutor.transaction"""
+        with self._pinned() as executor:
+            with executor.transaction(*args, **kwargs):
+                yield executor
+
+    @contextmanager
+    def pipeline(self, *args, **kwargs):
+        """开启语句流水线，作用域内当前线程的调用使用同一个连接，参数同 SQLExecutor.pipeline"""
+        with self._pinned() as executor:
+            with executor.pipeline(*args, **kwargs) as pipe:
+                yield pipe
+
+    def retry_transaction(self, func, retry_policy=None):
+        """执行可重放的事务，参数同 SQLExecutor.retry_transaction"""
+        with self._pinned() as executor:
+            return executor.retry_transaction(func, retry_policy)
+
+    # ---------- 连接管理 ----------
+
+    def release_thread(self):
+        """per_thread 模式下归还当前线程固定使用的连接（未提交的事务会回滚），下次调用时重新借出"""
+        self._check_fork()
+        executor = getattr(self._local, "executor", None)
+        if executor is None:
+            return
+        self._local.executor = None
+        with self._lock:
+            self._thread_executors.pop(threading.get_ident(), None)
+        executor.close()
+
+    def close(self):
+        """归还所有线程固定使用的连接；连接池由本对象创建时一并关闭"""
+        self._check_fork()
+        with self._lock:
+            executors = list(self._thread_executors.values())
+            self._thread_executors.clear()
+        for executor in executors:
+            executor.close()
+        self._local = threading.local()
+        if self._owns_pool:
+            self.pool.close()
@@ -1,8 +1,5 @@
 import re
 
-import sqlparse
-from sqlparse.exceptions import SQLParseError
-
 # 错误日志中 IN/NOT IN 列表与 params 截断阈值
 _IN_TRUNCATION_THRESHOLD = 30     # IN 列表元素超过此数量才截断
 _MAX_IN_ITEMS_FOR_LOG = 10        # IN 列表截断后保留的元素数量
@@ -103,6 +100,10 @@ def truncate_params_for_log(params):
 
 def format_sql_for_log(sql):
     """格式化 SQL 供日志展示；格式化失败时保留原始 SQL。"""
+    # sqlparse 只在格式化错误日志时才需要，首次使用时再导入以缩短 import lazy_mysql 的耗时
+    import sqlparse
+    from sqlparse.exceptions import SQLParseError
+
     try:
         return sqlparse.format(sql, reindent=True, keyword_case='upper')
     except SQLParseError:
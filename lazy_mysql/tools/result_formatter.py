@@ -1,4 +1,3 @@
-import pandas as pd
 from typing import Literal
 
 def fetch_format( executor , sql , fetch_mode: Literal["all", "oneTuple", "one"] , output_format: Literal["", "list_1", "df", "df_dict"] | Literal["dict"] = "" , show_count = False , data_label = None ,
@@ -24,49 +23,23 @@ def fetch_format( executor , sql , fetch_mode: Literal["all", "oneTuple", "one"]
         - fetch_mode="one": 返回单个值，如 1 或 '张三'
     """
 
-    if data_label is None :
-        data_label = [ ]
-
-    # 验证：当输出格式为df/df_dict时，data_label不能为空
-    if output_format in ["df", "df_dict", "dict"] and not data_label:
-        raise ValueError("当 output_format 为 'df'、'df_dict' 或 'dict' 时，data_label 参数不能为空!")
-    # 验证：dict 格式仅支持 fetch_mode="oneTuple"
-    if output_format == "dict":
-        if fetch_mode != "oneTuple":
-            raise ValueError("output_format='dict' 仅在 fetch_mode='oneTuple' 时有效!")
+    data_label = _validate_fetch_args( fetch_mode , output_format , data_label )
 
     executor.execute( sql , params , self_close = False )
 
     if fetch_mode == "all" :
         myresult = executor.mycursor.fetchall()  # 接收全部的返回结果行,返回结果为 [tuple（元组）]
-        if output_format == "list_1" :
-            if myresult is None :
-                return [ ]
-            data = [ row[ 0 ] for row in myresult ] if myresult else [ ]
-            myresult = data
-        elif "df" in output_format :
-            myresult = pd.DataFrame( myresult , columns = data_label )
-            if "dict" in output_format :
-                myresult = myresult.to_dict( orient = "records" )
+        if output_format == "list_1" and myresult is None :
+            return [ ]
+        myresult = _format_rows( myresult , output_format , data_label )
     
     elif fetch_mode == "oneTuple" :
         myresult = executor.mycursor.fetchone()  # 接收返回结果行,返回结果为 tuple（元组）,如果没有结果,则仅返回 None
-        # 新增：支持 output_format == 'dict' 且 myresult/data_label 不为空时，转为 dict
-        if "dict" in output_format and myresult and data_label:
-            if len(myresult) != len(data_label):
-                raise ValueError(f"data_label 长度与查询结果字段数不一致！data_label : {data_label} , myresult : {myresult}")
-            myresult = dict(zip(data_label, myresult))
+        myresult = _format_one_tuple( myresult , output_format , data_label )
     
     elif fetch_mode == "one" :
         result = executor.mycursor.fetchone()  # 接收返回结果行,返回结果为 tuple（元组）,如果没有结果,则仅返回 None
-        if result is None:
-            myresult = None
-        else:
-            if isinstance(result, dict):
-                myresult = result
-            else:
-                myresult = result[ 0 ] if result else None
-            # myresult = result
+        myresult = _format_one( result )
     else :
         executor.close()
         raise ValueError( f"fetch_mode error :{fetch_mode} , only supported [ all , oneTuple , one ]" )
@@ -79,4 +52,126 @@ def fetch_format( executor , sql , fetch_mode: Literal["all", "oneTuple", "one"]
         num = len(myresult) if myresult is not None else 0
         print( f"查询结果数量：{num}" )
         return myresult , num
-    return myresult
\ No newline at end of file
+    return myresult
+
+
+# 流式读取时每次 fetchmany 的默认行数（逐行返回模式下使用）
+_STREAM_FETCH_SIZE = 10000
+
+
+def _validate_fetch_args( fetch_mode , output_format , data_label ) :
+    """校验 fetch_mode / output_format / data_label 组合，返回规范化后的 data_label"""
+    if data_label is None :
+        data_label = [ ]
+
+    # 验证：当输出格式为df/df_dict时，data_label不能为空
+    if output_format in ["df", "df_dict", "dict"] and not data_label:
+        raise ValueError("当 output_format 为 'df'、'df_dict' 或 'dict' 时，data_label 参数不能为空!")
+    # 验证：dict 格式仅支持 fetch_mode="oneTuple"
+    if output_format == "dict":
+        if fetch_mode != "oneTuple":
+            raise ValueError("output_format='dict' 仅在 fetch_mode='oneTuple' 时有效!")
+    return data_label
+
+
+def _format_one_tuple( row , output_format , data_label ) :
+    """格式化 fetch_mode="oneTuple" 的单行结果"""
+    # 支持 output_format == 'dict' 且 row/data_label 不为空时，转为 dict
+    if "dict" in output_format and row and data_label:
+        if len(row) != len(data_label):
+            raise ValueError(f"data_label 长度与查询结果字段数不一致！data_label : {data_label} , myresult : {row}")
+        return dict(zip(data_label, row))
+    return row
+
+
+def _format_one( row ) :
+    """格式化 fetch_mode="one" 的结果：返回第一个字段的值（字典游标返回整行）"""
+    if row is None:
+        return None
+    if isinstance(row, dict):
+        return row
+    return row[ 0 ] if row else None
+
+
+def _format_rows( rows , output_format , data_label ) :
+    """按 output_format 格式化一批结果行（fetch_format 与 iter_fetch 共用）"""
+    if output_format == "list_1" :
+        return [ row[ 0 ] for row in rows ] if rows else [ ]
+    if output_format == "df_dict" :
+        # 不经过 DataFrame，避免仅为转换字典而导入 pandas
+        if not rows :
+            return [ ]
+        if isinstance( rows[ 0 ] , dict ) :
+            return [ { label : row.get( label ) for label in data_label } for row in rows ]
+        return [ dict( zip( data_label , row ) ) for row in rows ]
+    if output_format == "df" :
+        return _to_dataframe( rows , data_label )
+    return rows
+
+
+def _to_dataframe( rows , data_label ) :
+    """构建 DataFrame；pandas 为可选依赖，仅在 output_format="df" 时导入"""
+    try :
+        import pandas as pd
+    except ImportError as e :
+        raise ImportError( 'output_format="df" 需要安装 pandas：pip install "lazy_mysql[pandas]"' ) from e
+    return pd.DataFrame( rows , columns = data_label )
+
+
+def iter_fetch( executor , sql , params = None , chunk_size: int | None = None ,
+                output_format: Literal["", "list_1", "df", "df_dict"] = "" , data_label = None ,
+                self_close = False ) :
+    """
+    流式获取查询结果：使用非缓冲游标 + fetchmany 分批读取，内存占用与结果集大小无关
+    :param executor: SQLExecutor 实例
+    :param sql: SQL语句
+    :param params: 参数
+    :param chunk_size: 分块大小，None 时逐行返回；为整数时每次返回最多 chunk_size 行组成的块
+    :param output_format: 输出格式 ,默认 "" , 可选值: list_1、df（必须指定 chunk_size）、df_dict
+    :param data_label: 数据标签，用于DataFrame的列名或字典的键名
+    :param self_close: 是否在遍历结束（或生成器被关闭）后自动关闭连接
+    :return: 生成器
+        - chunk_size=None: 逐行返回元组 / 第一个字段的值（list_1）/ 字典（df_dict）
+        - chunk_size=N: 逐块返回元组列表 / 扁平列表 / DataFrame / 字典列表
+
+    注意：遍历结束前该连接不能执行其他语句；提前 break 时生成器关闭会自动丢弃剩余结果。
+    """
+    if data_label is None :
+        data_label = [ ]
+    if output_format in [ "df" , "df_dict" ] and not data_label :
+        raise ValueError( "当 output_format 为 'df' 或 'df_dict' 时，data_label 参数不能为空!" )
+    if output_format == "df" and chunk_size is None :
+        raise ValueError( "output_format='df' 时必须指定 chunk_size（按块返回 DataFrame）!" )
+    if chunk_size is not None and chunk_size <= 0 :
+        raise ValueError( f"chunk_size 必须为正整数，收到：{chunk_size}" )
+
+    # 生成器首次迭代时才执行语句，此时调用方的 timeout 作用域已结束，需在这里确定超时提示
+    sql = executor._apply_select_timeout( sql )
+    return _iter_fetch( executor , sql , params , chunk_size , output_format , data_label , self_close )
+
+
+def _iter_fetch( executor , sql , params , chunk_size , output_format , data_label , self_close ) :
+    cursor = executor._open_stream_cursor( sql , params )
+    fetch_size = chunk_size or _STREAM_FETCH_SIZE
+    try :
+        while True :
+            try :
+                rows = cursor.fetchmany( fetch_size )
+            except Exception as e :
+                # 读取中途失败无法安全重试（已返回部分结果）
+                executor._handle_connection_error( e , "iter_query" , sql = sql , params = params , retryable = False )
+            if not rows :
+                break
+            formatted = _format_rows( rows , output_format , data_label )
+            if chunk_size is None :
+                yield from formatted
+            else :
+                yield formatted
+    finally :
+        try :
+            # 非缓冲游标关闭时会丢弃尚未读取的结果，保证连接可继续使用
+            cursor.close()
+        except Exception :
+            pass
+        if self_close :
+            executor.close()
@@ -1,5 +1,11 @@
 # SQL工具函数
 import os
+import re
+
+# 只读语句；加锁读取（FOR UPDATE / FOR SHARE / LOCK IN SHARE MODE）不算只读
+_READ_ONLY_SQL = re.compile(r"^\s*(SELECT|SHOW|WITH|EXPLAIN|DESC|DESCRIBE)\b", re.IGNORECASE)
+_LOCKING_READ = re.compile(r"\bFOR\s+(UPDATE|SHARE)\b|\bLOCK\s+IN\s+SHARE\s+MODE\b", re.IGNORECASE)
+
 
 # 载入sql文件
 def load_sql( sql_path ) :
@@ -30,6 +36,12 @@ def resolve_sql(sql):
     return sql
 
 
+# 判断是否为只读（不加锁）语句
+def is_read_only_sql(sql) -> bool:
+    """判断 SQL 是否为只读语句：可以路由到从库执行，也不会被 pipeline() 延迟发送"""
+    return bool(_READ_ONLY_SQL.match(sql)) and not _LOCKING_READ.search(sql)
+
+
 # 构建SQL条件限制语句
 def add_limit( column , value , column_alias = "" , add_and = True , operator = "=" ) : 
     """
@@ -1,5 +1,5 @@
 # 基础设施层：连接管理与重试逻辑。
 # 这些符号仅供包内部使用，不应出现在顶层 lazy_mysql.__all__ 中，
 # 因此本模块不定义 __all__。
-from .connect import connection
+from .connect import connection, connect_db
 from .connection_retry import should_retry_connection_error
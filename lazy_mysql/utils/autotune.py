@@ -0,0 +1,185 @@
+"""insert(..., auto_tune=True)：按每批的耗时与字节数调整批大小（AIMD），并按实测吞吐在 executemany 与 LOAD DATA 之间选择。"""
+
+import json
+import os
+import threading
+
+EXECUTEMANY = "executemany"
+LOAD_DATA = "load_data"
+
+# 各策略的批大小：(最小, 初始, 最大, 每次加性增大的条数)
+STRATEGY_LIMITS = {
+    EXECUTEMANY: (100, 1000, 50000, 1000),
+    LOAD_DATA: (5000, 50000, 500000, 10000),
+}
+# 单批的目标耗时（秒）：低于该值时加性增大批次，超过时减半
+TARGET_BATCH_SECONDS = 1.0
+# 剩余记录少于该条数时不使用 LOAD DATA（临时文件与额外往返的开销大于收益）
+LOAD_DATA_MIN_ROWS = 5000
+# 选定策略后每隔多少批重新试探另一种策略一次，以跟上网络与服务端负载的变化
+EXPLORE_EVERY = 20
+# 吞吐与每行字节数的指数滑动平均系数
+EWMA_ALPHA = 0.3
+
+
+def _ewma(previous, value):
+    return value if previous is None else previous + EWMA_ALPHA * (value - previous)
+
+
+class StrategyStats:
+    """一种写入策略在一张表上的实测数据与当前批大小"""
+
+    def __init__(self, strategy, batch_rows=None, rows_per_sec=None, bytes_per_row=None, batches=0):
+        self.strategy = strategy
+        minimum, initial, maximum, _ = STRATEGY_LIMITS[strategy]
+        self.batch_rows = min(max(int(batch_rows or initial), minimum), maximum)
+        self.rows_per_sec = rows_per_sec
+        self.bytes_per_row = bytes_per_row
+        self.batches = batches
+
+    def record(self, rows, nbytes, elapsed):
+        """
+        记录一批的结果并调整批大小（AIMD）：
+        耗时超过 TARGET_BATCH_SECONDS 或吞吐跌到滑动平均的一半以下时减半，否则加性增大
+        """
+        minimum, _, maximum, step = STRATEGY_LIMITS[self.strategy]
+        rate = rows / max(elapsed, 1e-6)
+        congested = elapsed > TARGET_BATCH_SECONDS or (
+            self.rows_per_sec is not None and rate < self.rows_per_sec / 2
+        )
+        self.rows_per_sec = _ewma(self.rows_per_sec, rate)
+        self.bytes_per_row = _ewma(self.bytes_per_row, nbytes / max(rows, 1))
+        self.batches += 1
+        if congested:
+            self.batch_rows = max(minimum, self.batch_rows // 2)
+        elif rows >= self.batch_rows:
+            # 只有批次被填满时才增大，输入不足一批时不代表更大的批次同样可行
+            self.batch_rows = min(maximum, self.batch_rows + step)
+
+    def penalize(self):
+        """批次执行失败（如数据包过大）时减半"""
+        minimum = STRATEGY_LIMITS[self.strategy][0]
+        self.batch_rows = max(minimum, self.batch_rows // 2)
+
+    def to_dict(self):
+        return {"batch_rows": self.batch_rows, "rows_per_sec": self.rows_per_sec,
+                "bytes_per_row": self.bytes_per_row, "batches": self.batches}
+
+
+class InsertTuner:
+    """一张表的调优状态：各策略的实测数据，以及 LOAD DATA 是否可用"""
+
+    def __init__(self, stats=None, load_data_available=True):
+        stats = stats or {}
+        self.stats = {strategy: StrategyStats(strategy, **stats.get(strategy, {})) for strategy in STRATEGY_LIMITS}
+        self.load_data_available = load_data_available
+        self._since_explore = 0
+        self._lock = threading.Lock()
+
+    def choose(self, remaining=None):
+        """
+        选择下一批的策略：先各试一批，之后使用实测吞吐较高的策略，每 EXPLORE_EVERY 批试探一次另一种
+
+        :param remaining: 剩余记录数，未知时为 None
+        """
+        if not self.load_data_available or (remaining is not None and remaining < LOAD_DATA_MIN_ROWS):
+            return EXECUTEMANY
+        with self._lock:
+            executemany, load_data = self.stats[EXECUTEMANY], self.stats[LOAD_DATA]
+            if executemany.rows_per_sec is None:
+                return EXECUTEMANY
+            if load_data.rows_per_sec is None:
+                return LOAD_DATA
+            best, other = (LOAD_DATA, EXECUTEMANY) if load_data.rows_per_sec >= executemany.rows_per_sec \
+                else (EXECUTEMANY, LOAD_DATA)
+            self._since_explore += 1
+            if self._since_explore >= EXPLORE_EVERY:
+                self._since_explore = 0
+                return other
+            return best
+
+    def batch_rows(self, strategy):
+        return self.stats[strategy].batch_rows
+
+    def record(self, strategy, rows, nbytes, elapsed):
+        with self._lock:
+            self.stats[strategy].record(rows, nbytes, elapsed)
+
+    def penalize(self, strategy):
+        with self._lock:
+            self.stats[strategy].penalize()
+
+    def disable_load_data(self):
+        """服务端或驱动不允许 LOCAL INFILE 时，之后只使用 executemany"""
+        self.load_data_available = False
+
+    def snapshot(self):
+        with self._lock:
+            return {"stats": {strategy: stats.to_dict() for strategy, stats in self.stats.items()},
+                    "load_data_available": self.load_data_available}
+
+
+# 进程内按表保存的调优状态：(数据库, 表名) -> InsertTuner
+_tuners = {}
+_loaded_paths = set()
+_lock = threading.Lock()
+
+
+def _key(database, table_name):
+    return f"{database or ''}.{table_name}"
+
+
+def get_tuner(database, table_name, path=None):
+    """
+    取得一张表的调优状态（进程内共享）；指定 path 时首次使用前从该文件加载之前保存的状态
+    """
+    with _lock:
+        if path is not None and path not in _loaded_paths:
+            _loaded_paths.add(path)
+            _load(path)
+        key = _key(database, table_name)
+        tuner = _tuners.get(key)
+        if tuner is None:
+            tuner = _tuners[key] = InsertTuner()
+        return tuner
+
+
+def _load(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return
+    for key, item in state.items():
+        if key not in _tuners:
+            _tuners[key] = InsertTuner(item.get("stats"), item.get("load_data_available", True))
+
+
+def load_tuning(path):
+    """从文件加载调优状态（不覆盖进程内已有的表）"""
+    with _lock:
+        _loaded_paths.add(path)
+        _load(path)
+
+
+def save_tuning(path):
+    """将进程内的调优状态保存到 JSON 文件（先写临时文件再替换，写入中途失败不会损坏原文件）"""
+    state = tuning_snapshot()
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, path)
+
+
+def tuning_snapshot():
+    """进程内各表的调优状态：{'数据库.表名': {'stats': {...}, 'load_data_available': bool}}"""
+    with _lock:
+        tuners = dict(_tuners)
+    return {key: tuner.snapshot() for key, tuner in tuners.items()}
+
+
+def reset_tuning():
+    """清空进程内的调优状态"""
+    with _lock:
+        _tuners.clear()
+        _loaded_paths.clear()
@@ -0,0 +1,97 @@
+"""按字节切分批量写入：估算参数内联进 SQL 后的大小，使每条语句不超过服务端 max_allowed_packet。"""
+
+from .server_vars import DEFAULT_MAX_ALLOWED_PACKET, max_allowed_packet
+
+# 为协议头等预留的字节数
+PACKET_HEADROOM = 1024
+# 每批最多的记录数：行很窄时避免单条语句过长（解析与锁持有时间随语句长度增长）
+MAX_BATCH_ROWS = 50000
+
+
+def estimate_value_size(value):
+    """参数内联进 SQL 后的最大字节数（字符串按全部需要转义估算）"""
+    if value is None:
+        return 4
+    if isinstance(value, str):
+        return 2 * len(value.encode("utf-8")) + 2
+    if isinstance(value, (bytes, bytearray)):
+        return 2 * len(value) + 3
+    return len(str(value)) + 2
+
+
+def estimate_values_size(values):
+    """一组参数（元组 / 列表 / 字典的值）内联后的字节数"""
+    if isinstance(values, dict):
+        values = values.values()
+    return sum(estimate_value_size(value) for value in values)
+
+
+def statement_budget(executor):
+    """
+    单条语句可用的字节数：执行器当前连接的 max_allowed_packet（按连接缓存，只查询一次）减去预留
+
+    执行器尚未建立连接时先建立连接（lazy_connect），无法读取时按 DEFAULT_MAX_ALLOWED_PACKET 计算
+    """
+    ensure_connection = getattr(executor, "_ensure_connection", None)
+    if getattr(executor, "mydb", None) is None and ensure_connection is not None:
+        ensure_connection()
+    connection = getattr(executor, "mydb", None)
+    packet = DEFAULT_MAX_ALLOWED_PACKET
+    if connection is not None:
+        try:
+            packet = max_allowed_packet(connection)
+        except Exception:
+            pass
+    return max(packet - PACKET_HEADROOM, PACKET_HEADROOM)
+
+
+def byte_batches(items, item_size, budget, base_size=0, max_rows=None):
+    """
+    将 items 按字节切分为批次（惰性读取，同一时间只保留一批）
+
+    :param items: 记录的可迭代对象
+    :param item_size: 估算单条记录在语句中占用字节数的函数
+    :param budget: 单条语句的字节上限
+    :param base_size: 语句固定部分（INSERT INTO ... VALUES 等）的字节数
+    :param max_rows: 每批最多的记录数，默认 MAX_BATCH_ROWS
+    :return: 生成器，每次产出一批记录的列表；单条记录超过上限时单独成批（由服务端报错）
+    """
+    max_rows = max_rows or MAX_BATCH_ROWS
+    batch = []
+    size = base_size
+    for item in items:
+        row_size = item_size(item)
+        if batch and (size + row_size > budget or len(batch) >= max_rows):
+            yield batch
+            batch = []
+            size = base_size
+        batch.append(item)
+        size += row_size
+    if batch:
+        yield batch
+
+
+def execute_batches(executor, sql, values, budget, commit=False, self_close=False):
+    """
+    按字节切分 executemany 的参数列表并依次执行：只有最后一批带 commit / self_close，
+    全部批次在同一事务中提交（与切分前一次性执行的语义一致）
+
+    :param values: 参数元组的列表或迭代器（迭代器按批读取，只多预读一批用于判断是否为最后一批）
+    :return: 批次数
+    """
+    base_size = len(sql.encode("utf-8"))
+    batches = byte_batches(values, insert_row_size, budget, base_size)
+    count = 0
+    batch = next(batches, None)
+    while batch is not None:
+        following = next(batches, None)
+        last = following is None
+        executor.execute(sql, batch, commit and last, self_close and last)
+        count += 1
+        batch = following
+    return count
+
+
+def insert_row_size(row):
+    """多行 VALUES 中一行（参数元组）占用的字节数：参数值、括号与分隔符"""
+    return estimate_values_size(row) + 2 * len(row) + 4
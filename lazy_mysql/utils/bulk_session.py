@@ -0,0 +1,136 @@
+"""批量导入会话：LOAD DATA 期间临时放宽会话级检查，结束后（包括失败时）恢复原值；以及 LOAD DATA 警告的统计。"""
+
+import logging
+import re
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# insert(..., bulk_session=True) 使用的会话变量
+# - unique_checks=0：InnoDB 不逐行校验二级唯一索引（数据须已确认不重复）
+# - foreign_key_checks=0：跳过外键校验
+# - bulk_insert_buffer_size：MyISAM 批量插入缓冲区（InnoDB 表不受影响）
+BULK_LOAD_SESSION_VARS = {
+    "unique_checks": 0,
+    "foreign_key_checks": 0,
+    "bulk_insert_buffer_size": 256 * 1024 * 1024,
+}
+
+# 会话变量已被修改且尚未恢复的连接带有该标记，连接池归还时据此丢弃而不是复用
+SESSION_DIRTY_ATTR = "_lazy_mysql_session_dirty"
+
+# 每次导入最多保留的警告明细条数
+MAX_WARNING_SAMPLES = 20
+
+# 会话变量名直接拼入 SET SESSION / SELECT @@SESSION. 语句，只接受标识符（不带 GLOBAL. / SESSION. 前缀）
+_SESSION_VARIABLE_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _check_names(names):
+    for name in names:
+        if not isinstance(name, str) or not _SESSION_VARIABLE_NAME.match(name):
+            raise ValueError(f"非法的会话变量名：{name!r}")
+
+
+def _set_session(connection, values):
+    _check_names(values)
+    cursor = connection.cursor(buffered=True)
+    try:
+        assignments = ", ".join(f"{name} = %s" for name in values)
+        cursor.execute(f"SET SESSION {assignments}", tuple(values.values()))
+    finally:
+        cursor.close()
+
+
+@contextmanager
+def bulk_load_session(executor, session_vars=None):
+    """
+    在执行器当前连接上临时设置会话变量，退出时恢复原值
+
+    语句失败导致连接被关闭（或重连换成新连接）时，原连接上的修改随连接一起失效；
+    连接池中的连接在恢复前被归还时，连接池会丢弃该连接，修改不会带给下一个使用者。
+
+    :param executor: SQLExecutor 实例
+    :param session_vars: 会话变量，默认 BULK_LOAD_SESSION_VARS；变量名须为标识符，否则抛出 ValueError
+    """
+    session_vars = dict(BULK_LOAD_SESSION_VARS if session_vars is None else session_vars)
+    _check_names(session_vars)
+    executor._ensure_connection()
+    connection = executor.mydb
+
+    cursor = connection.cursor(buffered=True)
+    try:
+        cursor.execute("SELECT " + ", ".join(f"@@SESSION.{name}" for name in session_vars))
+        original = dict(zip(session_vars, cursor.fetchone()))
+    finally:
+        cursor.close()
+
+    try:
+        setattr(connection, SESSION_DIRTY_ATTR, True)
+    except Exception:
+        pass
+    _set_session(connection, session_vars)
+    try:
+        yield original
+    finally:
+        if executor.mydb is connection:
+            try:
+                _set_session(connection, original)
+                setattr(connection, SESSION_DIRTY_ATTR, False)
+            except Exception as e:
+                logger.warning("Failed to restore session variables after bulk load: %s", e)
+
+
+class LoadWarnings:
+    """
+    LOAD DATA 过程中服务端报告的警告（数据截断、类型转换、重复键被忽略等）
+
+    - count：警告总数（取自每批语句的 warning_count，不额外占用往返）
+    - samples：前 MAX_WARNING_SAMPLES 条明细 (级别, 错误码, 消息)
+
+    并行导入（parallelism > 1）时多个工作连接汇总到同一个实例
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.samples = []
+        self._lock = threading.Lock()
+
+    def collect(self, cursor):
+        """记录刚执行完的语句的警告，返回本条语句的警告数"""
+        count = getattr(cursor, "warning_count", 0)
+        if not isinstance(count, int) or count <= 0:
+            return 0
+        details = []
+        if len(self.samples) < MAX_WARNING_SAMPLES:
+            try:
+                details = cursor.fetchwarnings() or []
+            except Exception:
+                details = []
+        with self._lock:
+            self.count += count
+            self.samples.extend(tuple(row) for row in details[:MAX_WARNING_SAMPLES - len(self.samples)])
+        return count
+
+    def __repr__(self):
+        return f"LoadWarnings(count={self.count}, samples={self.samples!r})"
+
+
+@contextmanager
+def capture_warnings(executor):
+    """
+    执行期间让驱动在语句产生警告时立即读取明细（SHOW WARNINGS 在提交之前执行，否则会被 COMMIT 清空），退出时恢复
+    """
+    ensure_connection = getattr(executor, "_ensure_connection", None)
+    if ensure_connection is not None:
+        ensure_connection()
+    connection = getattr(executor, "mydb", None)
+    previous = getattr(connection, "get_warnings", None)
+    if isinstance(previous, bool):
+        connection.get_warnings = True
+    try:
+        yield
+    finally:
+        if isinstance(previous, bool) and executor.mydb is connection:
+            connection.get_warnings = previous
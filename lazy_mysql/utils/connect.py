@@ -4,8 +4,23 @@ from mysql.connector.abstracts import MySQLConnectionAbstract, MySQLCursorAbstra
 from mysql.connector.errors import ConnectionTimeoutError, InterfaceError
 from mysql.connector.pooling import PooledMySQLConnection
 from ..models.mysql_config import MySQLConfig
+from ..retry import CONNECTION, RetryPolicy
+from . import driver as _driver
+
+# 未显式指定重试参数时共用的默认策略
+# 不启用熔断器：该实例被进程内所有主机 / 配置共用，某个不可达的副本连续失败会让健康的主库也无法连接；
+# 需要熔断时由调用方传入自己的 RetryPolicy（熔断状态随该实例共享）
+_DEFAULT_RETRY_POLICY = RetryPolicy(breaker_threshold=None)
+
+_connector_version_checked = False
+
 
 def _check_connector_version():
+    # 版本检查只需在进程内执行一次，避免每次建立连接都重复解析版本号
+    global _connector_version_checked
+    if _connector_version_checked:
+        return
+    _connector_version_checked = True
     try:
         version_tuple = tuple(map(int, mysql.connector.__version__.split('.')[:2]))
         if version_tuple < (9, 4):
@@ -14,9 +29,35 @@ def _check_connector_version():
     except Exception:
         return
 
+def _connect_kwargs(sql_config, database, profile=None):
+    """同步/异步连接共用的连接参数：基础参数、Unix 套接字 / TLS 参数，以及配置档的会话变量与超时"""
+    kwargs = {
+        "host": sql_config.host,
+        "port": sql_config.port,
+        "user": sql_config.user,
+        "password": sql_config.passwd,
+        "database": database,
+    }
+    kwargs.update(sql_config.transport_kwargs())
+    profile = sql_config.get_profile(profile)
+    if profile is not None:
+        kwargs.update(profile.connect_kwargs())
+    return kwargs
+
+def _resolve_retry_policy(retry_policy, max_retries, retry_delay_base):
+    """确定建立连接时使用的重试策略：显式 retry_policy > 旧参数 max_retries/retry_delay_base > 默认策略"""
+    if retry_policy is not None:
+        return retry_policy
+    if max_retries is None and retry_delay_base is None:
+        return _DEFAULT_RETRY_POLICY
+    return RetryPolicy(
+        max_retries=5 if max_retries is None else max_retries,
+        base_delay=_DEFAULT_RETRY_POLICY.base_delay if retry_delay_base is None else retry_delay_base,
+    )
+
 # 获取数据库连接和游标
-def connection(sql_config=None, database=None,dict_cursor=False, max_retries=5,
-    retry_delay_base=5) -> tuple[MySQLConnectionAbstract | PooledMySQLConnection, MySQLCursorAbstract]:
+def connection(sql_config=None, database=None,dict_cursor=False, max_retries=None,
+    retry_delay_base=None, retry_policy=None, profile=None) -> tuple[MySQLConnectionAbstract | PooledMySQLConnection, MySQLCursorAbstract]:
     """
     建立数据库连接并返回连接对象和游标对象
 
@@ -24,25 +65,56 @@ def connection(sql_config=None, database=None,dict_cursor=False, max_retries=5,
         sql_config (object, optional): 数据库配置对象，包含host, port, user, passwd, database等属性。
             传入None时自动从系统环境变量读取配置。
         database (str, optional): 数据库名称，database参数优先使用，默认使用 sql_config.database
+        dict_cursor (bool, optional): 是否使用字典游标
         max_retries (int, optional): 最大重试次数，默认为5次
-        retry_delay_base (int, optional): 重试延迟基数（秒），默认为5秒，第n次重试延迟为 retry_delay_base * n 秒
+        retry_delay_base (float, optional): 重试退避基数（秒），第n次重试最多等待 retry_delay_base * 2^(n-1) 秒（带随机抖动）
+        retry_policy (RetryPolicy, optional): 重试策略，指定后忽略 max_retries / retry_delay_base
+        profile (str | ConnectionProfile, optional): 连接配置档（名称或实例），建立连接时设置其会话变量与超时
     Returns:
         tuple: (数据库连接对象, 游标对象)
     """
+    mydb = connect_db(sql_config, database, max_retries=max_retries, retry_delay_base=retry_delay_base,
+                      retry_policy=retry_policy, profile=profile)
+    mycursor = mydb.cursor(buffered=True,dictionary=dict_cursor)
+    # dictionary = True 查询返回字典列表[{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}]
+    # dictionary = False 查询返回元组列表[(1, 'a'), (2, 'b')]
+    return mydb, mycursor
+
+
+# 建立数据库连接（不创建游标），供 connection() 与连接池共用
+def connect_db(sql_config=None, database=None, max_retries=None,
+    retry_delay_base=None, retry_policy=None, profile=None) -> MySQLConnectionAbstract | PooledMySQLConnection:
+    """
+    建立数据库连接并返回连接对象
+
+    Args:
+        sql_config (object, optional): 数据库配置对象，包含host, port, user, passwd, database等属性。
+            传入None时自动从系统环境变量读取配置。
+        database (str, optional): 数据库名称，database参数优先使用，默认使用 sql_config.database
+        max_retries (int, optional): 最大重试次数，默认为5次
+        retry_delay_base (float, optional): 重试退避基数（秒），第n次重试最多等待 retry_delay_base * 2^(n-1) 秒（带随机抖动）
+        retry_policy (RetryPolicy, optional): 重试策略，指定后忽略 max_retries / retry_delay_base
+        profile (str | ConnectionProfile, optional): 连接配置档（名称或实例），建立连接时设置其会话变量与超时
+    Returns:
+        数据库连接对象
+    """
     sql_config = MySQLConfig.resolve(sql_config)
 
     if database is None:
         database = getattr(sql_config, "database", None)
     
+    policy = _resolve_retry_policy(retry_policy, max_retries, retry_delay_base)
+    # 熔断期间直接失败，避免故障切换时工作线程长时间阻塞在重连上
+    policy.check_circuit()
     retry_count = 0
-    last_exception = None
+    started_at = None
     '''
     mysql.connector.connect 支持的详细连接参数介绍：
         https://dev.mysql.com/doc/connector-python/en/connector-python-connectargs.html
     '''
     _check_connector_version()
 
-    while retry_count <= max_retries:
+    while True:
         try:
             # 新版本使用password参数和推荐参数
             # buffered=True - 缓冲查询结果，避免多次查询时出现'Unread result found'错误
@@ -51,42 +123,78 @@ def connection(sql_config=None, database=None,dict_cursor=False, max_retries=5,
             # pool_name="shop_pool" - 连接池名称，用于标识和管理连接池 
             # 如果设置了 pool_reset_session 就必须设置 pool_name ，省略会报错- AttributeError: 
             # Pool name 'rm-wz93y5afvf5uto.mysql.rds.aliyuncs.com_3306_root_yqq_new_schema' is too long
-            # use_pure=True - 使用纯Python实现而非C扩展，提高兼容性，减少外部依赖（实测，设置在为False会导致连接失败！）
+            # 驱动由 sql_config.driver 决定：默认优先使用 C 扩展（结果集解析更快），
+            # C 扩展不可用或连接失败（部分环境下认证插件无法加载）时使用纯Python实现，详见 utils/driver.py
             # allow_local_infile=True - 启用LOAD DATA LOCAL INFILE功能，允许从本地文件加载数据
-            mydb = mysql.connector.connect(
-                host=sql_config.host,
-                port=sql_config.port,
-                user=sql_config.user,
-                password=sql_config.passwd,
-                database=database,
+            mydb = _driver.connect(
+                getattr(sql_config, "driver", None),
+                **_connect_kwargs(sql_config, database, profile),
                 buffered=True,
-                use_pure=True,
-                allow_local_infile=True  
+                allow_local_infile=True
             )
-            mycursor = mydb.cursor(buffered=True,dictionary=dict_cursor)    
-            # dictionary = True 查询返回字典列表[{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}]  
-            # dictionary = False 查询返回元组列表[(1, 'a'), (2, 'b')]  
-            
-            return mydb, mycursor
+            policy.record_success()
+            return mydb
 
         except TypeError as e:
             # 重新抛出原始的TypeError，保留详细错误信息
             raise TypeError(f"数据库连接参数类型错误: {str(e)}") from e
                 
         except (ConnectionTimeoutError, InterfaceError) as e:
-            last_exception = e
-            if retry_count < max_retries:
-                retry_count += 1
-                delay = retry_delay_base * retry_count
-                print(f"MySQL 连接失败，正在进行第 {retry_count}/{max_retries} 次重试，等待 {delay} 秒...")
-                time.sleep(delay)
-            else:
-                break
+            # 建立连接阶段的 InterfaceError（如 2003 无法连接）均按连接类错误处理
+            retry_count += 1
+            started_at = started_at or time.monotonic()
+            delay = policy.next_delay(e, retry_count, started_at, kind=CONNECTION)
+            if delay is None:
+                # 重试次数用完、超过总时长或已熔断：抛出最后一次的异常
+                raise
+            print(f"MySQL 连接失败，正在进行第 {retry_count}/{policy.max_retries} 次重试，等待 {delay:.2f} 秒...")
+            time.sleep(delay)
 
     # 如果 没有命中重试：
     # Python 中如果一个异常没有被任何 except 子句匹配，它会直接带着原始 traceback 向上传播（报 raise）
 
-    # 如果重试次数用完（ 则必然抛出 last_exception ）仍然失败，抛出最后一次的异常
-    if last_exception is not None:
-        raise last_exception
-    raise Exception("连接失败，已达到最大重试次数")
+
+
+# 建立异步数据库连接（mysql.connector.aio），供 AsyncConnectionPool 使用
+async def connect_db_async(sql_config=None, database=None, max_retries=None, retry_delay_base=None,
+                           retry_policy=None, profile=None):
+    """
+    建立异步数据库连接并返回连接对象，重试规则与 connect_db 一致（等待期间不阻塞事件循环）
+
+    Args:
+        sql_config (object, optional): 数据库配置对象，传入None时自动从系统环境变量读取配置。
+        database (str, optional): 数据库名称，database参数优先使用，默认使用 sql_config.database
+        max_retries (int, optional): 最大重试次数，默认为5次
+        retry_delay_base (float, optional): 重试退避基数（秒），第n次重试最多等待 retry_delay_base * 2^(n-1) 秒（带随机抖动）
+        retry_policy (RetryPolicy, optional): 重试策略，指定后忽略 max_retries / retry_delay_base
+        profile (str | ConnectionProfile, optional): 连接配置档（名称或实例）
+    Returns:
+        异步数据库连接对象
+    """
+    import asyncio
+    from mysql.connector import aio
+
+    sql_config = MySQLConfig.resolve(sql_config)
+    if database is None:
+        database = getattr(sql_config, "database", None)
+    _check_connector_version()
+
+    policy = _resolve_retry_policy(retry_policy, max_retries, retry_delay_base)
+    policy.check_circuit()
+    retry_count = 0
+    started_at = None
+    while True:
+        try:
+            mydb = await aio.connect(**_connect_kwargs(sql_config, database, profile), allow_local_infile=True)
+            policy.record_success()
+            return mydb
+        except TypeError as e:
+            raise TypeError(f"数据库连接参数类型错误: {str(e)}") from e
+        except (ConnectionTimeoutError, InterfaceError) as e:
+            retry_count += 1
+            started_at = started_at or time.monotonic()
+            delay = policy.next_delay(e, retry_count, started_at, kind=CONNECTION)
+            if delay is None:
+                raise
+            print(f"MySQL 连接失败，正在进行第 {retry_count}/{policy.max_retries} 次重试，等待 {delay:.2f} 秒...")
+            await asyncio.sleep(delay)
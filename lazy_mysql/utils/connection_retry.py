@@ -1,21 +1,14 @@
 """MySQL 连接异常的重试判定。"""
 
-# 仅匹配已知的连接中断或超时错误；实际重连次数由调用方控制。
-_RETRYABLE_CONNECTION_ERRORS = (
-    "Lost connection to MySQL server",
-    "The Read Operation timed out",
-    "TimeoutError",
-    "connection timeout",
-)
+from ..retry import CONNECTION, classify_error
 
 
 def should_retry_connection_error(error, retry_count: int) -> bool:
-    """在首次遇到可重试的连接异常时返回 ``True``。"""
+    """
+    在首次遇到可重试的连接异常时返回 ``True``（未配置 RetryPolicy 时执行器使用的默认规则）。
+
+    连接类错误按 errno（2002/2003/2006/2013/2055/4031）判定，无 errno 时按错误信息兜底匹配。
+    """
     if retry_count != 0:
         return False
-
-    error_message = str(error).lower()
-    return any(
-        keyword.lower() in error_message
-        for keyword in _RETRYABLE_CONNECTION_ERRORS
-    )
+    return classify_error(error) == CONNECTION
@@ -0,0 +1,101 @@
+"""数据库驱动后端：mysql-connector 的 C 扩展 / 纯 Python 实现，以及可通过 register_driver 注册的其他驱动适配器。"""
+
+import logging
+import threading
+
+import mysql.connector
+
+from ..retry import CONNECTION, classify_error
+
+logger = logging.getLogger(__name__)
+
+
+class DriverBackend:
+    """
+    驱动适配器接口：connect_db 通过 backend.connect(**kwargs) 建立连接
+
+    kwargs 使用 mysql.connector.connect 的参数名（host / port / user / password / database / buffered /
+    allow_local_infile）。执行器直接使用连接对象的 cursor(buffered=, dictionary=, prepared=)、commit / rollback /
+    ping、connection_id，并按异常的 errno 判断重试，其他驱动的适配器需要返回提供同样接口的连接对象。
+    """
+
+    name = ""
+
+    def available(self) -> bool:
+        """驱动是否已安装、可以使用"""
+        return True
+
+    def connect(self, **kwargs):
+        raise NotImplementedError
+
+
+class MySQLConnectorBackend(DriverBackend):
+    """mysql-connector-python：use_pure=False 时使用 C 扩展（_mysql_connector），协议解析不占用 Python 解释器"""
+
+    def __init__(self, use_pure: bool):
+        self.use_pure = use_pure
+        self.name = "pure" if use_pure else "c"
+
+    def available(self) -> bool:
+        return self.use_pure or bool(getattr(mysql.connector, "HAVE_CEXT", False))
+
+    def connect(self, **kwargs):
+        return mysql.connector.connect(**kwargs, use_pure=self.use_pure)
+
+
+_C = MySQLConnectorBackend(use_pure=False)
+_PURE = MySQLConnectorBackend(use_pure=True)
+_BACKENDS: dict[str, DriverBackend] = {"c": _C, "pure": _PURE}
+
+# auto 模式下 C 扩展建立连接失败、纯 Python 实现成功时置为 True，此后进程内直接使用纯 Python 实现
+_c_ext_broken = False
+_lock = threading.Lock()
+
+
+def register_driver(name: str, backend: DriverBackend):
+    """注册驱动适配器，之后可通过 MySQLConfig(driver=name) 使用"""
+    if name in ("auto", "c", "pure"):
+        raise ValueError(f"驱动名称 {name!r} 为内置名称，不能覆盖")
+    _BACKENDS[name] = backend
+
+
+def get_backend(name: str | None) -> DriverBackend:
+    """
+    按名称取得驱动后端；None / "auto" 时 C 扩展可用（且未在本进程中失败过）则返回 C 扩展，否则返回纯 Python 实现
+
+    :raises ValueError: 未注册的驱动名称，或指定的驱动未安装
+    """
+    if name in (None, "auto"):
+        return _C if _C.available() and not _c_ext_broken else _PURE
+    backend = _BACKENDS.get(name)
+    if backend is None:
+        raise ValueError(f"未知的数据库驱动：{name!r}，可选值：auto / {' / '.join(_BACKENDS)}")
+    if not backend.available():
+        raise ValueError(f"数据库驱动 {name!r} 不可用（未安装或当前平台不支持）")
+    return backend
+
+
+def connect(driver: str | None, **kwargs):
+    """
+    使用指定驱动建立连接
+
+    auto 模式下 C 扩展建立连接失败（非网络类错误，如认证插件无法加载）时改用纯 Python 实现重试一次，
+    纯 Python 实现成功则在本进程内记住该结果，后续连接不再尝试 C 扩展。
+    """
+    global _c_ext_broken
+    backend = get_backend(driver)
+    if backend is not _C or driver == "c":
+        return backend.connect(**kwargs)
+    try:
+        return _C.connect(**kwargs)
+    except Exception as e:
+        if isinstance(e, TypeError) or classify_error(e) == CONNECTION:
+            # 参数错误与网络类错误与驱动实现无关，交由调用方处理（重试）
+            raise
+        c_error = e
+    mydb = _PURE.connect(**kwargs)
+    with _lock:
+        if not _c_ext_broken:
+            _c_ext_broken = True
+            logger.warning("MySQL C extension failed to connect (%s); falling back to the pure Python driver", c_error)
+    return mydb
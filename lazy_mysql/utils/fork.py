@@ -0,0 +1,26 @@
+"""fork 安全：子进程中丢弃从父进程继承的连接。"""
+
+import os
+
+# 无法安全释放的继承连接（如 C 扩展连接）保留引用：被回收时会向服务端发送 COM_QUIT，断开父进程仍在使用的连接
+_ABANDONED = []
+
+
+def abandon_connection(connection):
+    """
+    在 fork 出的子进程中丢弃继承自父进程的连接
+
+    只关闭本进程中的文件描述符：close() 会发送 COM_QUIT、socket.shutdown() 会作用于父子进程共享的套接字，
+    二者都会断开父进程的连接。
+    """
+    mysql_socket = getattr(connection, "_socket", None)
+    sock = getattr(mysql_socket, "sock", None)
+    if sock is None:
+        _ABANDONED.append(connection)
+        return
+    try:
+        os.close(sock.detach())
+    except OSError:
+        pass
+    # 置空后连接器的 close() / 回收时的 shutdown() 不会再访问该套接字
+    mysql_socket.sock = None
@@ -0,0 +1,61 @@
+"""DataFrame 按列转换为数据库参数：按 dtype 为整列选择一种转换方式，缺失值（NaN / NA / NaT）按掩码统一置为 None。"""
+
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from .value_converter import convert_value
+
+# object 列中可直接作为参数、无需逐个转换的类型
+_PLAIN_TYPES = frozenset({str, int, float, bool, bytes, datetime, date, time, Decimal})
+
+# 每次转换的行数：DataFrame 按块转换，同一时间只保留一块的参数元组
+FRAME_CHUNK_ROWS = 50000
+
+
+def column_values(series):
+    """
+    将一列转换为数据库参数列表，结果与逐个调用 prepare_db_value 一致
+
+    - bool / 整数 / 浮点（含可空的 Int64、boolean、Float64）：tolist() 直接得到 Python 标量
+    - datetime64（含带时区）：整列转换为 datetime
+    - 其余（object、字符串、category、timedelta 等）：只对不是普通标量的值（dict / list 等）调用 convert_value
+    """
+    dtype = series.dtype
+    kind = getattr(dtype, "kind", "O")
+    if kind == "M":
+        values = series.dt.to_pydatetime().tolist()
+        plain = True
+    elif kind in "biuf":
+        # numpy dtype 的 tolist() 直接产出 Python 标量；可空扩展类型先转为 object（NA 由掩码处理）
+        values = series.tolist() if type(dtype).__module__.startswith("numpy") else series.astype(object).tolist()
+        plain = True
+    else:
+        values = series.astype(object).tolist()
+        plain = False
+
+    missing = series.isna().to_numpy()
+    if missing.any():
+        for index in missing.nonzero()[0].tolist():
+            values[index] = None
+    if plain:
+        return values
+    return [value if type(value) in _PLAIN_TYPES or value is None else convert_value(value) for value in values]
+
+
+def frame_columns(df):
+    """DataFrame 的列名（字符串）"""
+    return [str(column) for column in df.columns]
+
+
+def frame_values(df, chunk_rows=None):
+    """
+    按块将 DataFrame 转换为参数元组（顺序与 frame_columns 一致）
+
+    :param chunk_rows: 每块的行数，默认 FRAME_CHUNK_ROWS
+    :return: 生成器，逐行产出参数元组
+    """
+    chunk_rows = chunk_rows or FRAME_CHUNK_ROWS
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        columns = [column_values(chunk.iloc[:, position]) for position in range(chunk.shape[1])]
+        yield from zip(*columns)
@@ -0,0 +1,88 @@
+"""executor.gather()：在多个连接上并发执行相互独立的查询，按传入顺序返回结果。"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# 字典形式的查询描述可以指定的方法（只读查询）
+GATHER_METHODS = frozenset({"select", "exists", "query", "fetch_format", "fetch_and_response"})
+# 未指定 max_concurrency 时最多同时使用的连接数
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+def _check_spec(index, spec):
+    """在开始执行前校验查询描述，描述本身有误时直接抛出（不作为单条查询的错误返回）"""
+    if callable(spec):
+        return
+    if not isinstance(spec, dict):
+        raise TypeError(f"gather 第 {index} 项必须是字典或可调用对象，收到：{type(spec).__name__}")
+    method = spec.get("method", "query")
+    if method not in GATHER_METHODS:
+        raise ValueError(f"gather 第 {index} 项的 method 不支持：{method!r}，可选值：{', '.join(sorted(GATHER_METHODS))}")
+    if spec.get("stream"):
+        raise ValueError(f"gather 第 {index} 项：不支持流式读取（stream=True）")
+
+
+def _run_spec(executor, spec):
+    if callable(spec):
+        return spec(executor)
+    kwargs = dict(spec)
+    method = kwargs.pop("method", "query")
+    return getattr(executor, method)(**kwargs)
+
+
+def gather(specs, open_executor, max_concurrency=None, return_exceptions=True):
+    """
+    并发执行多条查询
+
+    :param specs: 查询描述列表；字典的 method 键指定方法（默认 query），其余键作为该方法的关键字参数；
+        可调用对象接收一个执行器并返回结果
+    :param open_executor: 创建工作执行器的函数（应为延迟连接，未分到查询的工作线程不建立连接）
+    :param max_concurrency: 最多同时使用的连接数
+    :param return_exceptions: 为 True 时失败的查询在结果中返回异常对象；为 False 时不再执行剩余查询，抛出第一个错误
+    :return: 按 specs 顺序排列的结果列表
+    """
+    specs = list(specs)
+    for index, spec in enumerate(specs):
+        _check_spec(index, spec)
+    if max_concurrency is not None and max_concurrency <= 0:
+        raise ValueError(f"max_concurrency 必须大于 0，收到：{max_concurrency}")
+    if not specs:
+        return []
+
+    results = [None] * len(specs)
+    errors = {}
+    pending = iter(range(len(specs)))
+    lock = threading.Lock()
+
+    def worker():
+        executor = None
+        try:
+            while True:
+                with lock:
+                    index = None if errors and not return_exceptions else next(pending, None)
+                if index is None:
+                    return
+                if executor is None or (executor.mydb is None and not executor._connect_pending):
+                    # 查询失败时执行器会关闭连接，后续查询换用新的执行器
+                    if executor is not None:
+                        executor.close()
+                    executor = open_executor()
+                try:
+                    results[index] = _run_spec(executor, specs[index])
+                except Exception as e:
+                    with lock:
+                        errors[index] = e
+        finally:
+            if executor is not None:
+                executor.close()
+
+    workers = min(len(specs), max_concurrency or DEFAULT_MAX_CONCURRENCY)
+    with ThreadPoolExecutor(workers, thread_name_prefix="lazy_mysql_gather") as pool:
+        for future in [pool.submit(worker) for _ in range(workers)]:
+            future.result()
+
+    if errors and not return_exceptions:
+        raise errors[min(errors)]
+    for index, error in errors.items():
+        results[index] = error
+    return results
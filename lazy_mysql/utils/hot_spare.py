@@ -0,0 +1,95 @@
+"""热备连接：后台预先建立一条备用连接，连接断开时执行器直接换用，替换连接的建立不占用调用方的时间。"""
+
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class HotSpare:
+    """
+    后台维护的一条备用连接（SQLExecutor(hot_spare=True) 使用）
+
+    - fill()：在后台线程中建立备用连接（已有或正在建立时不重复）
+    - take()：取出备用连接并 ping 确认可用，同时在后台补充下一条；没有可用的备用连接时返回 None
+    """
+
+    def __init__(self, open_connection, close_connection):
+        """
+        :param open_connection: 建立连接的函数，返回 (连接对象, 游标对象)
+        :param close_connection: 关闭（或归还）备用连接的函数，接收连接对象
+        """
+        self._open_connection = open_connection
+        self._close_connection = close_connection
+        self._lock = threading.Lock()
+        self._spare = None
+        self._filling = False
+        self._closed = False
+        self._ready = threading.Event()
+
+    @property
+    def ready(self) -> bool:
+        """是否有已建立的备用连接"""
+        return self._spare is not None
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        """等待备用连接建立完成，返回是否已就绪"""
+        return self._ready.wait(timeout)
+
+    def fill(self):
+        """在后台建立备用连接"""
+        with self._lock:
+            if self._closed or self._spare is not None or self._filling:
+                return
+            self._filling = True
+        threading.Thread(target=self._fill, name="lazy_mysql_hot_spare", daemon=True).start()
+
+    def _fill(self):
+        try:
+            spare = self._open_connection()
+        except Exception as e:
+            # 建立失败时不重试，下次 take() 时再次尝试
+            logger.warning("Failed to open hot spare connection: %s", e)
+            spare = None
+        with self._lock:
+            self._filling = False
+            if not self._closed:
+                self._spare, spare = spare, None
+                if self._spare is not None:
+                    self._ready.set()
+        if spare is not None:
+            # 建立期间执行器已关闭
+            self._discard(spare)
+
+    def take(self):
+        """
+        取出备用连接，并在后台补充下一条
+
+        :return: (连接对象, 游标对象)；没有备用连接或备用连接已失效时返回 None
+        """
+        with self._lock:
+            spare, self._spare = self._spare, None
+            self._ready.clear()
+        if spare is not None:
+            try:
+                # 备用连接同样可能因空闲超时被服务端断开
+                spare[0].ping()
+            except Exception:
+                self._discard(spare)
+                spare = None
+        self.fill()
+        return spare
+
+    def _discard(self, spare):
+        try:
+            self._close_connection(spare[0])
+        except Exception:
+            pass
+
+    def close(self):
+        """关闭备用连接，之后不再补充"""
+        with self._lock:
+            self._closed = True
+            spare, self._spare = self._spare, None
+        if spare is not None:
+            self._discard(spare)
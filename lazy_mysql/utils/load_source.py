@@ -0,0 +1,93 @@
+"""LOAD DATA LOCAL INFILE 的数据源：命名管道（FIFO）由后台线程边序列化边写入，驱动同时读取并发送，数据不落盘。"""
+
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+
+# insert(..., load_source=...) 可选的数据源
+# - file：先写完临时文件再执行 LOAD DATA
+# - fifo：写入命名管道，数据生成与网络发送同时进行（需要 os.mkfifo，即非 Windows 平台）
+LOAD_SOURCES = ("file", "fifo")
+
+
+def fifo_supported():
+    """当前平台是否支持命名管道"""
+    return hasattr(os, "mkfifo")
+
+
+class FifoWriter:
+    """
+    在后台线程中打开 FIFO 的写端并写入数据
+
+    打开写端会阻塞到驱动打开读端（即服务端请求文件内容）为止；驱动每次读取 128KB 发送给服务端，
+    管道缓冲区写满时写线程等待，因此内存中同一时间只有很少的已序列化数据。
+    """
+
+    def __init__(self, path, write):
+        self.path = path
+        self.error = None
+        self._write = write
+        self._thread = threading.Thread(target=self._run, name="lazy-mysql-load-fifo", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            with open(self.path, "w", newline="", encoding="utf-8") as stream:
+                self._write(stream)
+        except BaseException as e:
+            self.error = e
+
+    def wait(self):
+        """等待写入结束；写入过程中的异常（如数据转换失败）在这里重新抛出"""
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def abort(self):
+        """
+        读端没有打开或中途放弃时（语句执行失败）解除写线程的阻塞：
+        打开读端并丢弃剩余数据，读端关闭后写线程因 BrokenPipeError 退出
+        """
+        while self._thread.is_alive():
+            try:
+                fd = os.open(self.path, os.O_RDONLY | os.O_NONBLOCK)
+            except OSError:
+                break
+            try:
+                while self._thread.is_alive():
+                    try:
+                        if os.read(fd, 65536) == b"":
+                            break
+                    except BlockingIOError:
+                        self._thread.join(0.01)
+            finally:
+                os.close(fd)
+            self._thread.join(0.01)
+        self._thread.join()
+
+
+@contextmanager
+def fifo_source(write, temp_dir=None):
+    """
+    创建临时命名管道，后台线程调用 write(stream) 写入文本数据
+
+    命名管道只占用一个目录项，不占用磁盘空间；temp_dir 只需可写（如只读容器中的 tmpfs），
+    使用 allow_local_infile_in_path 时须位于允许的目录之下。
+
+    :param write: 写入函数，参数为以 utf-8 打开的文本流
+    :param temp_dir: 创建命名管道的目录，默认为系统临时目录
+    :return: 上下文管理器，产出 (path, FifoWriter)
+    """
+    directory = tempfile.mkdtemp(prefix="lazy_mysql_", dir=temp_dir)
+    path = os.path.join(directory, "load.tsv")
+    writer = None
+    try:
+        os.mkfifo(path, 0o600)
+        writer = FifoWriter(path, write)
+        yield path, writer
+    finally:
+        if writer is not None:
+            writer.abort()
+        shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,78 @@
+"""insert(..., parallelism=N)：多个连接并行写入批次，每个连接独立提交，汇总写入条数与各工作线程的错误。"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from ..exceptions import ParallelLoadError
+
+
+def check_parallelism(executor, parallelism, commit):
+    """校验并行写入的前提；返回是否需要并行（parallelism > 1）"""
+    if not isinstance(parallelism, int) or parallelism < 1:
+        raise ValueError(f"parallelism 必须是大于 0 的整数，收到：{parallelism!r}")
+    if parallelism == 1:
+        return False
+    if not commit:
+        raise ValueError("parallelism > 1 时各连接独立提交，需要 commit=True")
+    if getattr(executor, "_transaction", None) is not None:
+        raise ValueError("transaction() 中不能使用 parallelism > 1：各连接独立提交，无法纳入同一事务")
+    if getattr(executor, "_worker_executor", None) is None:
+        raise TypeError(f"{type(executor).__name__} 不支持 parallelism > 1")
+    return True
+
+
+def run_parallel(batches, open_executor, load_batch, parallelism, worker_context=None):
+    """
+    N 个工作线程从同一批次迭代器中依次取批写入（同一时间每个线程只持有一批），每批由所在连接提交
+
+    某个工作线程失败后其余线程不再领取新批次（已在写入的批次照常完成），最后抛出 ParallelLoadError
+
+    :param batches: 批次的可迭代对象（列表或惰性生成器）
+    :param open_executor: 创建工作执行器的函数（连接池模式下从同一连接池借出连接）
+    :param load_batch: load_batch(executor, worker_index, batch) 写入一批并提交，返回写入条数
+    :param parallelism: 工作线程（连接）数
+    :param worker_context: 可选，worker_context(executor) 返回在该工作连接上生效的上下文管理器（如批量导入会话）
+    :return: 写入的总条数
+    """
+    batches = iter(batches)
+    lock = threading.Lock()
+    worker_counts = [0] * parallelism
+    errors = {}
+
+    def next_batch():
+        with lock:
+            if errors:
+                return None
+            return next(batches, None)
+
+    def worker(worker_index):
+        executor = None
+        try:
+            batch = next_batch()
+            if batch is None:
+                return
+            executor = open_executor()
+            with worker_context(executor) if worker_context is not None else nullcontext():
+                while batch is not None:
+                    worker_counts[worker_index] += load_batch(executor, worker_index, batch)
+                    batch = next_batch()
+        except Exception as e:
+            with lock:
+                errors[worker_index] = e
+        finally:
+            if executor is not None:
+                executor.close()
+
+    with ThreadPoolExecutor(parallelism, thread_name_prefix="lazy_mysql_load") as pool:
+        for future in [pool.submit(worker, index) for index in range(parallelism)]:
+            future.result()
+
+    inserted = sum(worker_counts)
+    if errors:
+        details = "; ".join(f"worker {index}: {error}" for index, error in sorted(errors.items()))
+        raise ParallelLoadError(
+            f"Parallel load failed on {len(errors)} of {parallelism} workers, {inserted} records committed ({details})",
+            inserted, worker_counts, errors,
+        ) from errors[min(errors)]
+    return inserted
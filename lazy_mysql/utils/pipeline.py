@@ -0,0 +1,186 @@
+"""SQLExecutor.pipeline() 的语句流水线：延迟发送写入语句，按 max_allowed_packet 合并为多语句请求，一次往返执行多条。"""
+
+import re
+
+from ..exceptions import PipelineError
+from .batching import PACKET_HEADROOM, estimate_value_size
+from .server_vars import max_allowed_packet
+
+_NAMED_PARAM = re.compile(r"%\((\w+)\)s")
+
+
+class _QueuedCursor:
+    """语句入队后 executor.mycursor 的占位：CRUD 方法读取 rowcount 时得到 -1（行数要等发送后才知道）"""
+
+    rowcount = -1
+    statement = None
+
+    def close(self):
+        pass
+
+
+_QUEUED_CURSOR = _QueuedCursor()
+
+
+class _Statement:
+    """队列中的一条语句；many=True 时为 executemany 批量参数，单独发送"""
+
+    __slots__ = ("sql", "params", "many", "commit", "size")
+
+    def __init__(self, sql, params, many, commit):
+        if params and not many and isinstance(params, dict):
+            # 命名参数转为位置参数，才能与其他语句的参数拼接
+            names = _NAMED_PARAM.findall(sql)
+            params = tuple(params[name] for name in names)
+            sql = _NAMED_PARAM.sub("%s", sql)
+        self.sql = sql.strip().rstrip(";")
+        self.params = params if many else tuple(params or ())
+        self.many = many
+        self.commit = commit
+        rows = params if many else [self.params]
+        self.size = len(self.sql.encode("utf-8")) + sum(
+            estimate_value_size(value)
+            for row in rows
+            for value in (row.values() if isinstance(row, dict) else row)
+        )
+
+    @property
+    def solo(self):
+        # 批量参数走 executemany；无参数但含字面量 %s 的语句与带参数的语句拼接后会被误当成占位符
+        return self.many or (not self.params and "%s" in self.sql)
+
+
+class Pipeline:
+    """
+    executor.pipeline() 返回的上下文管理器
+
+    with 块内 execute()（及调用它的 insert / upsert / update / batch_update / delete）的写入语句先入队，
+    退出 with 块、调用 flush() 或遇到读取语句时合并为多语句请求发送，每个请求不超过 max_allowed_packet。
+    """
+
+    def __init__(self, executor, max_batch_bytes=None):
+        if max_batch_bytes is not None and max_batch_bytes <= 0:
+            raise ValueError(f"max_batch_bytes 必须大于 0，收到：{max_batch_bytes}")
+        self.executor = executor
+        self.max_batch_bytes = max_batch_bytes
+        # 已发送语句的受影响行数（按入队顺序）与发送请求数
+        self.rowcounts: list[int] = []
+        self.round_trips = 0
+        self.close_on_exit = False
+        self._queue: list[_Statement] = []
+        self._cursor = None
+
+    def __enter__(self):
+        executor = self.executor
+        if executor._pipeline is not None:
+            raise RuntimeError("pipeline() 不支持嵌套使用")
+        executor._ensure_connection()
+        if executor.mydb is None:
+            raise RuntimeError("数据库连接已关闭，无法开启 pipeline")
+        if executor._prepared_cache is not None:
+            # 多语句请求只能走文本协议
+            executor._prepared_cache.discard_unread()
+            executor.mycursor = executor._text_cursor
+        self._cursor = executor.mycursor
+        executor._pipeline = self
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        executor = self.executor
+        try:
+            if exc_type is None:
+                self.flush()
+            else:
+                # with 块内发生异常：尚未发送的语句直接丢弃
+                self.discard()
+        finally:
+            executor._pipeline = None
+            if executor.mycursor is _QUEUED_CURSOR:
+                executor.mycursor = self._cursor
+            if self.close_on_exit:
+                executor.close()
+        return False
+
+    def add(self, sql, params, many, commit=False):
+        """将语句加入队列（由 execute() 调用，params 为 prepare_params 规范化后的参数）"""
+        self._queue.append(_Statement(sql, params, many, commit))
+        self.executor.mycursor = _QUEUED_CURSOR
+
+    def discard(self):
+        """丢弃尚未发送的语句（如 transaction() 回滚时，其中入队的语句不再发送）"""
+        self._queue.clear()
+        if self.executor.mycursor is _QUEUED_CURSOR:
+            self.executor.mycursor = self._cursor
+
+    def flush(self) -> list[int]:
+        """
+        发送队列中的语句；有语句传入 commit=True 且不在 transaction() 内时，全部发送后提交一次
+
+        :return: 本次发送的各语句受影响行数（按入队顺序）
+        :raises PipelineError: 某条语句执行失败，index / sql 指向出错的语句，其后的语句不会执行
+        """
+        executor = self.executor
+        executor.mycursor = self._cursor
+        queue, self._queue = self._queue, []
+        if not queue:
+            return []
+        start = len(self.rowcounts)
+        commit = any(stmt.commit for stmt in queue)
+        try:
+            for batch in self._batches(queue):
+                self._send(batch)
+                if executor._transaction is not None:
+                    for _ in batch:
+                        executor._transaction.statement_executed()
+            if commit and executor._transaction is None:
+                executor.mydb.commit()
+        except Exception as e:
+            index = len(self.rowcounts)
+            failed = queue[index - start] if index - start < len(queue) else None
+            if failed is not None:
+                executor._log_failed_statement(failed.sql, failed.params)
+            if executor._transaction is None:
+                # 与 execute() 一致：回滚未提交的语句，连接在退出 pipeline 时关闭（transaction() 内由事务回滚）
+                executor._rollback_if_needed(commit)
+                self.close_on_exit = True
+            if failed is None:
+                raise PipelineError(f"SQL pipeline commit failed: {e}", index, None, self.rowcounts[:]) from e
+            raise PipelineError(
+                f"SQL pipeline failed at statement #{index}: {e}", index, failed.sql, self.rowcounts[:]
+            ) from e
+        return self.rowcounts[start:]
+
+    def _batches(self, queue):
+        """按字节上限把队列切分为多个请求"""
+        limit = self.max_batch_bytes or max_allowed_packet(self.executor.mydb) - PACKET_HEADROOM
+        batch, size = [], 0
+        for stmt in queue:
+            if stmt.solo or (batch and size + stmt.size > limit):
+                if batch:
+                    yield batch
+                batch, size = [], 0
+            if stmt.solo:
+                yield [stmt]
+                continue
+            batch.append(stmt)
+            size += stmt.size + 2
+        if batch:
+            yield batch
+
+    def _send(self, batch):
+        cursor = self._cursor
+        self.round_trips += 1
+        if batch[0].many:
+            cursor.executemany(batch[0].sql, batch[0].params)
+            self.rowcounts.append(cursor.rowcount)
+            return
+        sql = ";\n".join(stmt.sql for stmt in batch)
+        params = tuple(value for stmt in batch for value in stmt.params)
+        if params:
+            cursor.execute(sql, params)
+        else:
+            cursor.execute(sql)
+        self.rowcounts.append(cursor.rowcount)
+        # 后续语句的结果（及错误）在读取下一个结果集时返回
+        while cursor.nextset():
+            self.rowcounts.append(cursor.rowcount)
@@ -0,0 +1,134 @@
+"""服务端预处理语句（prepared statement）的按连接 LRU 缓存。"""
+
+from collections import OrderedDict
+
+from mysql.connector import errors
+
+from .server_vars import server_variable
+
+# 服务端预处理语句总数超过 max_prepared_stmt_count 时的错误码
+ER_MAX_PREPARED_STMT_COUNT_REACHED = 1461
+
+# 缓存挂在连接对象上，连接池中的连接被再次借出时可直接复用已预处理的语句
+_CACHE_ATTR = "_lazy_mysql_prepared_cache"
+
+
+class PreparedStatementCache:
+    """
+    单个连接上的预处理语句 LRU 缓存
+
+    - 以 SQL 文本为键，每条 SQL 对应一个 prepared 游标（一个服务端语句句柄），走二进制协议
+    - 容量取 max_size 与服务端 max_prepared_stmt_count 的较小值，超出时关闭最久未使用的语句
+    - 服务端返回 1461（预处理语句数达到全局上限）时淘汰本地最旧语句后重试，缓存为空则返回 None 由调用方回退为文本协议
+    """
+
+    def __init__(self, connection, max_size=256):
+        self.connection = connection
+        self.max_size = min(max_size, _server_prepared_limit(connection, max_size))
+        self._statements: OrderedDict[tuple[str, bool], tuple[str, object]] = OrderedDict()
+        self._active = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def for_connection(cls, connection, max_size=256):
+        """获取连接上已有的缓存，不存在时创建并挂到连接对象上"""
+        cache = getattr(connection, _CACHE_ATTR, None)
+        if cache is None:
+            cache = cls(connection, max_size)
+            setattr(connection, _CACHE_ATTR, cache)
+        return cache
+
+    def execute(self, sql, params, dictionary=False):
+        """
+        使用缓存的预处理语句执行 SQL
+
+        :param sql: 使用 %s 占位符的 SQL
+        :param params: 元组参数
+        :param dictionary: 是否返回字典行
+        :return: 执行后的 prepared 游标；无法预处理（语句数达到服务端上限）时返回 None
+        """
+        self.discard_unread()
+        if self.max_size <= 0:
+            # 服务端禁用了预处理语句（max_prepared_stmt_count=0）
+            return None
+        key = (sql, dictionary)
+        entry = self._statements.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._statements.move_to_end(key)
+            # 连接器按对象身份判断是否需要重新预处理，必须传入首次执行时的同一个字符串对象
+            sql, cursor = entry
+        else:
+            self.misses += 1
+            while len(self._statements) >= self.max_size:
+                self._evict_oldest()
+            cursor = self.connection.cursor(buffered=False, prepared=True, dictionary=dictionary)
+            self._statements[key] = (sql, cursor)
+
+        while True:
+            try:
+                cursor.execute(sql, params)
+                break
+            except errors.Error as e:
+                if getattr(e, "errno", None) != ER_MAX_PREPARED_STMT_COUNT_REACHED:
+                    raise
+                # 其他连接占满了服务端的全局配额：收缩本连接的缓存后重试
+                self._statements.pop(key, None)
+                if not self._statements:
+                    _close_quietly(cursor)
+                    return None
+                self.max_size = max(1, len(self._statements))
+                self._evict_oldest()
+                self._statements[key] = (sql, cursor)
+        self._active = cursor
+        return cursor
+
+    def discard_unread(self):
+        """丢弃上一条预处理查询未读完的结果（prepared 游标为非缓冲游标），保证连接可继续执行语句"""
+        cursor, self._active = self._active, None
+        if cursor is not None and getattr(self.connection, "unread_result", False):
+            try:
+                cursor.fetchall()
+            except Exception:
+                pass
+
+    def _evict_oldest(self):
+        _, (_, cursor) = self._statements.popitem(last=False)
+        self.evictions += 1
+        # 关闭游标会向服务端发送 COM_STMT_CLOSE 释放语句句柄
+        _close_quietly(cursor)
+
+    @property
+    def stats(self) -> dict:
+        """缓存命中情况：hits / misses / evictions / size / max_size"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._statements),
+            "max_size": self.max_size,
+        }
+
+    def clear(self):
+        """关闭所有缓存的预处理语句"""
+        self.discard_unread()
+        while self._statements:
+            self._evict_oldest()
+
+
+def _close_quietly(cursor):
+    try:
+        cursor.close()
+    except Exception:
+        pass
+
+
+
+def _server_prepared_limit(connection, default):
+    """读取服务端 max_prepared_stmt_count，失败时返回 default"""
+    try:
+        return int(server_variable(connection, "GLOBAL.max_prepared_stmt_count", default))
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,59 @@
+"""按连接缓存的服务端系统变量（max_allowed_packet 等），供需要按服务端限制切分请求的逻辑共用。"""
+
+import re
+
+# 缓存挂在连接对象上，连接池中的连接被再次借出时无需重新查询
+_VARS_ATTR = "_lazy_mysql_server_vars"
+
+_VARIABLE_NAME = re.compile(r"^(GLOBAL\.|SESSION\.)?[A-Za-z_][A-Za-z0-9_]*$")
+
+# 服务端 max_allowed_packet 的默认值（MySQL 8.0 为 64MB，这里取 5.7 的 4MB 作为保守值）
+DEFAULT_MAX_ALLOWED_PACKET = 4 * 1024 * 1024
+
+
+def server_variable(connection, name, default=None):
+    """
+    读取服务端系统变量 @@name，结果按连接缓存，查询失败时返回 default（不缓存）
+
+    :param connection: 数据库连接对象
+    :param name: 变量名，可带 GLOBAL. / SESSION. 前缀，如 'GLOBAL.max_prepared_stmt_count'
+    :param default: 查询失败或变量为 NULL 时的返回值
+    """
+    if not _VARIABLE_NAME.match(name):
+        raise ValueError(f"非法的系统变量名：{name!r}")
+    cache = getattr(connection, _VARS_ATTR, None)
+    if cache is None:
+        cache = {}
+        try:
+            setattr(connection, _VARS_ATTR, cache)
+        except Exception:
+            pass
+    if name in cache:
+        return cache[name]
+
+    cursor = None
+    try:
+        cursor = connection.cursor(buffered=True)
+        cursor.execute(f"SELECT @@{name}")
+        row = cursor.fetchone()
+    except Exception:
+        return default
+    finally:
+        if cursor is not None:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+    value = row[0] if row else None
+    if value is None:
+        return default
+    cache[name] = value
+    return value
+
+
+def max_allowed_packet(connection) -> int:
+    """服务端单个数据包（即单次发送的 SQL）的最大字节数"""
+    try:
+        return int(server_variable(connection, "max_allowed_packet", DEFAULT_MAX_ALLOWED_PACKET))
+    except (TypeError, ValueError):
+        return DEFAULT_MAX_ALLOWED_PACKET
@@ -0,0 +1,149 @@
+"""语句超时：SELECT 使用 MAX_EXECUTION_TIME 优化器提示，其他语句使用旁路连接 KILL QUERY 的看门狗（同步 / 异步）。"""
+
+import asyncio
+import logging
+import re
+import threading
+
+from .connect import connect_db, connect_db_async
+
+# 超过 MAX_EXECUTION_TIME 被服务端中断（3024）；被 KILL QUERY 中断（1317）
+ER_QUERY_TIMEOUT = 3024
+ER_QUERY_INTERRUPTED = 1317
+
+# 异步看门狗发出 KILL QUERY 后等待语句返回的最长时间（秒）；仍未返回时放弃等待，连接状态不确定
+KILL_GRACE_SECONDS = 5.0
+
+_SELECT_HEAD = re.compile(r"^(\s*SELECT\b)(\s*/\*\+)?", re.IGNORECASE)
+_HAS_MAX_EXECUTION_TIME = re.compile(r"MAX_EXECUTION_TIME\s*\(", re.IGNORECASE)
+
+logger = logging.getLogger(__name__)
+
+
+def with_max_execution_time(sql, timeout):
+    """
+    为 SELECT 语句加上 /*+ MAX_EXECUTION_TIME(毫秒) */ 提示，由服务端在超时后中断查询
+
+    已有优化器提示时合并到同一个提示块；已指定 MAX_EXECUTION_TIME 时保持不变。
+
+    :return: 改写后的 SQL；不以 SELECT 开头的语句返回 None（需使用看门狗）
+    """
+    match = _SELECT_HEAD.match(sql)
+    if match is None:
+        return None
+    if _HAS_MAX_EXECUTION_TIME.search(sql):
+        return sql
+    hint = f"MAX_EXECUTION_TIME({max(1, int(timeout * 1000))})"
+    if match.group(2):
+        return f"{sql[:match.end()]} {hint}{sql[match.end():]}"
+    return f"{match.group(1)} /*+ {hint} */{sql[match.end(1):]}"
+
+
+class KillQueryWatchdog:
+    """
+    语句看门狗：超时后通过一条旁路连接对执行语句的连接发送 KILL QUERY
+
+    KILL QUERY 只中断当前语句，连接保持可用。退出 with 块时如果 KILL 正在发送，会等待其完成，
+    避免 KILL 落到同一连接的下一条语句上。
+    """
+
+    def __init__(self, executor, timeout):
+        self.executor = executor
+        self.timeout = timeout
+        self.fired = False
+        self._connection_id = getattr(executor.mydb, "connection_id", None)
+        self._lock = threading.Lock()
+        self._done = False
+        self._timer = threading.Timer(timeout, self._kill)
+        self._timer.daemon = True
+
+    def __enter__(self):
+        if self._connection_id is not None:
+            self._timer.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._timer.cancel()
+        with self._lock:
+            self._done = True
+        return False
+
+    def _kill(self):
+        with self._lock:
+            if self._done:
+                return
+            self.fired = True
+            side = None
+            try:
+                side = connect_db(self.executor.sql_config, self.executor.database, max_retries=1)
+                cursor = side.cursor()
+                cursor.execute(f"KILL QUERY {int(self._connection_id)}")
+                cursor.close()
+            except Exception as e:
+                logger.warning("KILL QUERY %s failed after %.3fs timeout: %s", self._connection_id, self.timeout, e)
+            finally:
+                if side is not None:
+                    try:
+                        side.close()
+                    except Exception:
+                        pass
+
+
+class AsyncKillQueryWatchdog:
+    """
+    异步语句看门狗：asyncio.wait_for 等待语句 timeout 秒，超时后通过旁路异步连接发送 KILL QUERY，
+    再等待语句以 1317 中断返回（连接保持可用）
+
+    KILL 之后 KILL_GRACE_SECONDS 秒内语句仍未返回（如 KILL 无法送达）时取消语句并抛出 asyncio.TimeoutError，
+    此时 abandoned 为 True，连接的协议状态不确定，调用方需丢弃该连接。
+    """
+
+    def __init__(self, connection, sql_config, database, timeout):
+        self.sql_config = sql_config
+        self.database = database
+        self.timeout = timeout
+        self.fired = False
+        self.abandoned = False
+        self._connection_id = getattr(connection, "connection_id", None)
+
+    async def run(self, statement):
+        """执行协程 statement 并返回其结果"""
+        task = asyncio.ensure_future(statement)
+        try:
+            # shield：超时后不取消语句，等 KILL QUERY 让服务端中断它，避免连接停在读取结果的中途
+            return await asyncio.wait_for(asyncio.shield(task), self.timeout)
+        except asyncio.TimeoutError:
+            if task.done():
+                return task.result()
+        self.fired = True
+        if self._connection_id is not None:
+            await self._kill()
+        try:
+            return await asyncio.wait_for(task, KILL_GRACE_SECONDS)
+        except asyncio.TimeoutError:
+            self.abandoned = True
+            raise
+
+    async def _kill(self):
+        side = None
+        try:
+            side = await connect_db_async(self.sql_config, self.database, max_retries=1)
+            cursor = await side.cursor()
+            await cursor.execute(f"KILL QUERY {int(self._connection_id)}")
+            await cursor.close()
+        except Exception as e:
+            logger.warning("KILL QUERY %s failed after %.3fs timeout: %s", self._connection_id, self.timeout, e)
+        finally:
+            if side is not None:
+                try:
+                    await side.close()
+                except Exception:
+                    pass
+
+
+def is_timeout_error(error, watchdog=None):
+    """判断语句失败是否由超时导致（MAX_EXECUTION_TIME 中断，或看门狗发出 KILL QUERY 后的中断）"""
+    errno = getattr(error, "errno", None)
+    if errno == ER_QUERY_TIMEOUT:
+        return True
+    return watchdog is not None and watchdog.fired and errno == ER_QUERY_INTERRUPTED
@@ -0,0 +1,145 @@
+"""SQLExecutor.transaction() 的事务作用域：统一提交、嵌套保存点与分组提交（group commit）。"""
+
+import time
+
+
+def _flush_pipeline(executor):
+    """pipeline() 内：发送已入队的语句，使其落在当前事务 / 保存点的边界之内"""
+    if executor._pipeline is not None:
+        executor._pipeline.flush()
+
+
+def _discard_pipeline(executor):
+    """pipeline() 内：回滚时丢弃尚未发送的语句，不在回滚之后再发送"""
+    if executor._pipeline is not None:
+        executor._pipeline.discard()
+
+
+class _TransactionState:
+    """最外层 transaction() 的状态，挂在 executor._transaction 上，嵌套作用域共用"""
+
+    def __init__(self, executor, group_commit_size=None, group_commit_interval_ms=None):
+        self.executor = executor
+        self.group_commit_size = group_commit_size
+        self.group_commit_interval = None if group_commit_interval_ms is None else group_commit_interval_ms / 1000
+        self.savepoints: list[str] = []
+        self.pending = 0
+        self.flushes = 0
+        self.last_flush = time.monotonic()
+        self.close_on_exit = False
+
+    @property
+    def group_commit(self):
+        return self.group_commit_size is not None or self.group_commit_interval is not None
+
+    def statement_executed(self):
+        """每条语句执行成功后调用；分组提交模式下达到条数或时间阈值时提交"""
+        self.pending += 1
+        if not self.group_commit:
+            return
+        due = (
+            (self.group_commit_size is not None and self.pending >= self.group_commit_size)
+            or (self.group_commit_interval is not None
+                and time.monotonic() - self.last_flush >= self.group_commit_interval)
+        )
+        if due:
+            self.flush()
+
+    def flush(self):
+        """提交已执行的语句；存在保存点时推迟到保存点释放后（COMMIT 会释放所有保存点）"""
+        if self.savepoints or self.pending == 0:
+            return
+        self.executor.mydb.commit()
+        self.pending = 0
+        self.flushes += 1
+        self.last_flush = time.monotonic()
+
+
+class Transaction:
+    """
+    executor.transaction() 返回的上下文管理器
+
+    - 最外层：退出时提交一次，异常时回滚
+    - 嵌套：使用 SAVEPOINT，异常时回滚到保存点（外层事务继续），正常退出时释放保存点
+    - pipeline() 内：进入时先发送已入队的语句；提交或释放保存点前发送事务内入队的语句，回滚时丢弃
+    """
+
+    def __init__(self, executor, group_commit_size=None, group_commit_interval_ms=None):
+        if group_commit_size is not None and group_commit_size <= 0:
+            raise ValueError(f"group_commit_size 必须为正整数，收到：{group_commit_size}")
+        if group_commit_interval_ms is not None and group_commit_interval_ms <= 0:
+            raise ValueError(f"group_commit_interval_ms 必须大于 0，收到：{group_commit_interval_ms}")
+        self.executor = executor
+        self.group_commit_size = group_commit_size
+        self.group_commit_interval_ms = group_commit_interval_ms
+        self._savepoint = None
+
+    def __enter__(self):
+        executor = self.executor
+        state = executor._transaction
+        if state is None:
+            executor._ensure_connection()
+            if executor.mydb is None:
+                raise RuntimeError("数据库连接已关闭，无法开启事务")
+            # 事务开始前入队的语句不属于本事务（其中 commit=True 的由 pipeline 在发送后提交）
+            _flush_pipeline(executor)
+            executor._transaction = _TransactionState(
+                executor, self.group_commit_size, self.group_commit_interval_ms
+            )
+            return executor
+
+        if self.group_commit_size is not None or self.group_commit_interval_ms is not None:
+            raise ValueError("分组提交参数只能在最外层 transaction() 中指定")
+        self._savepoint = f"lazy_mysql_sp_{len(state.savepoints) + 1}"
+        # 先登记保存点再执行，避免 SAVEPOINT 语句本身触发分组提交
+        state.savepoints.append(self._savepoint)
+        try:
+            executor.execute(f"SAVEPOINT {self._savepoint}")
+            _flush_pipeline(executor)
+        except Exception:
+            state.savepoints.pop()
+            raise
+        return executor
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        executor = self.executor
+        state = executor._transaction
+        if self._savepoint is not None:
+            self._exit_savepoint(state, exc_type is not None)
+            return False
+
+        try:
+            if exc_type is not None:
+                _discard_pipeline(executor)
+                executor._transaction = None
+                executor._rollback_if_needed(True)
+            else:
+                # 仍在事务内发送：发送失败不会单独提交或关闭连接，由下面统一回滚
+                _flush_pipeline(executor)
+                executor._transaction = None
+                if executor.mydb is not None:
+                    # 不走 executor.commit() 的重连重试：重连后的新连接上提交不会包含本事务的语句
+                    executor.mydb.commit()
+        except Exception:
+            executor._transaction = None
+            executor._rollback_if_needed(True)
+            raise
+        finally:
+            if state.close_on_exit:
+                executor.close()
+        return False
+
+    def _exit_savepoint(self, state, failed):
+        executor = self.executor
+        try:
+            if failed:
+                _discard_pipeline(executor)
+                executor.execute(f"ROLLBACK TO SAVEPOINT {self._savepoint}")
+            executor.execute(f"RELEASE SAVEPOINT {self._savepoint}")
+            _flush_pipeline(executor)
+        except Exception:
+            if not failed:
+                raise
+            # 回滚到保存点失败（如连接已断开）时抛出原始异常，由外层事务回滚
+        finally:
+            state.savepoints.pop()
@@ -1,30 +1,37 @@
 import json
 import math
+import sys
 from datetime import date, datetime, time
 from decimal import Decimal
+from itertools import islice
+from operator import itemgetter
 
-import pandas as pd
+
+def _pandas():
+    # 不主动导入 pandas：调用方未导入 pandas 时，值不可能是 pandas 对象
+    return sys.modules.get('pandas')
 
 
 def _is_missing_value(value):
-    return (
-        value is None
-        or value is pd.NA
-        or value is pd.NaT
-        or (isinstance(value, float) and math.isnan(value))
-    )
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return True
+    pd = _pandas()
+    return pd is not None and (value is pd.NA or value is pd.NaT)
 
 
 def _is_numpy_value(value):
     return type(value).__module__.split('.')[0] == 'numpy'
 
 
+def _is_pandas_value(value):
+    return type(value).__module__.split('.')[0] == 'pandas'
+
+
 def _is_pandas_list_like(value):
-    return (
-        type(value).__module__.split('.')[0] == 'pandas'
-        and hasattr(value, 'tolist')
-        and not isinstance(value, (pd.Timestamp, pd.Timedelta))
-    )
+    if not (_is_pandas_value(value) and hasattr(value, 'tolist')):
+        return False
+    pd = _pandas()
+    return not isinstance(value, (pd.Timestamp, pd.Timedelta))
 
 
 def _normalize_json_value(value):
@@ -40,11 +47,12 @@ def _normalize_json_value(value):
         if hasattr(value, 'tolist'):
             return _normalize_json_value(value.tolist())
 
-    if isinstance(value, pd.Timestamp):
-        return value.isoformat(sep=' ')
-
-    if isinstance(value, pd.Timedelta):
-        return str(value)
+    if _is_pandas_value(value):
+        pd = _pandas()
+        if isinstance(value, pd.Timestamp):
+            return value.isoformat(sep=' ')
+        if isinstance(value, pd.Timedelta):
+            return str(value)
 
     if isinstance(value, datetime):
         return value.isoformat(sep=' ')
@@ -84,11 +92,12 @@ def prepare_db_value(value):
         if hasattr(value, 'tolist'):
             return prepare_db_value(value.tolist())
 
-    if isinstance(value, pd.Timestamp):
-        return value.to_pydatetime()
-
-    if isinstance(value, pd.Timedelta):
-        return str(value)
+    if _is_pandas_value(value):
+        pd = _pandas()
+        if isinstance(value, pd.Timestamp):
+            return value.to_pydatetime()
+        if isinstance(value, pd.Timedelta):
+            return str(value)
 
     if _is_pandas_list_like(value):
         return json.dumps(_normalize_json_value(value.tolist()), ensure_ascii=False)
@@ -111,4 +120,129 @@ def prepare_db_value(value):
 
 
 def prepare_db_row(row):
-    return {field: prepare_db_value(value) for field, value in row.items()}
+    return {field: convert_value(value) for field, value in row.items()}
+
+
+# ---- 按类型分派的转换（与 prepare_db_value 结果一致，但每种类型只判断一次） ----
+
+# 无需转换、原样作为参数的类型（按精确类型判断，子类仍按 prepare_db_value 的规则处理）
+_IDENTITY_TYPES = frozenset({str, int, bool, type(None), bytes, datetime, date, time, Decimal})
+
+# 转换器抽样的记录数：每批按前若干条记录的列类型生成专用的转换函数
+CONVERTER_SAMPLE_ROWS = 100
+
+# 类型 -> 转换函数
+_TYPE_CONVERTERS = {}
+
+
+def _identity(value):
+    return value
+
+
+def _convert_float(value):
+    return None if math.isnan(value) else value
+
+
+# JSON 中无需规范化的值类型
+_JSON_PLAIN_TYPES = frozenset({str, int, bool, type(None)})
+
+
+def _normalize_json_fast(value):
+    """_normalize_json_value 的快速路径：常见的 JSON 原生类型直接返回，其余交给 _normalize_json_value"""
+    value_type = type(value)
+    if value_type in _JSON_PLAIN_TYPES:
+        return value
+    if value_type is float:
+        return None if math.isnan(value) else value
+    if value_type is dict:
+        return {key: _normalize_json_fast(item) for key, item in value.items()}
+    if value_type is list or value_type is tuple:
+        return [_normalize_json_fast(item) for item in value]
+    return _normalize_json_value(value)
+
+
+def _convert_json_object(value):
+    return json.dumps(_normalize_json_fast(value), ensure_ascii=False, sort_keys=False)
+
+
+def _convert_json_array(value):
+    return json.dumps(_normalize_json_fast(value), ensure_ascii=False)
+
+
+def _converter_for_type(value_type):
+    """为一种类型选择转换函数，规则与 prepare_db_value 相同"""
+    if value_type in _IDENTITY_TYPES:
+        return _identity
+    if value_type.__module__.split('.')[0] in ('numpy', 'pandas'):
+        return prepare_db_value
+    if issubclass(value_type, float):
+        return _convert_float
+    if issubclass(value_type, dict):
+        return _convert_json_object
+    if issubclass(value_type, (list, tuple, set)):
+        return _convert_json_array
+    if issubclass(value_type, (bytearray, memoryview)):
+        return bytes
+    return _identity
+
+
+def convert_value(value):
+    """prepare_db_value 的按类型缓存版本：每种类型只判断一次如何转换"""
+    value_type = type(value)
+    if value_type in _IDENTITY_TYPES:
+        return value
+    converter = _TYPE_CONVERTERS.get(value_type)
+    if converter is None:
+        converter = _TYPE_CONVERTERS[value_type] = _converter_for_type(value_type)
+    return converter(value)
+
+
+def column_converter(sample_values):
+    """
+    按一列的抽样值生成该列专用的转换函数
+
+    抽样只出现一种需要转换的类型时直接调用该类型的转换函数；抽样之外出现的其他类型回退到 convert_value，
+    因此抽样不完整只影响速度，不影响结果
+    """
+    types = {type(value) for value in sample_values} - _IDENTITY_TYPES
+    if not types:
+        return convert_value
+    if len(types) == 1:
+        expected = types.pop()
+        converter = _converter_for_type(expected)
+
+        def convert(value):
+            return converter(value) if type(value) is expected else convert_value(value)
+        return convert
+    return convert_value
+
+
+def row_converter(field_names, sample_rows):
+    """
+    为一批字典记录生成转换函数：row -> 参数元组（顺序与 field_names 一致），结果与逐个调用 prepare_db_value 相同
+
+    整行都是 str / int / None 等无需转换的值时直接返回取出的元组；否则按列使用 column_converter 生成的函数
+
+    :param field_names: 字段名列表
+    :param sample_rows: 用于抽样列类型的记录（通常取批次的前 CONVERTER_SAMPLE_ROWS 条）
+    """
+    field_names = list(field_names)
+    sample_rows = list(islice(sample_rows, CONVERTER_SAMPLE_ROWS))
+    converters = [
+        column_converter([row[field] for row in sample_rows if field in row]) for field in field_names
+    ]
+    if len(field_names) == 1:
+        field = field_names[0]
+
+        def getter(row):
+            return (row[field],)
+    else:
+        getter = itemgetter(*field_names)
+    identity_types = _IDENTITY_TYPES
+
+    def convert_row(row):
+        values = getter(row)
+        if identity_types.issuperset(map(type, values)):
+            return values
+        return tuple([convert(value) for convert, value in zip(converters, values)])
+    return convert_row
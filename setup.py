@@ -18,6 +18,10 @@ setup(
     version=f'v{__version__}',
     packages=find_packages(),
     install_requires=requirements,
+    # pandas 为可选依赖：仅 output_format="df" 需要，pip install "lazy_mysql[pandas]"
+    extras_require={
+        'pandas': ['pandas>=2.3.1'],
+    },
     author='tinycen',
     author_email='sky_ruocen@qq.com',
     description='A lazy MySQL client for Python that simplifies database operations with intuitive methods for CRUD operations, automatic connection management, and result formatting. Features include easy-to-use SELECT, INSERT, UPDATE, DELETE operations with pandas DataFrame support, where clause builders, and table export capabilities.',
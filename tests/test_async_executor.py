@@ -0,0 +1,244 @@
+import asyncio
+
+import pytest
+from mysql.connector import errors as mysql_errors
+
+from lazy_mysql import AsyncSQLExecutor, PoolTimeoutError, QueryTimeoutError
+
+
+class FakeAsyncCursor:
+    def __init__(self, connection, dictionary=False):
+        self.connection = connection
+        self.dictionary = dictionary
+        self.rows = []
+        self.rowcount = -1
+
+    async def execute(self, sql, params=None):
+        self.connection.executed.append(("execute", sql, params))
+        if self.connection.fail_next:
+            self.connection.fail_next = False
+            raise ConnectionError("Lost connection to MySQL server during query")
+        self.connection.in_transaction = True
+        self.rows = list(self.connection.rows)
+        self.rowcount = len(self.rows) or 1
+
+    async def executemany(self, sql, params):
+        self.connection.executed.append(("executemany", sql, params))
+        self.connection.in_transaction = True
+        self.rowcount = len(params)
+
+    async def fetchall(self):
+        return self.rows
+
+    async def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    async def close(self):
+        pass
+
+
+class FakeAsyncConnection:
+    def __init__(self, rows=()):
+        self.rows = rows
+        self.executed = []
+        self.in_transaction = False
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = False
+        self.fail_next = False
+
+    async def cursor(self, buffered=True, dictionary=False):
+        return FakeAsyncCursor(self, dictionary=dictionary)
+
+    async def commit(self):
+        self.commits += 1
+        self.in_transaction = False
+
+    async def rollback(self):
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def created(monkeypatch):
+    connections = []
+
+    async def fake_connect_db_async(sql_config=None, database=None, **kwargs):
+        connection = FakeAsyncConnection(rows=[(1, 'a'), (2, 'b')])
+        connections.append(connection)
+        return connection
+
+    monkeypatch.setattr("lazy_mysql.async_pool.connect_db_async", fake_connect_db_async)
+    return connections
+
+
+def make_executor(**pool_config):
+    return AsyncSQLExecutor({"database": "test_db"}, pool_config=pool_config)
+
+
+def test_async_select_uses_shared_builders_and_commits(created):
+    async def main():
+        async with make_executor() as executor:
+            rows = await executor.select('users', ['id', 'name'], {'id': 1},
+                                         fetch_config={'output_format': 'df_dict'})
+            return rows
+
+    rows = asyncio.run(main())
+
+    assert rows == [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}]
+    connection = created[0]
+    assert connection.executed == [("execute", "SELECT id, name FROM users WHERE id = %s", (1,))]
+    assert connection.commits == 1
+    assert connection.closed
+
+
+def test_async_queries_run_concurrently_on_separate_connections(created):
+    async def main():
+        executor = make_executor(max_size=3)
+        results = await asyncio.gather(*(executor.exists('users', {'id': i}) for i in range(3)))
+        stats = executor._pool.stats
+        await executor.close()
+        return results, stats
+
+    results, stats = asyncio.run(main())
+
+    assert results == [True, True, True]
+    assert stats["in_use"] == 0
+    assert 1 <= len(created) <= 3
+
+
+def test_async_insert_batches_list_in_one_transaction(created, monkeypatch):
+    monkeypatch.setattr("lazy_mysql.async_executor._ASYNC_INSERT_BATCH_SIZE", 2)
+
+    async def main():
+        async with make_executor() as executor:
+            return await executor.insert('users', [{'id': i, 'name': f'n{i}'} for i in range(5)])
+
+    inserted = asyncio.run(main())
+
+    assert inserted == 5
+    connection = created[0]
+    assert [len(params) for _, _, params in connection.executed] == [2, 2, 1]
+    assert connection.executed[0][1] == "INSERT INTO users (id, name) VALUES (%s, %s)"
+    assert connection.commits == 1
+
+
+def test_async_transaction_rolls_back_on_error(created):
+    async def main():
+        executor = make_executor()
+        with pytest.raises(RuntimeError):
+            async with executor.transaction() as tx:
+                await tx.update('users', {'name': 'x'}, {'id': 1})
+                raise RuntimeError("boom")
+        await executor.close()
+
+    asyncio.run(main())
+
+    connection = created[0]
+    assert connection.rollbacks == 1
+    assert connection.commits == 0
+
+
+def test_async_execute_retries_once_on_new_connection(created):
+    async def main():
+        executor = make_executor()
+        connection = await executor._pool.acquire()
+        connection.fail_next = True
+        await executor._pool.release(connection)
+        rowcount = await executor.delete('users', {'id': 1})
+        await executor.close()
+        return rowcount
+
+    assert asyncio.run(main()) == 2
+    assert len(created) == 2
+    assert created[0].closed
+    assert created[1].commits == 1
+
+
+def test_async_pool_acquire_times_out(created):
+    async def main():
+        executor = make_executor(max_size=1, timeout=0.05)
+        await executor._pool.acquire()
+        with pytest.raises(PoolTimeoutError):
+            await executor.execute("SELECT 1")
+
+    asyncio.run(main())
+
+
+def test_async_select_timeout_adds_max_execution_time_hint(created):
+    async def main():
+        async with AsyncSQLExecutor({"database": "test_db"}, query_timeout=2) as executor:
+            await executor.exists('users', {'id': 1})
+            await executor.select('users', ['id'], timeout=0.5)
+
+    asyncio.run(main())
+
+    assert [sql for _, sql, _ in created[0].executed] == [
+        "SELECT /*+ MAX_EXECUTION_TIME(2000) */ 1 FROM users WHERE id = %s LIMIT 1",
+        "SELECT /*+ MAX_EXECUTION_TIME(500) */ id FROM users",
+    ]
+
+
+class SlowAsyncCursor(FakeAsyncCursor):
+    """写入语句一直执行，直到被 KILL QUERY 中断（1317）"""
+
+    async def execute(self, sql, params=None):
+        self.connection.executed.append(("execute", sql, params))
+        await self.connection.killed.wait()
+        raise mysql_errors.DatabaseError(msg="Query execution was interrupted", errno=1317)
+
+
+def slow_connection(created, kill_reaches_server=True):
+    async def side_connect(sql_config=None, database=None, **kwargs):
+        side = FakeAsyncConnection()
+
+        async def side_cursor(buffered=True, dictionary=False):
+            cursor = FakeAsyncCursor(side)
+            original = cursor.execute
+
+            async def execute(sql, params=None):
+                await original(sql, params)
+                if kill_reaches_server:
+                    created[0].killed.set()
+            cursor.execute = execute
+            return cursor
+        side.cursor = side_cursor
+        return side
+    return side_connect
+
+
+@pytest.mark.parametrize("kill_reaches_server", [True, False])
+def test_async_write_timeout_kills_query(created, monkeypatch, kill_reaches_server):
+    monkeypatch.setattr("lazy_mysql.utils.timeout.KILL_GRACE_SECONDS", 0.05)
+    monkeypatch.setattr("lazy_mysql.utils.timeout.connect_db_async", slow_connection(created, kill_reaches_server))
+
+    async def main():
+        executor = make_executor()
+        connection = await executor._pool.acquire()
+        connection.connection_id = 42
+        connection.killed = asyncio.Event()
+        connection.cursor = lambda buffered=True, dictionary=False: _async_value(SlowAsyncCursor(connection))
+        await executor._pool.release(connection)
+        with pytest.raises(QueryTimeoutError):
+            await executor.update('users', {'name': 'x'}, {'id': 1}, timeout=0.01)
+        stats = executor._pool.stats
+        await executor.close()
+        return connection, stats
+
+    connection, stats = asyncio.run(main())
+
+    assert connection.executed[0][1].startswith("UPDATE users")
+    if kill_reaches_server:
+        # 语句被服务端中断，连接回滚后归还复用
+        assert connection.rollbacks == 1
+        assert stats["idle"] == 1
+    else:
+        # KILL 未生效：放弃等待并丢弃连接
+        assert stats["idle"] == 0
+
+
+async def _async_value(value):
+    return value
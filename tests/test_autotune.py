@@ -0,0 +1,196 @@
+import csv
+import importlib
+import json
+import re
+
+import pytest
+
+from lazy_mysql.crud.insert import insert
+from lazy_mysql.utils import autotune
+from lazy_mysql.utils.autotune import (EXECUTEMANY, LOAD_DATA, InsertTuner, StrategyStats, get_tuner,
+                                       reset_tuning, save_tuning)
+
+insert_module = importlib.import_module('lazy_mysql.crud.insert')
+
+
+@pytest.fixture(autouse=True)
+def clean_tuning():
+    reset_tuning()
+    yield
+    reset_tuning()
+
+
+class Clock:
+    """替代 time.perf_counter，由 TimedExecutor 按执行的行数推进"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TimedExecutor:
+    """LOAD DATA 每行 1µs，executemany 每行 10µs；记录每条语句的策略与行数"""
+
+    def __init__(self, clock, local_infile_error=False):
+        self.clock = clock
+        self.local_infile_error = local_infile_error
+        self.database = 'app'
+        self.mydb = None
+        self.statements = []
+        self.closed = False
+
+    def execute(self, sql, params=None, commit=False, self_close=False):
+        if sql.strip().startswith('LOAD DATA'):
+            if self.local_infile_error:
+                raise Exception("SQL execute failed: 3948 (42000): Loading local data is disabled; "
+                                "this must be enabled on both the client and server sides (LOCAL INFILE)")
+            path = re.search(r"INFILE '([^']+)'", sql).group(1)
+            with open(path, newline='', encoding='utf-8') as source:
+                rows = sum(1 for _ in csv.reader(source))
+            self.statements.append((LOAD_DATA, rows))
+            self.clock.now += rows * 1e-6
+        else:
+            self.statements.append((EXECUTEMANY, len(params)))
+            self.clock.now += len(params) * 1e-5
+
+    def close(self):
+        self.closed = True
+
+
+def test_stats_increase_additively_and_halve_on_slow_batches():
+    stats = StrategyStats(EXECUTEMANY)
+    minimum, initial, maximum, step = autotune.STRATEGY_LIMITS[EXECUTEMANY]
+
+    stats.record(initial, initial * 100, 0.1)
+    assert stats.batch_rows == initial + step
+
+    # 输入不足一批时不增大
+    stats.record(10, 1000, 0.001)
+    assert stats.batch_rows == initial + step
+
+    stats.record(stats.batch_rows, 0, autotune.TARGET_BATCH_SECONDS * 2)
+    assert stats.batch_rows == (initial + step) // 2
+
+    for _ in range(20):
+        stats.penalize()
+    assert stats.batch_rows == minimum
+
+
+def test_tuner_tries_both_strategies_then_prefers_faster(monkeypatch):
+    monkeypatch.setattr(autotune, 'EXPLORE_EVERY', 3)
+    tuner = InsertTuner()
+
+    assert tuner.choose(100) == EXECUTEMANY
+    assert tuner.choose(None) == EXECUTEMANY
+    tuner.record(EXECUTEMANY, 1000, 0, 0.1)
+    assert tuner.choose(None) == LOAD_DATA
+    tuner.record(LOAD_DATA, 50000, 0, 0.5)
+
+    choices = [tuner.choose(None) for _ in range(6)]
+    assert choices == [LOAD_DATA, LOAD_DATA, EXECUTEMANY] * 2
+    # 剩余记录不足时不使用 LOAD DATA
+    assert tuner.choose(autotune.LOAD_DATA_MIN_ROWS - 1) == EXECUTEMANY
+
+    tuner.disable_load_data()
+    assert tuner.choose(None) == EXECUTEMANY
+
+
+def test_auto_tuned_insert_adapts_and_remembers_per_table(monkeypatch, tmp_path):
+    clock = Clock()
+    monkeypatch.setattr(insert_module.time, 'perf_counter', clock)
+    records = [{'id': i, 'name': f'user{i}'} for i in range(120000)]
+
+    executor = TimedExecutor(clock)
+    inserted = insert(executor, 'users', iter(records), commit=True, temp_dir=str(tmp_path), auto_tune=True)
+
+    assert inserted == 120000
+    assert sum(rows for _, rows in executor.statements) == 120000
+    assert [strategy for strategy, _ in executor.statements[:2]] == [EXECUTEMANY, LOAD_DATA]
+    # executemany 批次按耗时增大；LOAD DATA 更快，之后的批次都使用 LOAD DATA
+    assert executor.statements[0][1] == autotune.STRATEGY_LIMITS[EXECUTEMANY][1]
+    assert all(strategy == LOAD_DATA for strategy, _ in executor.statements[1:])
+    snapshot = get_tuner('app', 'users').snapshot()
+    assert snapshot['stats'][LOAD_DATA]['batch_rows'] > autotune.STRATEGY_LIMITS[LOAD_DATA][1]
+
+    # 同一进程内再次写入同一张表时直接使用学到的策略
+    executor = TimedExecutor(clock)
+    insert(executor, 'users', records[:60000], commit=True, temp_dir=str(tmp_path), auto_tune=True)
+    assert executor.statements[0][0] == LOAD_DATA
+
+
+def test_local_infile_rejection_falls_back_to_executemany(tmp_path):
+    executor = TimedExecutor(Clock(), local_infile_error=True)
+    records = [{'id': i} for i in range(20000)]
+
+    insert(executor, 'events', records[:1000], auto_tune=True)
+    # 被拒绝的 LOAD DATA 批次改用 executemany 重试，本次调用写入全部记录
+    assert insert(executor, 'events', records, temp_dir=str(tmp_path), auto_tune=True) == 20000
+    assert get_tuner('app', 'events').load_data_available is False
+
+    assert insert(executor, 'events', records, auto_tune=True) == 20000
+    assert {strategy for strategy, _ in executor.statements} == {EXECUTEMANY}
+    assert sum(rows for _, rows in executor.statements) == 41000
+
+
+class ClosingExecutor(TimedExecutor):
+    """与 SQLExecutor 一致：语句失败（事务外）时关闭连接"""
+
+    def __init__(self, clock, **kwargs):
+        super().__init__(clock, **kwargs)
+        self.mydb = object()
+        self.reconnects = 0
+
+    def execute(self, sql, params=None, commit=False, self_close=False):
+        try:
+            super().execute(sql, params, commit, self_close)
+        except Exception:
+            self.mydb = None
+            raise
+
+    def _open_replacement(self):
+        self.reconnects += 1
+        return object(), None
+
+    def _bind_connection(self, mydb, mycursor):
+        self.mydb = mydb
+
+
+def test_local_infile_fallback_reconnects_only_when_earlier_batches_are_committed(tmp_path):
+    records = [{'id': i} for i in range(20000)]
+
+    executor = ClosingExecutor(Clock(), local_infile_error=True)
+    assert insert(executor, 'events', records, commit=True, temp_dir=str(tmp_path), auto_tune=True) == 20000
+    assert executor.reconnects == 1
+
+    # 未提交的批次已随关闭的连接回滚，不能在新连接上继续
+    reset_tuning()
+    executor = ClosingExecutor(Clock(), local_infile_error=True)
+    with pytest.raises(Exception, match='LOCAL INFILE'):
+        insert(executor, 'events', records, temp_dir=str(tmp_path), auto_tune=True)
+    assert executor.reconnects == 0
+
+
+def test_tuning_state_round_trips_through_file(tmp_path):
+    path = tmp_path / 'tuning.json'
+    get_tuner('app', 'users').record(EXECUTEMANY, 1000, 64000, 0.1)
+    save_tuning(path)
+    saved = json.loads(path.read_text(encoding='utf-8'))
+    assert saved['app.users']['stats'][EXECUTEMANY]['batch_rows'] == 2000
+
+    reset_tuning()
+    tuner = get_tuner('app', 'users', str(path))
+    assert tuner.batch_rows(EXECUTEMANY) == 2000
+    assert tuner.stats[EXECUTEMANY].bytes_per_row == 64
+
+
+def test_auto_tune_rejects_parallel_and_bulk_session():
+    with pytest.raises(ValueError):
+        insert(TimedExecutor(Clock()), 'users', [{'id': 1}], auto_tune=True, bulk_session=True)
+
+
+@pytest.mark.parametrize('auto_tune', [1, 0.5, None, ['tuning.json']])
+def test_auto_tune_rejects_non_bool_or_path_values(auto_tune):
+    with pytest.raises(ValueError, match='auto_tune'):
+        insert(TimedExecutor(Clock()), 'users', [{'id': 1}, {'id': 2}], auto_tune=auto_tune)
@@ -0,0 +1,57 @@
+import json
+
+from lazy_mysql.crud.batch_update import batch_update
+from lazy_mysql.utils.batching import byte_batches, execute_batches, insert_row_size
+
+
+class RecordingExecutor:
+    """记录每次 execute 调用；连接上预置 max_allowed_packet 缓存"""
+
+    def __init__(self, max_allowed_packet):
+        self.calls = []
+        self.mydb = type("Connection", (), {})()
+        self.mydb._lazy_mysql_server_vars = {"max_allowed_packet": max_allowed_packet}
+
+    def execute(self, sql, params=None, commit=False, self_close=False):
+        self.calls.append((sql, params, commit, self_close))
+
+
+def test_byte_batches_split_wide_rows_by_bytes():
+    rows = [(i, json.dumps({"payload": "x" * 500})) for i in range(10)]
+
+    batches = list(byte_batches(rows, insert_row_size, budget=3000, base_size=100))
+
+    assert sum(len(batch) for batch in batches) == 10
+    assert len(batches) > 1
+    for batch in batches:
+        assert 100 + sum(insert_row_size(row) for row in batch) <= 3000
+
+
+def test_byte_batches_cap_rows_per_batch():
+    batches = list(byte_batches(range(5), lambda _: 1, budget=10 ** 9, max_rows=2))
+    assert batches == [[0, 1], [2, 3], [4]]
+
+
+def test_execute_batches_commits_only_last_batch():
+    executor = RecordingExecutor(0)
+    rows = [(i, "y" * 200) for i in range(6)]
+
+    count = execute_batches(executor, "INSERT INTO t (id, v) VALUES (%s, %s)", rows, budget=1000,
+                            commit=True, self_close=True)
+
+    assert count == len(executor.calls) > 1
+    assert [call[2:] for call in executor.calls] == [(False, False)] * (count - 1) + [(True, True)]
+    assert [row for call in executor.calls for row in call[1]] == rows
+
+
+def test_batch_update_splits_by_max_allowed_packet():
+    executor = RecordingExecutor(max_allowed_packet=1024 + 2000)
+    update_list = [{'fields': {'note': 'z' * 300}, 'conditions': {'id': i}} for i in range(8)]
+
+    batch_update(executor, 'users', update_list, commit=True)
+
+    assert len(executor.calls) > 1
+    assert all(sql.startswith("UPDATE users SET") for sql, *_ in executor.calls)
+    assert [call[2] for call in executor.calls] == [False] * (len(executor.calls) - 1) + [True]
+    updated_ids = [param for _, params, *_ in executor.calls for param in params if isinstance(param, int)]
+    assert sorted(set(updated_ids)) == list(range(8))
@@ -0,0 +1,90 @@
+import tempfile
+from unittest.mock import Mock
+
+import pytest
+
+from lazy_mysql.crud.insert import _bulk_insert_load_data
+from lazy_mysql.pool import _reset_connection
+from lazy_mysql.utils.bulk_session import SESSION_DIRTY_ATTR, bulk_load_session
+
+
+class LoadExecutor:
+    """记录语句的执行器：会话变量语句经 mydb.cursor() 执行，LOAD DATA 经 execute() 执行"""
+
+    def __init__(self, load_error=None, warning_count=0):
+        self.statements = []
+        self.load_error = load_error
+        self.mydb = Mock(get_warnings=False)
+        self.mydb.cursor.side_effect = self._cursor
+        self.mycursor = Mock(warning_count=warning_count)
+        self.mycursor.fetchwarnings.return_value = [("Warning", 1265, "Data truncated for column 'name' at row 1")]
+
+    def _cursor(self, **kwargs):
+        cursor = Mock()
+        cursor.execute.side_effect = lambda sql, params=None: self.statements.append((sql, params))
+        cursor.fetchone.return_value = (1, 1, 8388608)
+        return cursor
+
+    def _ensure_connection(self):
+        pass
+
+    def execute(self, sql, params=None, commit=False, self_close=False):
+        assert self.mydb.get_warnings is True
+        self.statements.append(("LOAD DATA", None))
+        if self.load_error is not None:
+            raise self.load_error
+
+    def close(self):
+        pass
+
+
+def load(executor, rows=3, **kwargs):
+    records = [{'id': i, 'name': f'user{i}'} for i in range(rows)]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        return _bulk_insert_load_data(executor, 'users', records, batch_size=2, temp_dir=temp_dir, **kwargs)
+
+
+def test_bulk_session_relaxes_checks_and_restores_them_even_on_failure():
+    executor = LoadExecutor(load_error=RuntimeError("disk full"))
+
+    with pytest.raises(RuntimeError):
+        load(executor, bulk_session=True)
+
+    select, relax, loaded, restore = executor.statements
+    assert select[0] == "SELECT @@SESSION.unique_checks, @@SESSION.foreign_key_checks, @@SESSION.bulk_insert_buffer_size"
+    assert relax == ("SET SESSION unique_checks = %s, foreign_key_checks = %s, bulk_insert_buffer_size = %s",
+                     (0, 0, 256 * 1024 * 1024))
+    assert loaded[0] == "LOAD DATA"
+    assert restore[1] == (1, 1, 8388608)
+    assert getattr(executor.mydb, SESSION_DIRTY_ATTR) is False
+
+
+@pytest.mark.parametrize("name", ["unique_checks = 0; DROP TABLE users; --", "GLOBAL.unique_checks", "1abc", ""])
+def test_bulk_session_rejects_non_identifier_variable_names(name):
+    executor = LoadExecutor()
+
+    with pytest.raises(ValueError):
+        with bulk_load_session(executor, {name: 0}):
+            pass
+
+    assert executor.statements == []
+
+
+def test_load_data_counts_server_warnings():
+    executor = LoadExecutor(warning_count=2)
+
+    assert load(executor, rows=3) == 3
+
+    assert executor.last_load_warnings.count == 4
+    assert executor.last_load_warnings.samples[0][1] == 1265
+    assert executor.mydb.get_warnings is False
+    assert [sql for sql, _ in executor.statements] == ["LOAD DATA", "LOAD DATA"]
+
+
+def test_pool_discards_connection_with_unrestored_session():
+    connection = Mock(in_transaction=False)
+    setattr(connection, SESSION_DIRTY_ATTR, True)
+    assert _reset_connection(connection) is False
+
+    setattr(connection, SESSION_DIRTY_ATTR, False)
+    assert _reset_connection(connection) is True
@@ -0,0 +1,128 @@
+import threading
+
+import pytest
+
+from lazy_mysql import ConnectionPool, PoolConfig, PoolTimeoutError, SQLExecutor
+
+
+class DummyCursor:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class DummyConnection:
+    def __init__(self):
+        self.closed = False
+        self.in_transaction = False
+        self.rollbacks = 0
+
+    def cursor(self, buffered=True, dictionary=False):
+        return DummyCursor()
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def created(monkeypatch):
+    connections = []
+
+    def fake_connect_db(sql_config=None, database=None, **kwargs):
+        connection = DummyConnection()
+        connections.append(connection)
+        return connection
+
+    monkeypatch.setattr("lazy_mysql.pool.connect_db", fake_connect_db)
+    return connections
+
+
+def make_pool(**pool_config):
+    return ConnectionPool({"database": "test_db"}, pool_config=pool_config)
+
+
+def test_pool_prefills_min_size_and_reuses_released_connection(created):
+    pool = make_pool(min_size=2, max_size=3)
+    assert len(created) == 2
+
+    first = pool.acquire()
+    pool.release(first)
+    second = pool.acquire()
+
+    assert second is first
+    assert len(created) == 2
+    assert pool.stats == {"size": 2, "idle": 1, "in_use": 1, "max_size": 3}
+
+
+def test_pool_checkout_times_out_when_exhausted(created):
+    pool = make_pool(max_size=1, timeout=0.05)
+    pool.acquire()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+
+
+def test_pool_waiter_receives_released_connection(created):
+    pool = make_pool(max_size=1, timeout=5)
+    connection = pool.acquire()
+    received = []
+
+    waiter = threading.Thread(target=lambda: received.append(pool.acquire()))
+    waiter.start()
+    pool.release(connection)
+    waiter.join(timeout=5)
+
+    assert received == [connection]
+
+
+def test_pool_rolls_back_open_transaction_on_release(created):
+    pool = make_pool()
+    connection = pool.acquire()
+    connection.in_transaction = True
+
+    pool.release(connection)
+
+    assert connection.rollbacks == 1
+    assert not connection.closed
+
+
+def test_pool_discards_expired_and_idle_connections(created, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("lazy_mysql.pool.time.monotonic", lambda: clock[0])
+    pool = make_pool(max_lifetime=60, idle_timeout=30)
+
+    connection = pool.acquire()
+    pool.release(connection)
+    clock[0] += 31
+    pool.prune()
+    assert connection.closed
+    assert pool.stats["size"] == 0
+
+    connection = pool.acquire()
+    clock[0] += 61
+    pool.release(connection)
+    assert connection.closed
+
+
+def test_executor_from_pool_returns_connection_on_close(created):
+    pool = make_pool(max_size=1)
+
+    with pool.lease() as executor:
+        assert isinstance(executor, SQLExecutor)
+        leased = executor.mydb
+        assert pool.stats["in_use"] == 1
+
+    assert executor.mydb is None
+    assert not leased.closed
+    assert pool.stats == {"size": 1, "idle": 1, "in_use": 0, "max_size": 1}
+
+
+def test_pool_config_rejects_min_size_above_max_size():
+    with pytest.raises(ValueError):
+        PoolConfig(min_size=5, max_size=2)
@@ -0,0 +1,55 @@
+import pytest
+from mysql.connector.errors import DatabaseError, InterfaceError
+
+from lazy_mysql import MySQLConfig
+from lazy_mysql.utils import driver
+
+
+@pytest.fixture
+def fake_connector(monkeypatch):
+    """记录每次连接使用的 use_pure，c_error 非空时 C 扩展连接抛出该异常"""
+    calls, c_error = [], []
+
+    def fake_connect(**kwargs):
+        calls.append(kwargs["use_pure"])
+        if not kwargs["use_pure"] and c_error:
+            raise c_error[0]
+        return object()
+
+    monkeypatch.setattr("lazy_mysql.utils.driver.mysql.connector.connect", fake_connect)
+    monkeypatch.setattr("lazy_mysql.utils.driver.mysql.connector.HAVE_CEXT", True, raising=False)
+    monkeypatch.setattr(driver, "_c_ext_broken", False)
+    return calls, c_error
+
+
+def test_auto_prefers_c_extension_and_falls_back_to_pure_once(fake_connector):
+    calls, c_error = fake_connector
+    driver.connect(None, host="db")
+    assert calls == [False]
+
+    c_error.append(DatabaseError("Authentication plugin 'mysql_native_password' cannot be loaded", errno=2059))
+    driver.connect("auto", host="db")
+    driver.connect("auto", host="db")
+
+    assert calls == [False, False, True, True]
+    assert driver.get_backend(None).name == "pure"
+
+
+def test_network_errors_do_not_switch_driver(fake_connector):
+    calls, c_error = fake_connector
+    c_error.append(InterfaceError("Can't connect to MySQL server", errno=2003))
+
+    with pytest.raises(InterfaceError):
+        driver.connect(None, host="db")
+
+    assert calls == [False]
+    assert driver.get_backend(None).name == "c"
+
+
+def test_driver_is_resolved_from_config_and_validated(monkeypatch):
+    monkeypatch.setenv("LAZY_MYSQL_DRIVER", "pure")
+    assert MySQLConfig.resolve({"host": "db"}).driver == "pure"
+    assert MySQLConfig.resolve({"host": "db", "driver": "c"}).driver == "c"
+
+    with pytest.raises(ValueError):
+        driver.get_backend("oracle")
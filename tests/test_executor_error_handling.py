@@ -91,6 +91,7 @@ def test_format_sql_for_log_returns_raw_sql_when_parser_fails(monkeypatch):
     def raise_parse_error(*args, **kwargs):
         raise SQLParseError("invalid SQL")
 
-    monkeypatch.setattr("lazy_mysql.tools.log_utils.sqlparse.format", raise_parse_error)
+    # log_utils 在格式化时才导入 sqlparse，直接替换模块上的 format
+    monkeypatch.setattr("sqlparse.format", raise_parse_error)
 
     assert format_sql_for_log(sql) == sql
@@ -0,0 +1,82 @@
+import threading
+from unittest.mock import Mock
+
+import pytest
+from mysql.connector.errors import ProgrammingError
+
+from lazy_mysql import SQLExecutor
+
+
+@pytest.fixture
+def connect(monkeypatch):
+    """每次建立连接返回新的 Mock 连接；游标 fetchall 返回 [(sql,)]，SQL 含 missing_table 时抛出 1146"""
+    state = {"connections": 0, "active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def fake_connection(sql_config, database, dict_cursor=False, **kwargs):
+        cursor = Mock(rowcount=1, statement=None)
+
+        def execute(sql, params=None):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            try:
+                if "missing_table" in sql:
+                    raise ProgrammingError("Table 'test_db.missing_table' doesn't exist", errno=1146)
+                cursor.fetchall.return_value = [(sql,)]
+                cursor.fetchone.return_value = (sql,)
+            finally:
+                threading.Event().wait(0.01)
+                with lock:
+                    state["active"] -= 1
+
+        cursor.execute.side_effect = execute
+        with lock:
+            state["connections"] += 1
+        return Mock(), cursor
+
+    monkeypatch.setattr("lazy_mysql.executor.connection", fake_connection)
+    return state
+
+
+def make_executor():
+    return SQLExecutor({"host": "db", "database": "test_db"}, lazy_connect=True)
+
+
+def test_gather_returns_results_in_order_with_bounded_concurrency(connect):
+    executor = make_executor()
+    specs = [{"sql": f"SELECT {i}", "fetch_config": {"output_format": ""}} for i in range(10)]
+    specs.append({"method": "exists", "table_names": "users", "conditions": {"id": 1}})
+    specs.append(lambda ex: ex.fetch_format("SELECT 'custom'", "one"))
+
+    results = executor.gather(specs, max_concurrency=3)
+
+    assert results[:10] == [[(f"SELECT {i}",)] for i in range(10)]
+    assert results[10] is True
+    assert results[11] == "SELECT 'custom'"
+    assert connect["connections"] == 3
+    assert connect["peak"] <= 3
+    assert executor.mydb is None
+
+
+def test_gather_isolates_failed_queries(connect):
+    executor = make_executor()
+    specs = [{"sql": "SELECT 1", "fetch_config": {"output_format": ""}},
+             {"sql": "SELECT * FROM missing_table", "fetch_config": {"output_format": ""}},
+             {"sql": "SELECT 3", "fetch_config": {"output_format": ""}}]
+
+    results = executor.gather(specs, max_concurrency=1)
+
+    assert results[0] == [("SELECT 1",)]
+    assert isinstance(results[1], Exception) and "missing_table" in str(results[1])
+    assert results[2] == [("SELECT 3",)]
+
+    with pytest.raises(Exception, match="missing_table"):
+        executor.gather(specs, max_concurrency=1, return_exceptions=False)
+
+
+def test_gather_rejects_write_methods_before_running(connect):
+    executor = make_executor()
+    with pytest.raises(ValueError):
+        executor.gather([{"sql": "SELECT 1"}, {"method": "delete", "table_name": "users", "conditions": {}}])
+    assert connect["connections"] == 0
@@ -0,0 +1,72 @@
+from unittest.mock import Mock
+
+import pytest
+from mysql.connector import errors
+
+from lazy_mysql import RetryPolicy, SQLExecutor
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    """每次建立连接返回新的 Mock 连接与游标"""
+    created = []
+
+    def fake_connection(sql_config, database, dict_cursor=False, **kwargs):
+        mydb, cursor = Mock(), Mock(rowcount=1, statement=None)
+        created.append((mydb, cursor))
+        return mydb, cursor
+
+    monkeypatch.setattr("lazy_mysql.executor.connection", fake_connection)
+    return created
+
+
+def make_executor(**kwargs):
+    executor = SQLExecutor({"host": "db", "database": "test_db"}, hot_spare=True, **kwargs)
+    assert executor._hot_spare.wait_ready(2)
+    return executor
+
+
+def test_connection_loss_switches_to_spare_without_waiting(connections, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("lazy_mysql.executor.time.sleep", sleeps.append)
+    executor = make_executor(retry_policy=RetryPolicy(jitter=False))
+    (old_db, old_cursor), (spare_db, spare_cursor) = connections
+    old_cursor.execute.side_effect = errors.OperationalError(msg="Lost connection", errno=2013)
+
+    executor.execute("UPDATE users SET name = %s WHERE id = %s", ("x", 1))
+
+    assert sleeps == []
+    old_db.close.assert_called_once_with()
+    spare_db.ping.assert_called_once_with()
+    spare_cursor.execute.assert_called_once_with("UPDATE users SET name = %s WHERE id = %s", ("x", 1))
+    assert executor.mydb is spare_db
+    # 换用后在后台补充下一条备用连接
+    assert executor._hot_spare.wait_ready(2)
+    assert len(connections) == 3
+
+
+def test_dead_spare_falls_back_to_synchronous_reconnect(connections):
+    executor = make_executor()
+    (old_db, old_cursor), (spare_db, _) = connections
+    spare_db.ping.side_effect = errors.InterfaceError("MySQL Connection not available")
+    old_cursor.execute.side_effect = [errors.OperationalError(msg="MySQL server has gone away", errno=2006)]
+
+    executor.execute("DELETE FROM sessions WHERE id = %s", (1,))
+
+    spare_db.close.assert_called_once_with()
+    assert executor.mydb not in (old_db, spare_db)
+    executor.mycursor.execute.assert_called_once_with("DELETE FROM sessions WHERE id = %s", (1,))
+
+
+def test_close_also_closes_spare(connections):
+    executor = make_executor()
+    executor.close()
+
+    for mydb, _ in connections:
+        mydb.close.assert_called_once_with()
+    assert executor._hot_spare is None or not executor._hot_spare.ready
+
+
+def test_hot_spare_is_not_supported_with_pool():
+    with pytest.raises(ValueError):
+        SQLExecutor({"host": "db", "database": "test_db"}, pool=Mock(), hot_spare=True)
@@ -83,3 +83,48 @@ def test_all_exports_are_unique():
     assert len(lazy_mysql.__all__) == len(set(lazy_mysql.__all__)), (
         "lazy_mysql.__all__ 中存在重复的符号"
     )
+
+
+def _run_isolated(code):
+    """在全新解释器中执行代码，避免受当前进程已导入模块的影响"""
+    import subprocess
+    import sys
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+
+
+def test_import_does_not_load_optional_dependencies():
+    """import lazy_mysql 不应加载 pandas / sqlparse，也不应在导入时解析默认配置"""
+    result = _run_isolated(
+        "import sys, lazy_mysql\n"
+        "from lazy_mysql.models import mysql_config\n"
+        "assert 'pandas' not in sys.modules, 'pandas'\n"
+        "assert 'sqlparse' not in sys.modules, 'sqlparse'\n"
+        "assert 'DEFAULT_MYSQL_CONFIG' not in vars(mysql_config)\n"
+        "assert lazy_mysql.DEFAULT_MYSQL_CONFIG is lazy_mysql.models.DEFAULT_MYSQL_CONFIG\n"
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_core_crud_works_without_pandas():
+    """未安装 pandas 时 insert / select / update / batch_update 正常工作，仅 output_format='df' 报错"""
+    result = _run_isolated(
+        "import sys\n"
+        "sys.modules['pandas'] = None\n"
+        "from unittest.mock import Mock\n"
+        "import pytest\n"
+        "from lazy_mysql import SQLExecutor\n"
+        "executor = object.__new__(SQLExecutor)\n"
+        "executor.logger = Mock()\n"
+        "executor.dict_cursor = False\n"
+        "executor.mydb = Mock()\n"
+        "executor.mycursor = Mock(rowcount=1, statement=None)\n"
+        "executor.mycursor.fetchall.return_value = [(1, 'a')]\n"
+        "executor.insert('users', {'id': 1, 'tags': ['x']})\n"
+        "executor.update('users', {'name': 'a'}, {'id': 1})\n"
+        "executor.batch_update('users', [{'fields': {'name': 'a'}, 'conditions': {'id': 1}}])\n"
+        "rows = executor.select('users', ['id', 'name'], fetch_config={'output_format': 'df_dict'})\n"
+        "assert rows == [{'id': 1, 'name': 'a'}], rows\n"
+        "with pytest.raises(ImportError, match='pandas'):\n"
+        "    executor.select('users', ['id', 'name'], fetch_config={'output_format': 'df'})\n"
+    )
+    assert result.returncode == 0, result.stderr
@@ -209,3 +209,30 @@ def test_bulk_insert_load_data_puts_ignore_in_valid_position():
 
 
 
+
+
+def test_row_converter_matches_prepare_db_value_beyond_sample():
+    from decimal import Decimal
+
+    import numpy as np
+
+    from lazy_mysql.utils.value_converter import CONVERTER_SAMPLE_ROWS, convert_value, row_converter
+
+    plain = [{'id': i, 'name': f'n{i}', 'meta': None, 'score': 1.5} for i in range(CONVERTER_SAMPLE_ROWS)]
+    # 抽样之后才出现的类型：NaN、dict、numpy 标量、pandas 值、bytearray、Decimal
+    mixed = [
+        {'id': np.int64(7), 'name': pd.NA, 'meta': {'tags': ['a', np.int64(2)]}, 'score': float('nan')},
+        {'id': 8, 'name': bytearray(b'x'), 'meta': [1, (2, 3)], 'score': Decimal('2.5')},
+        {'id': 9, 'name': pd.Timestamp('2024-01-01 08:00'), 'meta': {1, 2}, 'score': np.float64('nan')},
+    ]
+    rows = plain + mixed
+    fields = ['id', 'name', 'meta', 'score']
+
+    convert_row = row_converter(fields, rows)
+
+    for row in rows:
+        expected = tuple(prepare_db_value(row[field]) for field in fields)
+        assert convert_row(row) == expected
+        assert tuple(convert_value(row[field]) for field in fields) == expected
+    assert type(convert_row(mixed[0])[0]) is int
+    assert convert_row(mixed[2])[1] == datetime(2024, 1, 1, 8, 0)
@@ -0,0 +1,96 @@
+import csv
+import importlib
+import re
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from lazy_mysql import insert, insert_df, upsert_df
+from lazy_mysql.utils.frame_converter import frame_values
+from lazy_mysql.utils.value_converter import prepare_db_row
+
+insert_module = importlib.import_module('lazy_mysql.crud.insert')
+
+
+class FileReadingExecutor:
+    """记录 executemany 参数；LOAD DATA 时按语句中的文件名读取数据文件"""
+
+    def __init__(self):
+        self.calls = []
+        self.loaded = []
+
+    def execute(self, sql, params=None, commit=False, self_close=False):
+        self.calls.append({'sql': ' '.join(sql.split()), 'params': params, 'commit': commit})
+        match = re.search(r"INFILE '([^']+)'", sql)
+        if match:
+            with open(match.group(1), newline='', encoding='utf-8') as source:
+                self.loaded.extend(csv.reader(source, delimiter='\t', quoting=csv.QUOTE_NONE))
+
+    def close(self):
+        pass
+
+
+def mixed_frame():
+    return pd.DataFrame({
+        'id': [1, 2, 3],
+        'score': [1.5, np.nan, 2.0],
+        'active': [True, False, True],
+        'level': pd.array([1, None, 3], dtype='Int64'),
+        'name': ['a', None, 'c'],
+        'created_at': pd.to_datetime(['2024-01-01 08:00', None, '2024-01-03 00:00']),
+        'tags': [{'a': 1, 'n': np.int64(3)}, [1, 2], np.nan],
+        'kind': pd.Categorical(['u', None, 'u']),
+        'amount': [Decimal('1.10'), None, Decimal('2')],
+    })
+
+
+def test_frame_values_match_per_cell_conversion():
+    df = mixed_frame()
+
+    converted = list(frame_values(df, chunk_rows=2))
+
+    expected = [tuple(prepare_db_row(row).values()) for row in df.to_dict('records')]
+    assert converted == expected
+    assert [type(value) for value in converted[0]] == [type(value) for value in expected[0]]
+    assert converted[0][5] == datetime(2024, 1, 1, 8, 0)
+    assert converted[0][6] == '{"a": 1, "n": 3}'
+    assert converted[1] == (2, None, False, None, None, None, '[1, 2]', None, None)
+
+
+def test_insert_df_small_frame_uses_executemany_with_converted_rows():
+    executor = FileReadingExecutor()
+
+    assert insert_df(executor, 'users', mixed_frame(), commit=True) == 3
+
+    call, = executor.calls
+    assert call['sql'].startswith('INSERT INTO users (id, score, active, level, name, created_at, tags, kind, amount)')
+    assert call['params'][2] == (3, 2.0, True, 3, 'c', datetime(2024, 1, 3), None, 'u', Decimal('2'))
+    assert call['commit'] is True
+
+
+def test_insert_df_large_frame_streams_into_load_data(monkeypatch):
+    monkeypatch.setattr(insert_module, 'LOAD_DATA_THRESHOLD', 4)
+    monkeypatch.setattr(insert_module, 'LOAD_DATA_BATCH_SIZE', 2)
+    executor = FileReadingExecutor()
+    df = pd.DataFrame({'id': range(5), 'flag': [True, False, True, False, True],
+                       'note': ['x', None, 'y', None, 'z']})
+
+    assert insert(executor, 'users', df, commit=True) == 5
+
+    assert len(executor.calls) == 3
+    assert executor.loaded[:2] == [['0', '1', 'x'], ['1', '0', r'\N']]
+
+
+def test_upsert_df_commits_once_after_all_batches(monkeypatch):
+    monkeypatch.setattr('lazy_mysql.utils.batching.MAX_BATCH_ROWS', 2)
+    executor = FileReadingExecutor()
+    df = pd.DataFrame({'id': [1, 2, 3], 'age': [20, None, 40]})
+
+    assert upsert_df(executor, 'users', df, fields_update={'age'}, commit=True) == 3
+
+    assert [call['commit'] for call in executor.calls] == [False, True]
+    assert executor.calls[0]['params'] == [(1, 20.0), (2, None)]
+    assert 'ON DUPLICATE KEY UPDATE' in executor.calls[0]['sql']
+
@@ -0,0 +1,68 @@
+import importlib
+import tempfile
+
+import pandas as pd
+
+from lazy_mysql import insert, upsert
+
+insert_module = importlib.import_module('lazy_mysql.crud.insert')
+
+
+class RecordingExecutor:
+    def __init__(self, produced=None):
+        self.calls = []
+        self.produced = produced
+        self.closed = False
+
+    def execute(self, sql, params=None, commit=False, self_close=False):
+        self.calls.append({'sql': ' '.join(sql.split()), 'params': params,
+                           'produced': self.produced[0] if self.produced else None})
+
+    def close(self):
+        self.closed = True
+
+
+def counting_rows(total, produced):
+    for i in range(total):
+        produced[0] += 1
+        yield {'id': i, 'name': f'user{i}'}
+
+
+def test_insert_streams_generator_into_load_data_batches(monkeypatch):
+    monkeypatch.setattr(insert_module, 'LOAD_DATA_THRESHOLD', 10)
+    monkeypatch.setattr(insert_module, 'LOAD_DATA_BATCH_SIZE', 4)
+    produced = [0]
+    executor = RecordingExecutor(produced)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        inserted = insert(executor, 'users', counting_rows(25, produced), commit=True, temp_dir=temp_dir)
+
+    assert inserted == 25
+    assert len(executor.calls) == 7
+    assert all('LOAD DATA LOCAL INFILE' in call['sql'] for call in executor.calls)
+    # 只预读判断策略所需的条数，其余记录在写入过程中逐批读取
+    assert executor.calls[0]['produced'] == 10
+    assert executor.calls[-2]['produced'] < 25
+
+
+def test_insert_small_generator_uses_executemany():
+    executor = RecordingExecutor()
+
+    assert insert(executor, 'users', (row for row in [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}])) == 2
+
+    assert executor.calls[0]['sql'] == 'INSERT INTO users (id, name) VALUES (%s, %s)'
+    assert executor.calls[0]['params'] == [(1, 'a'), (2, 'b')]
+
+
+def test_upsert_accepts_chunked_dataframe_reader(monkeypatch):
+    monkeypatch.setattr('lazy_mysql.utils.batching.MAX_BATCH_ROWS', 2)
+    executor = RecordingExecutor()
+    chunks = iter([pd.DataFrame({'id': [1, 2, 3], 'name': ['a', 'b', None]}),
+                   pd.DataFrame({'id': [4], 'name': ['d']})])
+
+    assert upsert(executor, 'users', chunks, fields_update={'name'}, self_close=True) == 4
+
+    assert [len(call['params']) for call in executor.calls] == [2, 2]
+    assert executor.calls[0]['sql'].endswith('ON DUPLICATE KEY UPDATE name = VALUES(name)')
+    assert executor.calls[1]['params'] == [(3, None), (4, 'd')]
+    assert executor.closed
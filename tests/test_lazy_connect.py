@@ -0,0 +1,101 @@
+import logging
+from unittest.mock import Mock
+
+from lazy_mysql import ConnectionPool, SQLExecutor
+
+
+def test_lazy_connect_defers_connection_until_first_statement(monkeypatch):
+    mydb, mycursor = Mock(), Mock(rowcount=1)
+    connect = Mock(return_value=(mydb, mycursor))
+    monkeypatch.setattr("lazy_mysql.executor.connection", connect)
+
+    executor = SQLExecutor({"database": "test_db"}, lazy_connect=True)
+    assert executor.mydb is None
+    executor.commit()
+    connect.assert_not_called()
+
+    executor.execute("DELETE FROM users WHERE id = %s", (1,))
+
+    connect.assert_called_once()
+    mycursor.execute.assert_called_once_with("DELETE FROM users WHERE id = %s", (1,))
+
+
+def make_idle_executor(monkeypatch, clock):
+    monkeypatch.setattr("lazy_mysql.executor.time.monotonic", lambda: clock[0])
+    executor = object.__new__(SQLExecutor)
+    executor.logger = Mock(spec=logging.Logger)
+    executor.dict_cursor = False
+    executor.idle_ping_threshold = 60
+    executor._bind_connection(Mock(), Mock())
+    return executor
+
+
+def test_idle_connection_is_pinged_only_after_threshold(monkeypatch):
+    clock = [1000.0]
+    executor = make_idle_executor(monkeypatch, clock)
+
+    clock[0] += 30
+    executor.execute("SELECT 1")
+    executor.mydb.ping.assert_not_called()
+
+    clock[0] += 61
+    executor.execute("SELECT 1")
+    executor.mydb.ping.assert_called_once_with()
+
+
+def test_stale_connection_is_replaced_before_statement_is_sent(monkeypatch):
+    clock = [1000.0]
+    executor = make_idle_executor(monkeypatch, clock)
+    stale_db, stale_cursor = executor.mydb, executor.mycursor
+    stale_db.ping.side_effect = Exception("MySQL server has gone away")
+    fresh_db, fresh_cursor = Mock(), Mock()
+    executor._open_connection = Mock(return_value=(fresh_db, fresh_cursor))
+
+    clock[0] += 3600
+    executor.execute("SELECT 1")
+
+    stale_cursor.execute.assert_not_called()
+    fresh_cursor.execute.assert_called_once_with("SELECT 1")
+    stale_db.close.assert_called_once_with()
+    executor.logger.error.assert_not_called()
+
+
+class PingConnection:
+    def __init__(self, alive=True):
+        self.alive = alive
+        self.closed = False
+        self.in_transaction = False
+
+    def ping(self):
+        if not self.alive:
+            raise Exception("Lost connection to MySQL server")
+
+    def close(self):
+        self.closed = True
+
+
+def test_pool_replaces_dead_idle_connection_on_acquire(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("lazy_mysql.pool.time.monotonic", lambda: clock[0])
+    created = []
+
+    def fake_connect_db(sql_config=None, database=None, **kwargs):
+        created.append(PingConnection())
+        return created[-1]
+
+    monkeypatch.setattr("lazy_mysql.pool.connect_db", fake_connect_db)
+    pool = ConnectionPool({"database": "test_db"}, pool_config={"idle_ping_threshold": 30})
+
+    first = pool.acquire()
+    pool.release(first)
+    first.alive = False
+    clock[0] += 10
+    assert pool.acquire() is first
+    pool.release(first)
+
+    clock[0] += 31
+    second = pool.acquire()
+
+    assert second is not first
+    assert first.closed
+    assert pool.stats["size"] == 1
@@ -0,0 +1,66 @@
+import re
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from lazy_mysql.crud.insert import _load_data_sql_builder
+from lazy_mysql.utils.load_data_format import FIELDS_CLAUSE, format_rows
+
+_UNESCAPES = {'t': '\t', 'n': '\n', 'r': '\r', '0': '\0', '\\': '\\'}
+
+
+def parse(text):
+    """按服务端 FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' 的规则读回"""
+    assert text.endswith('\n')
+    rows = []
+    for line in text[:-1].split('\n'):
+        rows.append(tuple(
+            None if field == r'\N' else re.sub(r'\\(.)', lambda m: _UNESCAPES.get(m.group(1), m.group(1)), field)
+            for field in line.split('\t')
+        ))
+    return rows
+
+
+def test_special_strings_round_trip_exactly():
+    values = ['plain', 'tab\there', 'line\nbreak\r\n', 'C:\\path\\to', r'\N', 'NULL', '', '"quoted", comma',
+              'nul\0byte', '中文 🚀']
+    rows = [(i, value) for i, value in enumerate(values)] + [(len(values), None)]
+
+    assert parse(format_rows(rows)) == [(str(i), value) for i, value in rows]
+
+
+def test_typed_columns_use_server_literals():
+    rows = [
+        (1, True, 1.5, Decimal('10.25'), datetime(2024, 1, 2, 3, 4, 5), date(2024, 1, 2), b'raw\tbytes'),
+        (2, False, None, None, None, None, None),
+    ]
+
+    assert parse(format_rows(rows)) == [
+        ('1', '1', '1.5', '10.25', '2024-01-02 03:04:05', '2024-01-02', 'raw\tbytes'),
+        ('2', '0', None, None, None, None, None),
+    ]
+    with pytest.raises(ValueError):
+        format_rows([(b'\xff\xfe',)])
+
+
+def test_tz_aware_datetimes_are_written_without_offset():
+    tz = timezone(timedelta(hours=8))
+    aware = datetime(2024, 1, 2, 3, 4, 5, 600000, tzinfo=tz)
+    rows = [(aware, time(3, 4, 5, tzinfo=tz), aware), (None, None, 'mixed')]
+
+    # 与 executemany 的驱动转换一致：去掉 tzinfo，保留本地时间
+    assert parse(format_rows(rows)) == [
+        ('2024-01-02 03:04:05.600000', '03:04:05', '2024-01-02 03:04:05.600000'),
+        (None, None, 'mixed'),
+    ]
+    assert parse(format_rows([(aware,)])) == [('2024-01-02 03:04:05.600000',)]
+
+
+def test_load_statement_declares_matching_format():
+    sql = ' '.join(_load_data_sql_builder('users', ['id', 'name'])('/tmp/load.tsv').split())
+
+    assert FIELDS_CLAUSE in sql
+    assert 'CHARACTER SET utf8mb4' in sql and "ESCAPED BY X'5C'" in sql
+    assert 'ENCLOSED' not in sql
+    assert sql.endswith('(id, name)')
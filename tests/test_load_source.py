@@ -0,0 +1,81 @@
+import csv
+import os
+import re
+import tempfile
+
+import pytest
+
+from lazy_mysql.crud.insert import _bulk_insert_load_data
+from lazy_mysql.utils.load_source import fifo_supported
+
+pytestmark = pytest.mark.skipif(not fifo_supported(), reason="named pipes not supported")
+
+
+class PipeReadingExecutor:
+    """像驱动一样按 LOAD DATA 语句中的文件名打开并读取数据源"""
+
+    def __init__(self, fail_before_read=False):
+        self.fail_before_read = fail_before_read
+        self.loaded = []
+        self.paths = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def execute(self, sql, params=None, commit=False, self_close=False):
+        assert commit is False
+        path = re.search(r"INFILE '([^']+)'", sql).group(1)
+        self.paths.append(path)
+        if self.fail_before_read:
+            raise RuntimeError("Lost connection to MySQL server")
+        with open(path, newline='', encoding='utf-8') as source:
+            self.loaded.extend(csv.reader(source, delimiter='\t', quoting=csv.QUOTE_NONE))
+
+    def commit(self):
+        self.commits += 1
+
+    def _rollback_if_needed(self, needs_rollback):
+        self.rollbacks += 1
+
+    def close(self):
+        pass
+
+
+def load(executor, records):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        count = _bulk_insert_load_data(executor, 'users', records, batch_size=2, temp_dir=temp_dir,
+                                       load_source='fifo')
+        assert os.listdir(temp_dir) == []
+    return count
+
+
+def test_fifo_source_streams_rows_without_temp_files():
+    executor = PipeReadingExecutor()
+
+    assert load(executor, [{'id': i, 'name': f'user{i}'} for i in range(3)]) == 3
+
+    assert executor.loaded == [['0', 'user0'], ['1', 'user1'], ['2', 'user2']]
+    assert executor.commits == 2
+    assert all(not os.path.exists(path) for path in executor.paths)
+
+
+def test_fifo_writer_error_rolls_back_instead_of_committing_partial_batch(monkeypatch):
+    # 每块一条记录：第一条已写入管道后第二条才失败
+    monkeypatch.setattr('lazy_mysql.utils.load_data_format.WRITE_CHUNK_ROWS', 1)
+    executor = PipeReadingExecutor()
+    records = [{'id': 1, 'name': 'ok'}, {'id': 2}]
+
+    with pytest.raises(KeyError):
+        load(executor, records)
+
+    assert executor.loaded == [['1', 'ok']]
+    assert executor.rollbacks == 1
+    assert executor.commits == 0
+
+
+def test_fifo_writer_is_released_when_statement_fails_before_reading():
+    executor = PipeReadingExecutor(fail_before_read=True)
+
+    with pytest.raises(RuntimeError):
+        load(executor, [{'id': i, 'name': 'x' * 1000} for i in range(2)])
+
+    assert executor.commits == 0
@@ -0,0 +1,88 @@
+import itertools
+import tempfile
+import threading
+
+import pytest
+
+from lazy_mysql import ParallelLoadError
+from lazy_mysql.crud.insert import _bulk_insert_load_data, insert
+
+
+class Worker:
+    def __init__(self, owner, fail_on=None):
+        self.owner = owner
+        self.fail_on = fail_on
+        self.mydb = None
+        self.closed = False
+
+    def execute(self, sql, params=None, commit=False, self_close=False):
+        assert commit is True
+        rows = len(params) if params else 1
+        if self.fail_on is not None and self.fail_on(params):
+            raise RuntimeError("Deadlock found when trying to get lock")
+        with self.owner.lock:
+            self.owner.statements.append((sql.strip().split()[0], rows))
+
+    def close(self):
+        self.closed = True
+
+
+class ParallelExecutor:
+    """主执行器：只负责创建工作执行器，自身不执行写入"""
+
+    def __init__(self, fail_on=None):
+        self.lock = threading.Lock()
+        self.statements = []
+        self.workers = []
+        self.fail_on = fail_on
+        self.mydb = None
+
+    def _worker_executor(self):
+        worker = Worker(self, self.fail_on)
+        with self.lock:
+            self.workers.append(worker)
+        return worker
+
+    def execute(self, *args, **kwargs):
+        raise AssertionError("main executor must not write in parallel mode")
+
+    def close(self):
+        pass
+
+
+def test_parallel_executemany_spreads_batches_and_commits_per_connection(monkeypatch):
+    monkeypatch.setattr('lazy_mysql.utils.batching.MAX_BATCH_ROWS', 100)
+    executor = ParallelExecutor()
+
+    inserted = insert(executor, 'users', [{'id': i} for i in range(1050)], commit=True, parallelism=3)
+
+    assert inserted == 1050
+    assert sum(rows for _, rows in executor.statements) == 1050
+    assert len(executor.statements) == 11
+    assert 1 <= len(executor.workers) <= 3
+    assert all(worker.closed for worker in executor.workers)
+
+
+def test_parallel_load_data_reports_failures_per_worker():
+    calls = itertools.count()
+    executor = ParallelExecutor(fail_on=lambda params: next(calls) == 0)
+    records = [{'id': i, 'name': f'user{i}'} for i in range(6)]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with pytest.raises(ParallelLoadError) as excinfo:
+            _bulk_insert_load_data(executor, 'users', records, batch_size=2, temp_dir=temp_dir, parallelism=2)
+
+    error = excinfo.value
+    assert len(error.errors) == 1
+    failed_worker, cause = next(iter(error.errors.items()))
+    assert isinstance(cause, RuntimeError)
+    assert error.worker_counts[failed_worker] == 0
+    assert error.inserted == sum(error.worker_counts) == 2 * len(executor.statements)
+    assert all(worker.closed for worker in executor.workers)
+
+
+def test_parallelism_requires_commit():
+    with pytest.raises(ValueError, match='commit=True'):
+        insert(ParallelExecutor(), 'users', [{'id': i} for i in range(2000)], parallelism=2)
+    with pytest.raises(ValueError):
+        insert(ParallelExecutor(), 'users', [{'id': 1}], commit=True, parallelism=0)
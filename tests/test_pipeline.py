@@ -0,0 +1,167 @@
+import logging
+from unittest.mock import Mock
+
+import pytest
+from mysql.connector.errors import ProgrammingError
+
+from lazy_mysql import PipelineError
+from lazy_mysql.executor import SQLExecutor
+
+
+class MultiStatementCursor:
+    """模拟多语句请求：每条语句一个结果，fail_at 指定的语句（全局序号）返回错误"""
+
+    def __init__(self, fail_at=None):
+        self.requests = []
+        self.fail_at = fail_at
+        self.statements = 0
+        self.rowcount = -1
+        self._pending = []
+
+    def _next_result(self):
+        index = self.statements
+        self.statements += 1
+        if index == self.fail_at:
+            self._pending = []
+            raise ProgrammingError("Unknown column 'nme' in 'field list'", errno=1054)
+        self.rowcount = index + 1
+
+    def execute(self, sql, params=None):
+        self.requests.append((sql, params))
+        self._pending = sql.split(";\n")[1:]
+        self._next_result()
+
+    def executemany(self, sql, params):
+        self.requests.append((sql, params))
+        self.statements += 1
+        self.rowcount = len(params)
+
+    def nextset(self):
+        if not self._pending:
+            return None
+        self._pending.pop()
+        self._next_result()
+        return True
+
+    def fetchone(self):
+        return (1,)
+
+    def close(self):
+        pass
+
+
+def make_executor(cursor):
+    executor = object.__new__(SQLExecutor)
+    executor.logger = Mock(spec=logging.Logger)
+    executor.dict_cursor = False
+    executor.mydb = Mock()
+    executor.mycursor = cursor
+    return executor
+
+
+def test_pipeline_sends_statements_in_one_round_trip_and_commits_once():
+    cursor = MultiStatementCursor()
+    executor = make_executor(cursor)
+
+    with executor.pipeline(max_batch_bytes=10_000) as pipe:
+        assert executor.update('users', {'name': 'a'}, {'id': 1}) == -1
+        executor.delete('sessions', {'user_id': 1}, commit=True)
+        executor.execute("UPDATE users SET name = %(name)s WHERE id = %(id)s", {'id': 2, 'name': 'b'})
+        assert cursor.requests == []
+
+    assert cursor.requests == [(
+        "UPDATE users SET name = %s WHERE id = %s;\n"
+        "DELETE FROM sessions WHERE user_id = %s;\n"
+        "UPDATE users SET name = %s WHERE id = %s",
+        ('a', 1, 1, 'b', 2),
+    )]
+    assert pipe.rowcounts == [1, 2, 3]
+    assert pipe.round_trips == 1
+    executor.mydb.commit.assert_called_once_with()
+    assert executor.mycursor is cursor
+
+
+def test_pipeline_splits_batches_by_size_and_keeps_executemany_separate():
+    cursor = MultiStatementCursor()
+    executor = make_executor(cursor)
+    sql = "UPDATE users SET name = %s WHERE id = %s"
+
+    with executor.pipeline(max_batch_bytes=100) as pipe:
+        executor.execute(sql, ('a', 1))
+        executor.execute(sql, ('b', 2))
+        executor.execute(sql, ('c', 3))
+        executor.execute("INSERT INTO t (a) VALUES (%s)", [(1,), (2,)])
+
+    assert [len(request[0].split(";\n")) for request in cursor.requests] == [2, 1, 1]
+    assert cursor.requests[-1] == ("INSERT INTO t (a) VALUES (%s)", [(1,), (2,)])
+    assert pipe.rowcounts == [1, 2, 3, 2]
+
+
+def test_pipeline_flushes_before_read():
+    cursor = MultiStatementCursor()
+    executor = make_executor(cursor)
+
+    with executor.pipeline():
+        executor.execute("DELETE FROM users WHERE id = %s", (1,))
+        executor.mydb.cursor.return_value = Mock(fetchone=Mock(return_value=(4 * 1024 * 1024,)))
+        executor.query("SELECT COUNT(*) FROM users", fetch_config={'fetch_mode': 'one', 'output_format': ''})
+
+    assert [request[0] for request in cursor.requests] == [
+        "DELETE FROM users WHERE id = %s",
+        "SELECT COUNT(*) FROM users",
+    ]
+
+
+def test_pipeline_error_points_at_failing_statement():
+    cursor = MultiStatementCursor(fail_at=1)
+    executor = make_executor(cursor)
+    mydb = executor.mydb
+
+    with pytest.raises(PipelineError) as excinfo:
+        with executor.pipeline(max_batch_bytes=10_000):
+            executor.execute("UPDATE users SET name = %s WHERE id = %s", ('a', 1), commit=True)
+            executor.execute("UPDATE users SET nme = %s WHERE id = %s", ('b', 2))
+            executor.execute("UPDATE users SET name = %s WHERE id = %s", ('c', 3))
+
+    error = excinfo.value
+    assert error.index == 1
+    assert error.sql == "UPDATE users SET nme = %s WHERE id = %s"
+    assert error.rowcounts == [1]
+    assert "Unknown column" in str(error)
+    mydb.rollback.assert_called_once_with()
+    mydb.commit.assert_not_called()
+    assert executor.mydb is None
+
+
+def test_transaction_inside_pipeline_sends_statements_within_its_boundary():
+    cursor = MultiStatementCursor()
+    executor = make_executor(cursor)
+    events = []
+    executor.mydb.commit.side_effect = lambda: events.append("COMMIT")
+    executor.mydb.rollback.side_effect = lambda: events.append("ROLLBACK")
+    cursor.execute = lambda sql, params=None, send=cursor.execute: (events.append(sql), send(sql, params))
+
+    with executor.pipeline(max_batch_bytes=10_000):
+        # 回滚：事务内入队的语句不再发送
+        with pytest.raises(RuntimeError):
+            with executor.transaction():
+                executor.update('users', {'name': 'a'}, {'id': 1})
+                executor.update('users', {'name': 'b'}, {'id': 2})
+                raise RuntimeError("boom")
+        assert events == ["ROLLBACK"]
+
+        # 提交：入队的语句在 COMMIT 之前发送；嵌套保存点回滚时丢弃其中的语句
+        with executor.transaction():
+            executor.update('users', {'name': 'c'}, {'id': 3})
+            with pytest.raises(RuntimeError):
+                with executor.transaction():
+                    executor.update('users', {'name': 'd'}, {'id': 4})
+                    raise RuntimeError("boom")
+
+    assert events == [
+        "ROLLBACK",
+        "UPDATE users SET name = %s WHERE id = %s;\nSAVEPOINT lazy_mysql_sp_1",
+        "ROLLBACK TO SAVEPOINT lazy_mysql_sp_1;\nRELEASE SAVEPOINT lazy_mysql_sp_1",
+        "COMMIT",
+    ]
+    assert executor._transaction is None
@@ -0,0 +1,148 @@
+import logging
+from unittest.mock import Mock
+
+from mysql.connector import errors
+
+from lazy_mysql.executor import SQLExecutor
+from lazy_mysql.utils.prepared_cache import PreparedStatementCache
+
+
+class PreparedCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.prepared_sql = None
+        self.closed = False
+        self.rows = []
+
+    def execute(self, sql, params=None):
+        if self.connection.reject_prepare:
+            self.connection.reject_prepare -= 1
+            raise errors.DatabaseError(msg="Can't create more than max_prepared_stmt_count statements",
+                                       errno=1461)
+        # 与连接器一致：按对象身份判断是否需要重新预处理
+        if sql is not self.prepared_sql:
+            self.prepared_sql = sql
+            self.connection.prepare_count += 1
+        self.connection.executed.append((sql, params))
+        self.rows = [(1,), (2,)]
+        self.connection.unread_result = True
+
+    def fetchall(self):
+        self.connection.unread_result = False
+        rows, self.rows = self.rows, []
+        return rows
+
+    def fetchone(self):
+        return self.rows[0]
+
+    def close(self):
+        self.closed = True
+
+
+class TextCursor:
+    def __init__(self, limit):
+        self.limit = limit
+
+    def execute(self, sql, params=None):
+        self.sql = sql
+
+    def fetchone(self):
+        return (self.limit,)
+
+    def close(self):
+        pass
+
+
+class PreparedConnection:
+    def __init__(self, server_limit=16382):
+        self.server_limit = server_limit
+        self.prepared_cursors = []
+        self.executed = []
+        self.prepare_count = 0
+        self.unread_result = False
+        self.reject_prepare = 0
+
+    def cursor(self, buffered=True, dictionary=False, prepared=False):
+        if not prepared:
+            return TextCursor(self.server_limit)
+        assert buffered is False
+        cursor = PreparedCursor(self)
+        self.prepared_cursors.append(cursor)
+        return cursor
+
+
+def test_cache_reuses_statement_by_sql_text_and_counts_hits():
+    connection = PreparedConnection()
+    cache = PreparedStatementCache(connection, max_size=8)
+
+    for user_id in range(3):
+        # 每次构造新的字符串对象，模拟 crud 重复生成同形 SQL
+        sql = "".join(["SELECT id FROM users ", "WHERE id = %s"])
+        cache.execute(sql, (user_id,))
+
+    assert connection.prepare_count == 1
+    assert len(connection.prepared_cursors) == 1
+    assert cache.stats == {"hits": 2, "misses": 1, "evictions": 0, "size": 1, "max_size": 8}
+
+
+def test_cache_capacity_respects_server_limit_and_evicts_lru():
+    connection = PreparedConnection(server_limit=2)
+    cache = PreparedStatementCache(connection, max_size=100)
+
+    cache.execute("SELECT a FROM t WHERE id = %s", (1,))
+    cache.execute("SELECT b FROM t WHERE id = %s", (1,))
+    cache.execute("SELECT a FROM t WHERE id = %s", (2,))
+    cache.execute("SELECT c FROM t WHERE id = %s", (1,))
+
+    first, second, _ = connection.prepared_cursors
+    assert cache.max_size == 2
+    assert second.closed and not first.closed
+    assert cache.stats["evictions"] == 1
+
+
+def test_cache_shrinks_when_server_global_limit_is_reached():
+    connection = PreparedConnection()
+    cache = PreparedStatementCache(connection, max_size=8)
+    cache.execute("SELECT a FROM t WHERE id = %s", (1,))
+    cache.execute("SELECT b FROM t WHERE id = %s", (1,))
+
+    connection.reject_prepare = 1
+    cursor = cache.execute("SELECT c FROM t WHERE id = %s", (1,))
+
+    assert cursor is connection.prepared_cursors[-1]
+    assert connection.prepared_cursors[0].closed
+    assert cache.stats["size"] == 2
+
+    connection.reject_prepare = 3
+    cache._statements.clear()
+    assert cache.execute("SELECT d FROM t WHERE id = %s", (1,)) is None
+
+
+def make_prepared_executor():
+    connection = PreparedConnection()
+    executor = object.__new__(SQLExecutor)
+    executor.logger = Mock(spec=logging.Logger)
+    executor.dict_cursor = False
+    executor.prepared = True
+    text_cursor = Mock()
+    executor._bind_connection(connection, text_cursor)
+    return executor, connection, text_cursor
+
+
+def test_executor_prepared_mode_routes_tuple_params_to_cached_statements():
+    executor, connection, text_cursor = make_prepared_executor()
+
+    assert executor.select('users', ['id'], {'id': 1}, fetch_config={'fetch_mode': 'one'}) == 1
+    assert executor.exists('users', {'id': 2})
+    assert executor.select('users', ['id'], {'id': 3}, fetch_config={'output_format': 'list_1'}) == [1, 2]
+
+    assert connection.prepare_count == 2
+    assert executor.prepared_stats["hits"] == 1
+    assert not connection.unread_result
+
+    # 批量执行与无参数语句仍走文本协议
+    executor.execute("INSERT INTO users (id) VALUES (%s)", [(1,), (2,)])
+    executor.execute("SELECT 1")
+    text_cursor.executemany.assert_called_once()
+    text_cursor.execute.assert_called_once_with("SELECT 1")
+    assert executor.mycursor is text_cursor
@@ -0,0 +1,78 @@
+import logging
+import threading
+from unittest.mock import Mock
+
+import pytest
+from mysql.connector.errors import DatabaseError
+
+from lazy_mysql import FetchConfig, QueryTimeoutError, SQLExecutor
+from lazy_mysql.utils.timeout import with_max_execution_time
+
+
+def make_executor(query_timeout=None):
+    executor = object.__new__(SQLExecutor)
+    executor.logger = Mock(spec=logging.Logger)
+    executor.sql_config = Mock()
+    executor.database = "test_db"
+    executor.dict_cursor = False
+    executor.query_timeout = query_timeout
+    executor.mydb = Mock(connection_id=42)
+    executor.mycursor = Mock(rowcount=1, statement=None)
+    return executor
+
+
+def test_max_execution_time_hint_is_added_to_selects_only():
+    assert with_max_execution_time("SELECT id FROM users", 1.5) == \
+        "SELECT /*+ MAX_EXECUTION_TIME(1500) */ id FROM users"
+    assert with_max_execution_time("select /*+ NO_INDEX(users) */ id FROM users", 0.2) == \
+        "select /*+ MAX_EXECUTION_TIME(200) NO_INDEX(users) */ id FROM users"
+    assert with_max_execution_time("UPDATE users SET name = 'a'", 1) is None
+
+
+def test_select_timeout_uses_hint_and_raises_typed_error_without_closing():
+    executor = make_executor(query_timeout=2)
+    mydb, cursor = executor.mydb, executor.mycursor
+    cursor.execute.side_effect = DatabaseError(
+        "Query execution was interrupted, maximum statement execution time exceeded", errno=3024)
+
+    with pytest.raises(QueryTimeoutError):
+        executor.query("SELECT id FROM users WHERE name = %s", ("a",), fetch_config=FetchConfig(fetch_mode="one"),
+                       timeout=0.5)
+
+    cursor.execute.assert_called_once_with(
+        "SELECT /*+ MAX_EXECUTION_TIME(500) */ id FROM users WHERE name = %s", ("a",))
+    assert executor.mydb is mydb
+    mydb.close.assert_not_called()
+
+
+def test_dml_timeout_kills_query_from_side_connection(monkeypatch):
+    executor = make_executor()
+    killed = threading.Event()
+    side_cursor = Mock()
+    side_cursor.execute.side_effect = lambda sql: killed.set()
+    side_connect = Mock(return_value=Mock(**{"cursor.return_value": side_cursor}))
+    monkeypatch.setattr("lazy_mysql.utils.timeout.connect_db", side_connect)
+
+    def slow_statement(sql, params=None):
+        assert killed.wait(5)
+        raise DatabaseError("Query execution was interrupted", errno=1317)
+
+    executor.mycursor.execute.side_effect = slow_statement
+
+    with pytest.raises(QueryTimeoutError):
+        executor.update("users", {"name": "a"}, {"id": 1}, commit=True, timeout=0.05)
+
+    side_cursor.execute.assert_called_once_with("KILL QUERY 42")
+    executor.mydb.rollback.assert_called_once_with()
+    executor.mydb.commit.assert_not_called()
+    executor.mydb.close.assert_not_called()
+
+
+def test_interrupted_statement_without_watchdog_is_not_a_timeout():
+    executor = make_executor()
+    executor.mycursor.execute.side_effect = DatabaseError("Query execution was interrupted", errno=1317)
+
+    with pytest.raises(Exception) as excinfo:
+        executor.execute("DELETE FROM users")
+
+    assert not isinstance(excinfo.value, QueryTimeoutError)
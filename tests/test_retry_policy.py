@@ -0,0 +1,152 @@
+import logging
+from unittest.mock import Mock
+
+import pytest
+from mysql.connector import errors
+
+from lazy_mysql import CircuitOpenError, RetryPolicy
+from lazy_mysql.executor import SQLExecutor
+from lazy_mysql.retry import CONNECTION, DEADLOCK, LOCK_WAIT, classify_error
+
+
+def mysql_error(errno, msg="error"):
+    return errors.DatabaseError(msg=msg, errno=errno)
+
+
+def test_classify_error_by_errno_and_wrapped_cause():
+    assert classify_error(errors.OperationalError(msg="gone away", errno=2006)) == CONNECTION
+    assert classify_error(mysql_error(1205)) == LOCK_WAIT
+    assert classify_error(mysql_error(1213)) == DEADLOCK
+    assert classify_error(mysql_error(1064, "syntax error")) is None
+
+    try:
+        try:
+            raise mysql_error(1213, "Deadlock found")
+        except Exception as e:
+            raise Exception(f"SQL execute failed: {e}")
+    except Exception as wrapped:
+        assert classify_error(wrapped) == DEADLOCK
+
+
+def test_backoff_is_capped_exponential_and_respects_deadline(monkeypatch):
+    policy = RetryPolicy(max_retries=10, base_delay=0.5, max_delay=4, deadline=5, jitter=False)
+
+    assert [policy.backoff(n) for n in range(1, 6)] == [0.5, 1, 2, 4, 4]
+
+    clock = [100.0]
+    monkeypatch.setattr("lazy_mysql.retry.time.monotonic", lambda: clock[0])
+    error = mysql_error(1205)
+    assert policy.next_delay(error, 1, started_at=100.0) == 0.5
+    clock[0] = 103.0
+    # 103 + 4 - 100 > 5：下一次等待会越过 deadline
+    assert policy.next_delay(error, 4, started_at=100.0) is None
+    # 死锁默认不做语句级重试
+    assert policy.next_delay(mysql_error(1213), 1, started_at=103.0) is None
+
+
+def test_circuit_breaker_opens_after_consecutive_connection_failures(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr("lazy_mysql.retry.time.monotonic", lambda: clock[0])
+    policy = RetryPolicy(breaker_threshold=3, breaker_cooldown=10)
+    lost = errors.OperationalError(msg="Lost connection", errno=2013)
+
+    for attempt in (1, 2):
+        assert policy.next_delay(lost, attempt, started_at=0.0) is not None
+    assert policy.next_delay(lost, 3, started_at=0.0) is None
+    with pytest.raises(CircuitOpenError):
+        policy.check_circuit()
+
+    clock[0] = 11.0
+    policy.check_circuit()
+    policy.record_success()
+    assert policy.stats == {"consecutive_failures": 0, "open": False}
+
+
+def test_connect_db_uses_policy_instead_of_linear_delay(monkeypatch):
+    from lazy_mysql.utils import connect
+
+    attempts = []
+
+    def fake_connect(**kwargs):
+        attempts.append(kwargs)
+        if len(attempts) < 3:
+            raise errors.InterfaceError(msg="Can't connect to MySQL server", errno=2003)
+        return "connection"
+
+    sleeps = []
+    monkeypatch.setattr(connect.mysql.connector, "connect", fake_connect)
+    monkeypatch.setattr(connect.time, "sleep", sleeps.append)
+    policy = RetryPolicy(base_delay=0.1, jitter=False)
+
+    assert connect.connect_db({"database": "test_db"}, retry_policy=policy) == "connection"
+    assert sleeps == [0.1, 0.2]
+
+
+def make_executor(policy):
+    executor = object.__new__(SQLExecutor)
+    executor.logger = Mock(spec=logging.Logger)
+    executor.dict_cursor = False
+    executor.retry_policy = policy
+    executor.mydb = Mock()
+    executor.mycursor = Mock()
+    return executor
+
+
+def test_execute_retries_lock_wait_timeout_without_reconnect(monkeypatch):
+    monkeypatch.setattr("lazy_mysql.executor.time.sleep", lambda seconds: None)
+    executor = make_executor(RetryPolicy(jitter=False))
+    executor._try_reconnect = Mock()
+    executor.mycursor.execute.side_effect = [mysql_error(1205, "Lock wait timeout exceeded"), None]
+
+    executor.execute("UPDATE users SET name = %s WHERE id = %s", ("x", 1))
+
+    assert executor.mycursor.execute.call_count == 2
+    executor._try_reconnect.assert_not_called()
+
+
+def test_retry_transaction_replays_whole_transaction_after_deadlock(monkeypatch):
+    monkeypatch.setattr("lazy_mysql.executor.time.sleep", lambda seconds: None)
+    executor = make_executor(RetryPolicy(jitter=False))
+    connection = executor.mydb
+    executor._open_connection = Mock(return_value=(connection, executor.mycursor))
+    calls = []
+
+    def transfer(tx):
+        calls.append(tx._replaying)
+        tx.execute("UPDATE accounts SET balance = balance - %s WHERE id = %s", (100, 1))
+        if len(calls) == 1:
+            raise mysql_error(1213, "Deadlock found when trying to get lock")
+        return "done"
+
+    assert executor.retry_transaction(transfer) == "done"
+    assert calls == [True, True]
+    assert connection.rollback.call_count == 1
+    connection.commit.assert_called_once_with()
+    assert executor._replaying is False
+
+
+def test_retry_transaction_does_not_reconnect_when_commit_connection_drops(monkeypatch):
+    monkeypatch.setattr("lazy_mysql.executor.time.sleep", lambda seconds: None)
+    executor = make_executor(RetryPolicy(jitter=False))
+    connection = executor.mydb
+    connection.commit.side_effect = mysql_error(2013, "Lost connection to MySQL server during query")
+    executor._open_connection = Mock(return_value=(Mock(), Mock()))
+    calls = []
+
+    with pytest.raises(errors.Error, match="Lost connection"):
+        executor.retry_transaction(lambda tx: calls.append(1))
+
+    assert calls == [1]
+    connection.close.assert_called_once_with()
+    executor._open_connection.assert_not_called()
+    assert executor.mydb is None
+
+
+def test_default_connect_policy_has_no_shared_circuit_breaker():
+    from lazy_mysql.utils import connect
+
+    policy = connect._resolve_retry_policy(None, None, None)
+    for _ in range(50):
+        policy.record_failure()
+
+    policy.check_circuit()
@@ -0,0 +1,126 @@
+from unittest.mock import Mock
+
+import pytest
+from mysql.connector.errors import OperationalError
+
+import lazy_mysql.routing
+from lazy_mysql import FetchConfig, RoutingExecutor
+from lazy_mysql.routing import is_read_only_sql
+
+ONE = FetchConfig(fetch_mode="one")
+
+
+@pytest.fixture
+def nodes(monkeypatch):
+    """按 host 记录各节点的游标，connect_error 中的 host 建立连接时抛出连接错误"""
+    cursors = {}
+    connect_error = set()
+    monkeypatch.setattr("lazy_mysql.routing._replica_down_until", {})
+
+    def fake_connection(sql_config, database, dict_cursor=False, **kwargs):
+        attempts.append((sql_config.host, kwargs.get("retry_policy")))
+        if sql_config.host in connect_error:
+            raise OperationalError("Can't connect to MySQL server", errno=2003)
+        cursor = Mock(rowcount=1, statement=None)
+        cursor.fetchone.return_value = (1,)
+        cursors.setdefault(sql_config.host, []).append(cursor)
+        return Mock(), cursor
+
+    monkeypatch.setattr("lazy_mysql.executor.connection", fake_connection)
+    clock = [1000.0]
+    monkeypatch.setattr("lazy_mysql.routing.time.monotonic", lambda: clock[0])
+
+    def executed(host):
+        return [call.args[0] for cursor in cursors.get(host, []) for call in cursor.execute.call_args_list]
+
+    executed.attempts = attempts = []
+    return executed, connect_error, clock
+
+
+def make_router(**routing):
+    routing.setdefault("replicas", [{"host": "replica1"}, {"host": "replica2"}])
+    return RoutingExecutor({"host": "primary", "user": "u", "database": "test_db"}, routing_config=routing)
+
+
+def test_reads_round_robin_across_replicas_and_writes_go_to_primary(nodes):
+    executed, _, _ = nodes
+    executor = make_router()
+
+    executor.query("SELECT 1", fetch_config=ONE)
+    executor.query("SELECT 2", fetch_config=ONE)
+    executor.query("SELECT id FROM users FOR UPDATE", fetch_config=ONE)
+
+    assert executed("replica1") == ["SELECT 1"]
+    assert executed("replica2") == ["SELECT 2"]
+    assert executed("primary") == ["SELECT id FROM users FOR UPDATE"]
+    assert executor.replicas[0].sql_config.user == "u"
+
+
+def test_reads_stick_to_primary_within_window_after_write(nodes):
+    executed, _, clock = nodes
+    executor = make_router(sticky_window=2)
+
+    executor.delete("users", {"id": 1}, commit=True)
+    clock[0] += 1
+    executor.exists("users", {"id": 1})
+    clock[0] += 2
+    executor.exists("users", {"id": 1})
+
+    assert len(executed("primary")) == 2
+    assert len(executed("replica1")) == 1
+
+
+def test_gtid_consistency_uses_replica_that_has_caught_up(nodes):
+    executed, _, _ = nodes
+    executor = make_router(sticky_window=60, gtid_consistency=True)
+    executor.update("users", {"name": "a"}, {"id": 1}, commit=True)
+    executor.primary.mycursor.fetchone.return_value = ("uuid:1-10",)
+
+    executor.query("SELECT name FROM users WHERE id = 1", fetch_config=ONE)
+
+    assert executed("primary")[-1] == "SELECT @@GLOBAL.gtid_executed"
+    assert executed("replica1") == [
+        "SELECT GTID_SUBSET(%s, @@GLOBAL.gtid_executed)",
+        "SELECT name FROM users WHERE id = 1",
+    ]
+
+
+def test_unreachable_replica_is_skipped_and_read_falls_back(nodes):
+    executed, connect_error, clock = nodes
+    connect_error.update({"replica1", "replica2"})
+    executor = make_router(replica_down_interval=30)
+
+    executor.query("SELECT 1", fetch_config=ONE)
+    executor.query("SELECT 2", fetch_config=ONE)
+
+    assert executed("primary") == ["SELECT 1", "SELECT 2"]
+    replica_policies = [policy for host, policy in executed.attempts if host.startswith("replica")]
+    assert len(replica_policies) == 2
+    assert all(policy.max_retries == 0 for policy in replica_policies)
+
+    # 故障状态按从库共享：每个请求新建的执行器在暂停期内不再探测
+    make_router(replica_down_interval=30).query("SELECT 3", fetch_config=ONE)
+    assert len(executed.attempts) == 4
+    assert set(lazy_mysql.routing._replica_down_until) == {
+        ("replica1", None, None, "test_db"), ("replica2", None, None, "test_db")}
+    clock[0] += 31
+    make_router(replica_down_interval=30).query("SELECT 4", fetch_config=ONE)
+    assert [host for host, _ in executed.attempts[4:6]] == ["replica1", "replica2"]
+
+
+def test_fetch_and_response_fails_over_before_building_response(nodes):
+    executed, connect_error, _ = nodes
+    connect_error.update({"replica1", "replica2"})
+    executor = make_router()
+
+    response = executor.fetch_and_response("users", ["id"], fetch_config=ONE)
+
+    assert response == {"success": True, "result": 1, "message": "success"}
+    assert executed("primary") == ["SELECT id FROM users"]
+    assert len(lazy_mysql.routing._replica_down_until) == 2
+
+
+def test_is_read_only_sql():
+    assert is_read_only_sql("  with t as (select 1) select * from t")
+    assert not is_read_only_sql("SELECT * FROM users LOCK IN SHARE MODE")
+    assert not is_read_only_sql("UPDATE users SET name = 'a'")
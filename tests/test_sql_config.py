@@ -1,3 +1,5 @@
+import pytest
+
 from lazy_mysql import MySQLConfig, SQLExecutor
 from lazy_mysql.utils.connect import connection
 
@@ -162,3 +164,57 @@ def test_connection_database_argument_overrides_config(monkeypatch):
     connection({"database": "config-db"}, database="argument-db", max_retries=0)
 
     assert captured["database"] == "argument-db"
+
+
+def test_connection_passes_unix_socket_tls_and_profile(monkeypatch):
+    captured = {}
+
+    class DummyConnection:
+        def cursor(self, buffered=True, dictionary=False):
+            return object()
+
+    def fake_connect(**kwargs):
+        captured.update(kwargs)
+        return DummyConnection()
+
+    monkeypatch.setenv("LAZY_MYSQL_SSL_CA", "/etc/mysql/ca.pem")
+    monkeypatch.setattr("lazy_mysql.utils.connect.mysql.connector.connect", fake_connect)
+    config = MySQLConfig.resolve({
+        "database": "app_db",
+        "unix_socket": "/var/run/mysqld/mysqld.sock",
+        "ssl_verify_cert": "true",
+        "profiles": {"etl": {"session_vars": {"sql_mode": "ANSI_QUOTES", "unique_checks": False},
+                             "read_timeout": 600}},
+    })
+
+    connection(config, max_retries=0, profile="etl")
+
+    assert captured["unix_socket"] == "/var/run/mysqld/mysqld.sock"
+    assert captured["ssl_ca"] == "/etc/mysql/ca.pem"
+    assert captured["ssl_verify_cert"] is True
+    assert captured["init_command"] == "SET SESSION sql_mode = 'ANSI_QUOTES', unique_checks = OFF"
+    assert captured["read_timeout"] == 600
+    assert "ssl_disabled" not in captured
+
+
+def test_sql_executor_profile_sets_default_query_timeout(monkeypatch):
+    captured = {}
+
+    def fake_connection(sql_config=None, database=None, dict_cursor=False, profile=None):
+        captured["profile"] = profile
+        return object(), object()
+
+    monkeypatch.setattr("lazy_mysql.executor.connection", fake_connection)
+    config = {"database": "app_db", "profiles": {"report": {"query_timeout": 60}}}
+
+    executor = SQLExecutor(config, profile="report")
+    assert executor.profile.query_timeout == 60
+    assert executor.query_timeout == 60
+    assert captured["profile"] is executor.profile
+
+    oltp = SQLExecutor(config, profile="oltp")
+    assert oltp.profile.session_vars == {"innodb_lock_wait_timeout": 5}
+    # 语句超时由 query_timeout 控制，方法的 timeout 参数可以覆盖
+    assert oltp.query_timeout == 5
+    with pytest.raises(ValueError):
+        SQLExecutor(config, profile="missing")
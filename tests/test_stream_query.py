@@ -0,0 +1,84 @@
+import logging
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+
+from lazy_mysql.executor import SQLExecutor
+
+
+class StreamCursor:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.executed = None
+        self.fetch_sizes = []
+        self.closed = False
+
+    def execute(self, sql, params=None):
+        self.executed = (sql, params)
+
+    def fetchmany(self, size):
+        self.fetch_sizes.append(size)
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+    def close(self):
+        self.closed = True
+
+
+def make_executor(rows):
+    executor = object.__new__(SQLExecutor)
+    executor.logger = Mock(spec=logging.Logger)
+    executor.dict_cursor = False
+    executor.mycursor = Mock()
+    executor.mydb = Mock()
+    executor.close = Mock()
+    cursor = StreamCursor(rows)
+    executor.mydb.cursor.return_value = cursor
+    return executor, cursor
+
+
+def test_iter_query_yields_rows_from_unbuffered_cursor():
+    executor, cursor = make_executor([(1, 'a'), (2, 'b'), (3, 'c')])
+
+    rows = list(executor.iter_query("SELECT id, name FROM users WHERE id > %s", [0]))
+
+    assert rows == [(1, 'a'), (2, 'b'), (3, 'c')]
+    executor.mydb.cursor.assert_called_once_with(buffered=False, dictionary=False)
+    assert cursor.executed == ("SELECT id, name FROM users WHERE id > %s", (0,))
+    assert cursor.closed
+
+
+def test_iter_query_yields_dataframe_chunks():
+    executor, cursor = make_executor([(i, f'name{i}') for i in range(5)])
+
+    chunks = list(executor.iter_query(
+        "SELECT id, name FROM users",
+        chunk_size=2,
+        fetch_config={'output_format': 'df', 'data_label': ['id', 'name']},
+        self_close=True,
+    ))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert all(isinstance(chunk, pd.DataFrame) for chunk in chunks)
+    assert cursor.fetch_sizes == [2, 2, 2, 2]
+    executor.close.assert_called_once_with()
+
+
+def test_select_stream_closes_cursor_when_consumer_stops_early():
+    executor, cursor = make_executor([(i,) for i in range(10)])
+
+    stream = executor.select('users', ['id'], stream=True, chunk_size=3,
+                             fetch_config={'output_format': 'list_1'})
+    assert next(stream) == [0, 1, 2]
+    stream.close()
+
+    assert cursor.closed
+
+
+def test_stream_dataframe_requires_chunk_size():
+    executor, _ = make_executor([])
+
+    with pytest.raises(ValueError, match="chunk_size"):
+        executor.iter_query("SELECT id FROM users",
+                            fetch_config={'output_format': 'df', 'data_label': ['id']})
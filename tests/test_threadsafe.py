@@ -0,0 +1,133 @@
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+from lazy_mysql import FetchConfig, ThreadSafeExecutor
+
+ONE = FetchConfig(fetch_mode="one")
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    """连接池每次新建连接时创建一个 Mock 连接，游标 fetchone 返回执行时的 SQL 参数；on_execute 在每条语句执行时调用"""
+    created = []
+    on_execute = []
+
+    def fake_connect_db(sql_config, database):
+        mydb = Mock(_socket=None, in_transaction=False)
+
+        def make_cursor(**kwargs):
+            cursor = Mock(rowcount=1, statement=None)
+
+            def execute(sql, params=None):
+                for hook in on_execute:
+                    hook()
+                mydb.in_transaction = True
+                cursor.fetchone.return_value = params
+
+            cursor.execute.side_effect = execute
+            return cursor
+
+        mydb.cursor.side_effect = make_cursor
+        mydb.commit.side_effect = lambda: setattr(mydb, "in_transaction", False)
+        created.append(mydb)
+        return mydb
+
+    monkeypatch.setattr("lazy_mysql.pool.connect_db", fake_connect_db)
+    return created, on_execute
+
+
+def make_executor(**kwargs):
+    return ThreadSafeExecutor({"host": "db", "database": "test_db"}, pool_config={"max_size": 4}, **kwargs)
+
+
+def test_concurrent_calls_use_separate_connections_from_bounded_pool(connections):
+    connections, on_execute = connections
+    executor = make_executor()
+    # 每轮 4 条语句同时执行：每条语句必须使用各自的连接
+    on_execute.append(threading.Barrier(4, timeout=5).wait)
+
+    def task(day):
+        return executor.query("SELECT COUNT(*) FROM orders WHERE day = %s", [day], fetch_config=ONE)
+
+    with ThreadPoolExecutor(8) as workers:
+        results = list(workers.map(task, range(16)))
+
+    assert results == list(range(16))
+    assert len(connections) == 4
+    assert executor.pool.stats["in_use"] == 0
+    assert all(mydb.commit.called for mydb in connections)
+    executor.close()
+
+
+def test_per_thread_mode_keeps_one_connection_per_thread(connections):
+    connections, _ = connections
+    executor = make_executor(per_thread=True)
+
+    def task(_):
+        executor.execute("DELETE FROM sessions WHERE id = %s", (1,))
+        executor.execute("DELETE FROM sessions WHERE id = %s", (2,))
+        return id(executor._current().mydb)
+
+    with ThreadPoolExecutor(2) as workers:
+        used = set(workers.map(task, range(2)))
+        executor.close()
+
+    assert len(used) <= 2
+    assert executor.pool.stats["size"] == 0
+
+
+def test_transaction_pins_one_connection_for_the_block(connections):
+    connections, _ = connections
+    executor = make_executor()
+
+    with executor.transaction():
+        executor.update("accounts", {"balance": 90}, {"id": 1})
+        executor.update("accounts", {"balance": 110}, {"id": 2})
+
+    assert len(connections) == 1
+    connections[0].commit.assert_called_once_with()
+    assert executor.pool.stats["in_use"] == 0
+
+
+def test_child_process_drops_inherited_connections_without_closing_them(connections, monkeypatch):
+    connections, _ = connections
+    executor = make_executor(per_thread=True)
+    executor.execute("SELECT 1")
+    inherited = connections[0]
+    inherited_socket, peer = socket.socketpair()
+    inherited._socket = Mock(sock=inherited_socket)
+
+    pid = executor.pool._pid + 1
+    monkeypatch.setattr("lazy_mysql.pool.os.getpid", lambda: pid)
+    monkeypatch.setattr("lazy_mysql.threadsafe.os.getpid", lambda: pid)
+    executor.execute("SELECT 1")
+    executor.close()
+
+    assert len(connections) == 2
+    assert inherited._socket.sock is None
+    assert inherited_socket.fileno() == -1
+    inherited.close.assert_not_called()
+    inherited.rollback.assert_not_called()
+    peer.close()
+
+
+def test_child_process_tracks_abandoned_connections_by_object(connections, monkeypatch):
+    connections, _ = connections
+    executor = make_executor()
+    pool = executor.pool
+    inherited = pool.acquire()
+
+    pid = pool._pid + 1
+    monkeypatch.setattr("lazy_mysql.pool.os.getpid", lambda: pid)
+    other = Mock()
+    pool.release(other)
+    pool.release(inherited)
+
+    # 只有继承的连接被忽略；其他连接（即使 id 与已回收的继承连接相同）照常处理
+    other.close.assert_called_once_with()
+    inherited.close.assert_not_called()
+    assert len(pool._abandoned) == 0
@@ -0,0 +1,110 @@
+import logging
+from unittest.mock import Mock
+
+import pytest
+
+from lazy_mysql.executor import SQLExecutor
+
+
+def make_executor():
+    executor = object.__new__(SQLExecutor)
+    executor.logger = Mock(spec=logging.Logger)
+    executor.dict_cursor = False
+    executor.mydb = Mock()
+    executor.mycursor = Mock(rowcount=1, statement=None)
+    return executor
+
+
+def executed_sql(executor):
+    return [call.args[0] for call in executor.mycursor.execute.call_args_list]
+
+
+def test_transaction_commits_once_and_ignores_per_call_commit():
+    executor = make_executor()
+
+    with executor.transaction():
+        executor.update('users', {'name': 'a'}, {'id': 1}, commit=True)
+        executor.delete('users', {'id': 2}, commit=True)
+        executor.mydb.commit.assert_not_called()
+
+    executor.mydb.commit.assert_called_once_with()
+    assert executor._transaction is None
+
+
+def test_transaction_rolls_back_and_keeps_connection_on_statement_error():
+    executor = make_executor()
+    executor.mycursor.execute.side_effect = [None, Exception("Duplicate entry '1' for key 'PRIMARY'")]
+    mydb = executor.mydb
+
+    with pytest.raises(Exception, match="Duplicate entry"):
+        with executor.transaction():
+            executor.execute("UPDATE users SET name = %s WHERE id = %s", ('a', 1))
+            executor.execute("INSERT INTO users (id) VALUES (%s)", (1,))
+
+    mydb.rollback.assert_called_once_with()
+    mydb.commit.assert_not_called()
+    assert executor.mydb is mydb
+
+
+def test_nested_transaction_rolls_back_to_savepoint_only():
+    executor = make_executor()
+
+    with executor.transaction():
+        executor.execute("UPDATE users SET name = %s WHERE id = %s", ('a', 1))
+        with pytest.raises(ValueError):
+            with executor.transaction():
+                executor.execute("INSERT INTO audit (id) VALUES (%s)", (1,))
+                raise ValueError("skip audit")
+        with executor.transaction():
+            executor.execute("INSERT INTO audit (id) VALUES (%s)", (2,))
+
+    assert executed_sql(executor) == [
+        "UPDATE users SET name = %s WHERE id = %s",
+        "SAVEPOINT lazy_mysql_sp_1",
+        "INSERT INTO audit (id) VALUES (%s)",
+        "ROLLBACK TO SAVEPOINT lazy_mysql_sp_1",
+        "RELEASE SAVEPOINT lazy_mysql_sp_1",
+        "SAVEPOINT lazy_mysql_sp_1",
+        "INSERT INTO audit (id) VALUES (%s)",
+        "RELEASE SAVEPOINT lazy_mysql_sp_1",
+    ]
+    executor.mydb.rollback.assert_not_called()
+    executor.mydb.commit.assert_called_once_with()
+
+
+def test_group_commit_flushes_every_n_statements():
+    executor = make_executor()
+
+    with executor.transaction(group_commit_size=3):
+        for i in range(7):
+            executor.insert('events', {'id': i}, commit=True)
+        assert executor.mydb.commit.call_count == 2
+
+    # 退出时提交剩余的 1 条
+    assert executor.mydb.commit.call_count == 3
+
+
+def test_group_commit_flushes_after_interval(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr("lazy_mysql.utils.transaction.time.monotonic", lambda: clock[0])
+    executor = make_executor()
+
+    with executor.transaction(group_commit_interval_ms=100):
+        executor.insert('events', {'id': 1})
+        assert executor.mydb.commit.call_count == 0
+        clock[0] = 0.15
+        executor.insert('events', {'id': 2})
+        assert executor.mydb.commit.call_count == 1
+
+
+def test_self_close_inside_transaction_is_deferred():
+    executor = make_executor()
+    mydb = executor.mydb
+
+    with executor.transaction():
+        executor.update('users', {'name': 'a'}, {'id': 1}, commit=True, self_close=True)
+        assert executor.mydb is mydb
+
+    mydb.commit.assert_called_once_with()
+    mydb.close.assert_called_once_with()
+    assert executor.mydb is None